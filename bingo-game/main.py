@@ -1,12 +1,21 @@
+import argparse
+import json
+import random
+import sys
+import time
+
 from src.game.card import BingoCard
 from src.game.draw import NumberDrawer
 from src.game.score import ScoreTracker
-from src.ui.terminal import ask_card_numbers
+from src.ui.terminal import CardGrid, ask_card_numbers, ask_player_name, format_leaderboard
+from simulate import summarize, format_summary
 
 
-def main():
-    """Main game loop for the Bingo game."""
+def play_interactive():
+    """Main game loop for the Bingo game: one card, one ball per Enter."""
     try:
+        player = ask_player_name()
+
         # Get user preference for card creation
         while True:
             choice = input("Do you want to enter your own numbers? (y/n): ").lower().strip()
@@ -30,16 +39,24 @@ def main():
 
         # Initialize game components
         drawer = NumberDrawer()
-        score = ScoreTracker()
+        score = ScoreTracker(player=player)
         
-        # Display high score if available
-        high_score = score.get_high_score()
-        if high_score > 0:
-            print(f"\n🏆 High Score: {high_score}")
+        # Leaderboard, if available
+        top = score.get_top_players(5)
+        board = format_leaderboard(top, player, score.get_rank()).splitlines() if top else []
 
-        print("\nYour card:")
-        print(card)
-        print("\n" + "="*50)
+        # On a real terminal only the newly marked cells are redrawn
+        grid = CardGrid([card], titles=["Your card"]) if sys.stdout.isatty() else None
+        if grid:
+            # Drawing clears the screen, so the leaderboard goes under the grid
+            grid.draw()
+            grid.status(*board)
+        else:
+            if board:
+                print("\n" + "\n".join(board))
+            print("\nYour card:")
+            print(card)
+            print("\n" + "="*50)
 
         # Main game loop
         while True:
@@ -52,15 +69,19 @@ def main():
                     print(f"Final Score: {score.get_score()}")
                     break
 
-                print(f"\n🎲 Number drawn: {n}")
                 card.mark_number(n)
 
                 # Update score
-                score.update_score(card.marked)
+                score.record_card(card)
 
-                print("\nCurrent card:")
-                print(card)
-                print(f"📊 Score: {score.get_score()}")
+                if grid:
+                    grid.update()
+                    grid.status(*board, f"🎲 Number drawn: {n}", f"📊 Score: {score.get_score()}")
+                else:
+                    print(f"\n🎲 Number drawn: {n}")
+                    print("\nCurrent card:")
+                    print(card)
+                    print(f"📊 Score: {score.get_score()}")
 
                 # Check for bingo
                 if score.has_bingo:
@@ -85,5 +106,125 @@ def main():
         raise
 
 
+def play_auto(args, out=None):
+    """
+    Play games unattended, drawing a ball every args.interval seconds.
+
+    Every card gets its own ScoreTracker and a game ends when any card
+    reaches bingo or the balls run out. Depending on args.output this
+    prints the cards as they are marked ('text'), one JSON object per
+    ball and per game ('jsonl'), or only the final summary ('summary').
+
+    Returns the summary dict, which includes the per-ball latency of
+    marking and scoring every card.
+    """
+    out = out or sys.stdout
+    rng = random.Random(args.seed)
+    latencies = []
+    bingo_balls = []
+    total_score = 0
+    started = time.perf_counter()
+
+    def emit(record):
+        out.write(json.dumps(record) + "\n")
+
+    for game in range(args.games):
+        cards = [BingoCard(rng=rng) for _ in range(args.cards)]
+        drawer = NumberDrawer(rng=rng)
+        trackers = [ScoreTracker(use_redis=not args.no_redis, player=args.player) for _ in cards]
+        grid = None
+        if args.output == 'text' and getattr(out, 'isatty', lambda: False)():
+            grid = CardGrid(cards, out=out, compact=len(cards) > 4)
+        winner = None
+        balls = 0
+
+        while winner is None:
+            n = drawer.draw_number()
+            if n is None:
+                break
+            balls += 1
+            tick = time.perf_counter()
+            for index, (card, tracker) in enumerate(zip(cards, trackers)):
+                card.mark_number(n)
+                tracker.record_card(card)
+                if winner is None and tracker.has_bingo:
+                    winner = index
+            latency = time.perf_counter() - tick
+            latencies.append(latency)
+            score = sum(tracker.get_score() for tracker in trackers)
+
+            if args.output == 'jsonl':
+                emit({'game': game, 'ball': balls, 'number': n, 'score': score,
+                      'latency_us': round(latency * 1e6, 1)})
+            elif grid:
+                grid.update()
+                grid.status(f"🎮 Game {game + 1}/{args.games}  🎲 Number drawn: {n}  📊 Score: {score}")
+            elif args.output == 'text':
+                out.write(f"🎮 Game {game + 1}  🎲 Ball {balls}: {n}  📊 Score: {score}\n")
+            if args.interval:
+                time.sleep(args.interval)
+
+        score = sum(tracker.get_score() for tracker in trackers)
+        total_score += score
+        if winner is not None:
+            bingo_balls.append(balls)
+        if args.output == 'jsonl':
+            emit({'game': game, 'event': 'game_over', 'balls': balls, 'winner': winner, 'score': score})
+        elif args.output == 'text':
+            result = f"🎉 BINGO on card {winner + 1}" if winner is not None else "No bingo"
+            out.write(f"🏁 Game {game + 1}: {result} after {balls} balls. Score: {score}\n")
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        'games': args.games,
+        'balls': len(latencies),
+        'elapsed': elapsed,
+        'balls_per_second': len(latencies) / elapsed if elapsed else 0.0,
+        'total_score': total_score,
+        'balls_to_bingo': summarize(bingo_balls),
+        'latency_us': summarize([latency * 1e6 for latency in latencies])
+    }
+    if args.output == 'jsonl':
+        emit({'event': 'summary', **summary})
+    else:
+        out.write(f"🎲 {summary['games']} games, {summary['balls']} balls in {elapsed:.2f}s "
+                  f"({summary['balls_per_second']:.0f} balls/s), {args.cards} card(s) each\n")
+        out.write(format_summary("Balls to bingo", summary['balls_to_bingo']) + "\n")
+        latency = summary['latency_us']
+        if latency['count']:
+            out.write(f"{'Ball latency (us)':<22} mean {latency['mean']:6.1f}  p50 {latency['p50']:6.1f}  "
+                      f"p99 {latency['p99']:6.1f}  max {latency['max']:6.1f}\n")
+    out.flush()
+    return summary
+
+
+def main(argv=None):
+    """Play interactively, or unattended when --auto or --fast is given."""
+    parser = argparse.ArgumentParser(description="Terminal Bingo.")
+    draw = parser.add_mutually_exclusive_group()
+    draw.add_argument('--auto', type=float, metavar='SECONDS', dest='interval', default=None,
+                      help="draw a ball every SECONDS without waiting for Enter")
+    draw.add_argument('--fast', action='store_const', const=0.0, dest='interval',
+                      help="draw balls as fast as possible")
+    parser.add_argument('--cards', type=int, default=1, help="cards per game in auto mode")
+    parser.add_argument('--games', type=int, default=1, help="games to play in auto mode")
+    parser.add_argument('--seed', type=int, default=None, help="seed for cards and draws")
+    parser.add_argument('--output', choices=['text', 'jsonl', 'summary'], default='text',
+                        help="auto mode output: cards, JSON lines, or the summary only")
+    parser.add_argument('--player', default='Player', help="name saved with auto mode results")
+    parser.add_argument('--no-redis', action='store_true', help="don't save results")
+    args = parser.parse_args(argv)
+
+    if args.interval is None:
+        play_interactive()
+        return
+    if args.cards < 1 or args.games < 1:
+        parser.error("--cards and --games must be at least 1")
+    try:
+        play_auto(args)
+    except KeyboardInterrupt:
+        print("\n\nGame interrupted by user.")
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,54 @@
+import argparse
+import asyncio
+
+from src.net.client import BotClient
+from src.net.fanout import QUEUE_SIZE
+from src.net.server import GameServer, DEFAULT_PORT
+
+
+async def serve(args):
+    """Run the game server, optionally with local stand-in players."""
+    server = GameServer(
+        draw_interval=args.interval,
+        use_redis=not args.no_redis,
+        seed=args.seed,
+        queue_size=args.queue_size
+    )
+    listener = await server.start(args.host, args.port)
+    port = listener.sockets[0].getsockname()[1]
+    print(f"🎲 Bingo server listening on {args.host}:{port}")
+
+    async with listener:
+        if not args.bots:
+            await listener.serve_forever()
+            return
+        bots = [BotClient(f"bot{i}", room=args.room, cards=args.cards) for i in range(args.bots)]
+        results = await asyncio.gather(*(bot.play('127.0.0.1', port) for bot in bots))
+        winner = next((r['winner'] for r in results if r and r.get('winner')), None)
+        print(f"🏁 Game over in room {args.room}. Winner: {winner or 'nobody'}")
+        stats = server.stats()
+        print(f"📤 Messages sent: {stats['sent']}, dropped: {stats['dropped']}, "
+              f"resyncs: {stats['syncs']}, deepest queue: {stats['max_depth']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multiplayer Bingo server.")
+    parser.add_argument('--host', default='0.0.0.0', help="address to listen on")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="TCP port (0 picks a free one)")
+    parser.add_argument('--interval', type=float, default=1.0, help="seconds between balls")
+    parser.add_argument('--seed', type=int, default=None, help="seed for reproducible rooms")
+    parser.add_argument('--no-redis', action='store_true', help="don't save results")
+    parser.add_argument('--queue-size', type=int, default=QUEUE_SIZE,
+                        help="balls a client may fall behind by before it is resynced")
+    parser.add_argument('--bots', type=int, default=0, help="play one game with this many local bots, then exit")
+    parser.add_argument('--room', default='lobby', help="room the bots join")
+    parser.add_argument('--cards', type=int, default=1, help="cards per bot")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import os
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+from src.game.card import BingoCard
+from src.game.draw import NumberDrawer
+from src.game.score import ScoreTracker, LINE_POINTS, BINGO_POINTS
+
+
+def play_game(rng=None):
+    """
+    Play one headless game until bingo or the drawer runs out.
+
+    rng seeds both the card and the draw; None uses the global RNG.
+
+    Returns (balls until first line, balls until bingo, final score);
+    a milestone that is never reached is None.
+    """
+    card = BingoCard(rng=rng)
+    drawer = NumberDrawer(rng=rng)
+    score = ScoreTracker(use_redis=False)
+    first_line = None
+    bingo = None
+    balls = 0
+    while True:
+        n = drawer.draw_number()
+        if n is None:
+            break
+        balls += 1
+        card.mark_number(n)
+        score.record_card(card)
+        if first_line is None and score.lines_done:
+            first_line = balls
+        if score.has_bingo:
+            bingo = balls
+            break
+    return first_line, bingo, score.get_score()
+
+
+def run_chunk(seed, games):
+    """Worker entry point: play `games` games from an RNG seeded with `seed`."""
+    rng = random.Random(seed)
+    return [play_game(rng) for _ in range(games)]
+
+
+def simulate(games, workers=None, chunk_size=500, seed=None):
+    """
+    Run `games` games across a process pool.
+
+    Work is split into chunks of `chunk_size` games, each with its own
+    seed drawn from `seed`, so results don't depend on the worker count.
+    Returns a list of play_game() results.
+    """
+    master = random.Random(seed)
+    sizes = [min(chunk_size, games - start) for start in range(0, games, chunk_size)]
+    seeds = [master.getrandbits(64) for _ in sizes]
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in pool.map(run_chunk, seeds, sizes):
+            results.extend(chunk)
+    return results
+
+
+def summarize(values):
+    """Distribution summary of a list of numbers, ignoring None."""
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return {'count': 0}
+
+    def pct(p):
+        return values[min(len(values) - 1, int(p * len(values)))]
+
+    return {
+        'count': len(values),
+        'mean': statistics.fmean(values),
+        'stdev': statistics.pstdev(values),
+        'min': values[0],
+        'p10': pct(0.10),
+        'p50': pct(0.50),
+        'p90': pct(0.90),
+        'p99': pct(0.99),
+        'max': values[-1],
+    }
+
+
+def format_summary(name, summary):
+    """One report line for a summarize() result."""
+    if not summary['count']:
+        return f"{name:<22} no data"
+    return (f"{name:<22} mean {summary['mean']:6.2f}  sd {summary['stdev']:5.2f}  "
+            f"min {summary['min']:>3}  p10 {summary['p10']:>3}  p50 {summary['p50']:>3}  "
+            f"p90 {summary['p90']:>3}  p99 {summary['p99']:>3}  max {summary['max']:>3}")
+
+
+def main(argv=None):
+    """Run a Monte Carlo simulation and print the distributions."""
+    parser = argparse.ArgumentParser(description="Simulate Bingo games to tune payouts.")
+    parser.add_argument('--games', type=int, default=10000, help="number of games to play")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--chunk-size', type=int, default=500, help="games per work unit")
+    parser.add_argument('--seed', type=int, default=None, help="master seed for reproducible runs")
+    args = parser.parse_args(argv)
+
+    results = simulate(args.games, args.workers, args.chunk_size, args.seed)
+    first_lines, bingos, scores = zip(*results) if results else ((), (), ())
+
+    print(f"🎲 {len(results)} games  (LINE_POINTS={LINE_POINTS}, BINGO_POINTS={BINGO_POINTS})")
+    print(format_summary("Balls to first line", summarize(first_lines)))
+    print(format_summary("Balls to bingo", summarize(bingos)))
+    print(format_summary("Score", summarize(scores)))
+
+
+if __name__ == "__main__":
+    main()
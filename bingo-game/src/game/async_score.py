@@ -0,0 +1,151 @@
+# src/game/async_score.py
+import asyncio
+import os
+import weakref
+
+import redis
+import redis.asyncio as aioredis
+
+from src.game.cache import MISSING
+from src.game.leaderboard import leaderboard_key
+from src.game.patterns import mask_from_marked
+from src.game.score import (
+    BaseScoreTracker, CONNECT_TIMEOUT, HIGH_SCORE_KEY, MAX_CONNECTIONS, SAVE_RESULT_SCRIPT,
+    _debug, get_cache, get_health, save_result_call,
+)
+
+# One client per event loop and server; asyncio connections can't cross loops
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client(host, port):
+    """Return the shared redis.asyncio client for host:port on the running loop."""
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get((host, port))
+    if client is None:
+        pool = aioredis.BlockingConnectionPool(
+            host=host,
+            port=port,
+            decode_responses=True,
+            socket_connect_timeout=CONNECT_TIMEOUT,
+            max_connections=MAX_CONNECTIONS,
+            timeout=CONNECT_TIMEOUT
+        )
+        client = aioredis.Redis(connection_pool=pool)
+        clients[(host, port)] = client
+    return client
+
+
+class AsyncScoreTracker(BaseScoreTracker):
+    """
+    ScoreTracker for asyncio servers.
+
+    Scoring is the same as ScoreTracker; saving a result and reading
+    the high score or leaderboard are awaited on redis.asyncio, so one
+    event loop can run many games without a thread each. Reads share
+    ScoreTracker's cache and circuit breaker for the same server.
+    """
+
+    def __init__(self, use_redis=True, client=None, player=None, rules=None):
+        super().__init__(player, rules)
+        self.use_redis = use_redis
+        self.redis_host = os.getenv('REDIS_HOST', 'redis')
+        self.redis_port = int(os.getenv('REDIS_PORT', 6379))
+        self.health = get_health(self.redis_host, self.redis_port)
+        self.cache = get_cache(self.redis_host, self.redis_port)
+        # Injected client, or the shared one for the running loop on first use
+        self.redis_client = client
+
+    def _get_client(self):
+        """Return a client, or None if Redis is off or the breaker is open."""
+        if not self.use_redis:
+            return None
+        if not self.health.healthy and not self.health.try_acquire():
+            return None
+        if self.redis_client is None:
+            self.redis_client = get_async_client(self.redis_host, self.redis_port)
+        return self.redis_client
+
+    async def update_score(self, marked):
+        """Update the player's score based on new lines or bingo."""
+        rows, cols = len(marked), len(marked[0]) if marked else 0
+        if self._award_mask(mask_from_marked(marked), rows, cols):
+            await self.save_game_result()
+
+    async def record_card(self, card):
+        """Update the score from every pattern the card's marks now cover."""
+        if self.score_card(card):
+            await self.save_game_result()
+
+    def score_card(self, card):
+        """
+        Score the card's new marks without saving; True if this reached
+        bingo and the caller should await save_game_result().
+        """
+        return self._award_mask(card.mask, card.rows, card.cols)
+
+    async def record_lines(self, completed, total_rows):
+        """Update the score from the lines returned by BingoCard.mark_number."""
+        if self._award_lines(completed, total_rows):
+            await self.save_game_result()
+
+    async def save_game_result(self):
+        """Save the completed game with one atomic script call, e.g. from a background task."""
+        client = self._get_client()
+        if client is None:
+            return
+        keys, args = save_result_call(self._game_result())
+        try:
+            save_result = client.register_script(SAVE_RESULT_SCRIPT)
+            await save_result(keys=keys, args=args)
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            self.health.record_failure()
+            _debug(f"Failed to save game result: {e}")
+        except Exception as e:
+            _debug(f"Failed to save game result: {e}")
+        else:
+            self.health.record_success()
+            self.cache.invalidate()
+
+    async def _cached_read(self, key, read, fallback):
+        """Serve key from the read cache, or await read(client) and cache it."""
+        value = self.cache.get(key)
+        if value is not MISSING:
+            return value
+        client = self._get_client()
+        if client is None:
+            return fallback
+        try:
+            value = await read(client)
+        except (redis.ConnectionError, redis.TimeoutError):
+            self.health.record_failure()
+            return fallback
+        except (ValueError, Exception):
+            return fallback
+        self.health.record_success()
+        self.cache.set(key, value)
+        return value
+
+    async def get_high_score(self):
+        """Get high score from Redis."""
+        async def read(client):
+            high_score = await client.get(HIGH_SCORE_KEY)
+            return int(high_score) if high_score else 0
+        return await self._cached_read(HIGH_SCORE_KEY, read, 0)
+
+    async def get_top_players(self, k=10, period='all'):
+        """Best k (player, score) pairs on the `period` leaderboard."""
+        async def read(client):
+            rows = await client.zrevrange(leaderboard_key(period), 0, k - 1, withscores=True)
+            return [(player, int(score)) for player, score in rows]
+        return await self._cached_read(('top', leaderboard_key(period), k), read, [])
+
+    async def get_rank(self, period='all'):
+        """This player's 1-based rank on the `period` leaderboard, or None."""
+        if not self.player:
+            return None
+
+        async def read(client):
+            rank = await client.zrevrank(leaderboard_key(period), self.player)
+            return None if rank is None else rank + 1
+        return await self._cached_read(('rank', leaderboard_key(period), self.player), read, None)
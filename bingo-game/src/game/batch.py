@@ -0,0 +1,128 @@
+# src/game/batch.py
+import numpy as np
+
+from src.game.card import card_from_grid
+from src.game.patterns import compile_pattern, mask_from_marked
+
+
+def draw_ranks(sequence, max_number):
+    """
+    Position of each number in a draw sequence.
+
+    Returns an array indexed by number; numbers that never come up get
+    len(sequence).
+    """
+    ranks = np.full(max_number + 1, len(sequence), dtype=np.int32)
+    ranks[np.asarray(sequence, dtype=np.int64)] = np.arange(len(sequence))
+    return ranks
+
+
+class CardBatch:
+    """
+    Many cards marked together.
+
+    Numbers live in one (N, rows, cols) integer array and marks in a
+    boolean array of the same shape, so a drawn number is marked on
+    every card with a single vectorized comparison.
+    """
+
+    def __init__(self, numbers):
+        self.cards = np.asarray(numbers, dtype=np.int16)
+        if self.cards.ndim != 3:
+            raise ValueError(f"Expected a (N, rows, cols) array, got shape {self.cards.shape}")
+        self.n_cards, self.rows, self.cols = self.cards.shape
+        self.marked = np.zeros(self.cards.shape, dtype=bool)
+
+    @classmethod
+    def from_cards(cls, cards):
+        """Build a batch from BingoCard objects, keeping their marks."""
+        batch = cls([card.card for card in cards])
+        for k, card in enumerate(cards):
+            batch.marked[k] = card.marked
+        return batch
+
+    def __len__(self):
+        return self.n_cards
+
+    def mark_number(self, number):
+        """Mark the number on every card that has it."""
+        self.marked |= self.cards == number
+
+    def mark_numbers(self, numbers):
+        """Mark several drawn numbers at once, e.g. from NumberDrawer.draw_many."""
+        self.marked |= np.isin(self.cards, numbers)
+
+    def count_lines(self):
+        """Full rows per card, same as check.count_lines."""
+        return self.marked.all(axis=2).sum(axis=1)
+
+    def is_bingo(self):
+        """Per-card bool array: all rows complete, same as check.is_bingo."""
+        return self.marked.all(axis=(1, 2))
+
+    def has_bingo(self):
+        """Per-card bool array: any full row, column or diagonal, same as BingoCard.has_bingo."""
+        result = self.marked.all(axis=2).any(axis=1)
+        result |= self.marked.all(axis=1).any(axis=1)
+        # Diagonals (only if square)
+        if self.rows == self.cols:
+            diag = np.arange(self.rows)
+            result |= self.marked[:, diag, diag].all(axis=1)
+            result |= self.marked[:, diag, self.cols - 1 - diag].all(axis=1)
+        return result
+
+    def masks(self):
+        """Per-card mark bitmask, bit (i * cols + j) for cell (i, j) as in BingoCard.mask."""
+        bits = np.left_shift(np.uint64(1), np.arange(self.rows * self.cols, dtype=np.uint64))
+        return (self.marked.reshape(self.n_cards, -1) * bits).sum(axis=1, dtype=np.uint64)
+
+    def pattern_counts(self, name):
+        """Completed placements of a registered pattern per card, one AND-compare each."""
+        if self.rows * self.cols > 64:
+            raise ValueError("Pattern masks need at most 64 cells per card")
+        masks = self.masks()
+        counts = np.zeros(self.n_cards, dtype=np.int32)
+        for m in compile_pattern(name, self.rows, self.cols):
+            m = np.uint64(m)
+            counts += (masks & m) == m
+        return counts
+
+    def has_pattern(self, name):
+        """Per-card bool array: any placement of the pattern is fully marked."""
+        return self.pattern_counts(name) > 0
+
+    def winners(self):
+        """Indices of the cards that have bingo (all rows complete)."""
+        return np.flatnonzero(self.is_bingo())
+
+    def winning_draws(self, sequence):
+        """
+        Draw index of each card's first line and bingo for a known sequence.
+
+        A row completes at the latest rank among its numbers, so both
+        come from one pass over the cards without marking ball by ball.
+        Marks already on the batch are ignored. Returns two int arrays
+        (first_line, bingo) of 0-based indices into sequence, with
+        len(sequence) meaning never.
+        """
+        max_number = max(int(self.cards.max()) if self.cards.size else 0, max(sequence, default=0))
+        ranks = draw_ranks(sequence, max_number)[self.cards]
+        row_done = ranks.max(axis=2)
+        return row_done.min(axis=1), row_done.max(axis=1)
+
+    def first_winners(self, sequence):
+        """
+        Resolve a game for a known sequence.
+
+        Returns (draw_index, card_ids) for the earliest bingo, or
+        (None, empty array) if no card completes.
+        """
+        _, bingo = self.winning_draws(sequence)
+        first = int(bingo.min()) if len(bingo) else len(sequence)
+        if first >= len(sequence):
+            return None, np.array([], dtype=np.intp)
+        return first, np.flatnonzero(bingo == first)
+
+    def card(self, index):
+        """Return card `index` as a BingoCard with the same marks."""
+        return card_from_grid(self.cards[index], mask_from_marked(self.marked[index].tolist()))
@@ -0,0 +1,42 @@
+# src/game/cache.py
+import threading
+import time
+
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Small in-memory cache whose entries expire `ttl` seconds after
+    they are stored, which bounds how stale a cached read can be.
+    """
+
+    def __init__(self, ttl, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=MISSING):
+        """Return the cached value, or default if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if self.clock() >= expires_at:
+                del self._entries[key]
+                return default
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, self.clock() + self.ttl)
+
+    def invalidate(self, key=None):
+        """Drop one key, or everything if key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
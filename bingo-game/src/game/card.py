@@ -1,20 +1,56 @@
 
 import random
 
+from src.game.patterns import LINE_PATTERNS, compile_pattern, matches
+
+# Size of every BingoCard
+ROWS = 3
+COLS = 5
+
 class BingoCard:
-    def __init__(self, numbers=None):
-        self.rows = 3
-        self.cols = 5
+    def __init__(self, numbers=None, rng=None):
+        self.rows = ROWS
+        self.cols = COLS
+        # Source of randomness for generated cards; defaults to the global random module
+        self.rng = rng if rng is not None else random
         if numbers is None:
             self.card = self.generate_card()
         else:
             self.card = self.build_from_numbers(numbers)
-        self.marked = [[False] * self.cols for _ in range(self.rows)]
+        # Marked state is a single int: bit (i * cols + j) is cell (i, j).
+        self.mask = 0
+        self.cell_bits, self.cell_pos = self.build_index(self.card)
+        # Hit counters per line, so completed lines are found while marking.
+        self.row_hits = [0] * self.rows
+        self.col_hits = [0] * self.cols
+        self.diag_hits = [0, 0]
+        self.completed_lines = []
+
+    @property
+    def marked(self):
+        """2D list of booleans, built from the bitmask on each access."""
+        return [
+            [bool(self.mask >> (i * self.cols + j) & 1) for j in range(self.cols)]
+            for i in range(self.rows)
+        ]
+
+    def build_index(self, card):
+        """Map every number on the card to its cell bit and (row, col)."""
+        cell_bits = {}
+        cell_pos = {}
+        for i in range(self.rows):
+            for j in range(self.cols):
+                cell_bits[card[i][j]] = 1 << (i * self.cols + j)
+                cell_pos[card[i][j]] = (i, j)
+        return cell_bits, cell_pos
 
     def build_from_numbers(self, numbers):
         """Build card from a list of numbers."""
         if len(numbers) != self.rows * self.cols:
             raise ValueError(f"Expected {self.rows * self.cols} numbers, got {len(numbers)}")
+        # Each number maps to one cell, so a repeat could never be fully marked
+        if len(set(numbers)) != len(numbers):
+            raise ValueError("Card numbers must all be different")
         card = []
         for i in range(self.rows):
             row = numbers[i * self.cols:(i + 1) * self.cols]
@@ -23,7 +59,7 @@ class BingoCard:
 
     def generate_card(self):
         # Numbers range from 1–75 (or adjust if your game rules differ)
-        numbers = random.sample(range(1, 76), self.rows * self.cols)
+        numbers = self.rng.sample(range(1, 76), self.rows * self.cols)
         card = []
         for i in range(self.rows):
             row = numbers[i * self.cols:(i + 1) * self.cols]
@@ -31,37 +67,72 @@ class BingoCard:
         return card
 
     def mark_number(self, number):
-        """Mark the number if found on the card."""
-        for i in range(self.rows):
-            for j in range(self.cols):
-                if self.card[i][j] == number:
-                    self.marked[i][j] = True
+        """
+        Mark the number if found on the card.
+
+        Returns the lines this mark completed as ("row", i), ("col", j)
+        or ("diag", k) tuples; empty if the number is absent or was
+        already marked.
+        """
+        bit = self.cell_bits.get(number)
+        if not bit or self.mask & bit:
+            return []
+        self.mask |= bit
 
-    def has_bingo(self):
-        """Check if there is a full row, column, or diagonal marked."""
-        # Rows
-        for row in self.marked:
-            if all(row):
-                return True
-        # Columns
-        for j in range(self.cols):
-            if all(self.marked[i][j] for i in range(self.rows)):
-                return True
+        i, j = self.cell_pos[number]
+        completed = []
+        self.row_hits[i] += 1
+        if self.row_hits[i] == self.cols:
+            completed.append(("row", i))
+        self.col_hits[j] += 1
+        if self.col_hits[j] == self.rows:
+            completed.append(("col", j))
         # Diagonals (only if square)
         if self.rows == self.cols:
-            if all(self.marked[i][i] for i in range(self.rows)):
-                return True
-            if all(self.marked[i][self.cols - 1 - i] for i in range(self.rows)):
-                return True
-        return False
+            if i == j:
+                self.diag_hits[0] += 1
+                if self.diag_hits[0] == self.rows:
+                    completed.append(("diag", 0))
+            if i == self.cols - 1 - j:
+                self.diag_hits[1] += 1
+                if self.diag_hits[1] == self.rows:
+                    completed.append(("diag", 1))
+        self.completed_lines.extend(completed)
+        return completed
+
+    def has_bingo(self, patterns=LINE_PATTERNS):
+        """
+        Check if any of `patterns` is fully marked; by default a full
+        row, column, or diagonal.
+        """
+        if tuple(patterns) == LINE_PATTERNS:
+            # Kept up to date by mark_number
+            return bool(self.completed_lines)
+        return any(matches(self.mask, compile_pattern(name, self.rows, self.cols)) for name in patterns)
 
     def __str__(self):
         """Display the card neatly."""
-        s = ""
-        for i in range(self.rows):
-            for j in range(self.cols):
-                val = self.card[i][j]
-                mark = "✔" if self.marked[i][j] else " "
-                s += f"{val:>3}{mark}  "
-            s += "\n"
-        return s
+        marked = self.marked
+        return "".join(
+            "".join(
+                f"{self.card[i][j]:>3}{'✔' if marked[i][j] else ' '}  "
+                for j in range(self.cols)
+            ) + "\n"
+            for i in range(self.rows)
+        )
+
+
+def card_from_grid(grid, mask=0):
+    """
+    Build a BingoCard from one card of a numpy container (a rows x cols
+    array, e.g. CardBatch.cards[i]), marking the cells set in mask.
+    """
+    rows, cols = len(grid), len(grid[0]) if len(grid) else 0
+    if (rows, cols) != (ROWS, COLS):
+        raise ValueError(f"BingoCard is {ROWS}x{COLS}, this card is {rows}x{cols}")
+    numbers = [int(n) for row in grid for n in row]
+    card = BingoCard(numbers=numbers)
+    for cell, number in enumerate(numbers):
+        if mask >> cell & 1:
+            card.mark_number(number)
+    return card
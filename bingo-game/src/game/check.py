@@ -1,23 +1,26 @@
 # src/game/check.py
+from src.game.patterns import compile_pattern, complete, mask_from_marked, matches
+
+
+def _size(marked):
+    return len(marked), len(marked[0]) if marked else 0
+
 
 def count_lines(marked):
     """
     Count how many full rows are completely True.
     marked is a 2D list of booleans, e.g. 3x5.
     """
-    count = 0
-    for row in marked:
-        if all(row):
-            count += 1
-    return count
+    return len(complete(mask_from_marked(marked), compile_pattern('row', *_size(marked))))
 
 
 def is_bingo(marked):
     """
     For a 3x5 card, bingo = all rows complete.
     """
-    total_rows = len(marked)
-    return count_lines(marked) == total_rows
+    if not marked:
+        return True
+    return matches(mask_from_marked(marked), compile_pattern('blackout', *_size(marked)))
 
 
 def count_diagonals(marked):
@@ -26,18 +29,13 @@ def count_diagonals(marked):
     For 3x5 this will normally return 0, but we keep it
     so we can change to 5x5 later or give partial points.
     """
-    rows = len(marked)
-    cols = len(marked[0])
+    return len(complete(mask_from_marked(marked), compile_pattern('diagonal', *_size(marked))))
 
-    diags = 0
 
-    # only count diagonals if it's square
-    if rows == cols:
-        # main diagonal
-        if all(marked[i][i] for i in range(rows)):
-            diags += 1
-        # anti-diagonal
-        if all(marked[i][cols - 1 - i] for i in range(rows)):
-            diags += 1
-
-    return diags
+def completed_patterns(marked, names):
+    """
+    Completed placements per pattern, e.g. {'row': 2, 'four_corners': 1}.
+    names are patterns from src.game.patterns.
+    """
+    mask = mask_from_marked(marked)
+    return {name: len(complete(mask, compile_pattern(name, *_size(marked)))) for name in names}
@@ -1,12 +1,31 @@
 import random
+from collections import namedtuple
+
+import numpy as np
+
+# Everything needed to rebuild a drawer: the shuffle seed and how many balls are out.
+DrawerState = namedtuple('DrawerState', ['seed', 'position'])
+
 
 class NumberDrawer:
-    def __init__(self, min_number=1, max_number=75):
+    def __init__(self, min_number=1, max_number=75, seed=None, rng=None):
         self.min_number = min_number
         self.max_number = max_number
-        self.remaining = list(range(min_number, max_number + 1))
-        random.shuffle(self.remaining)
+        # rng supplies seeds for new games; defaults to the global random module
+        self.rng = rng if rng is not None else random
+        # One flag per number in range, index n - min_number; reused across resets
+        self._drawn = np.zeros(max_number - min_number + 1, dtype=bool)
+        self._drawn_view = self._drawn.view()
+        self._drawn_view.flags.writeable = False
+        self._shuffle(seed)
+
+    def _shuffle(self, seed=None):
+        """Lay out a fresh draw order from seed (a new one if None)."""
+        self.seed = self.rng.getrandbits(64) if seed is None else seed
+        self.remaining = list(range(self.min_number, self.max_number + 1))
+        random.Random(self.seed).shuffle(self.remaining)
         self.drawn_numbers = []
+        self._drawn[:] = False
 
     def draw_number(self):
         """Draw one number randomly from remaining ones."""
@@ -14,15 +33,56 @@ class NumberDrawer:
             return None  # No numbers left
         number = self.remaining.pop()
         self.drawn_numbers.append(number)
+        self._drawn[number - self.min_number] = True
         return number
 
+    def draw_many(self, k):
+        """Draw up to k numbers at once, returned in draw order."""
+        split = max(0, len(self.remaining) - max(0, k))
+        batch = self.remaining[split:][::-1]
+        del self.remaining[split:]
+        self.drawn_numbers.extend(batch)
+        self._drawn[np.asarray(batch, dtype=np.intp) - self.min_number] = True
+        return batch
+
+    def __iter__(self):
+        """Draw the remaining numbers one at a time."""
+        while self.remaining:
+            yield self.draw_number()
+
+    def iter_batches(self, size):
+        """Draw the remaining numbers in lists of up to `size`."""
+        while self.remaining:
+            yield self.draw_many(size)
+
     def get_drawn_numbers(self):
         """Return list of all drawn numbers so far."""
         return self.drawn_numbers
 
-    def reset(self):
-        """Restart the game (reshuffle)."""
-        self.remaining = list(range(self.min_number, self.max_number + 1))
-        random.shuffle(self.remaining)
-        self.drawn_numbers = []
+    def is_drawn(self, number):
+        """Return True if number has already been drawn."""
+        if not self.min_number <= number <= self.max_number:
+            return False
+        return bool(self._drawn[number - self.min_number])
+
+    @property
+    def drawn_mask(self):
+        """Read-only bool array, index n - min_number, True for drawn numbers."""
+        return self._drawn_view
 
+    def draw_order(self):
+        """Return the full draw order: numbers drawn so far, then the rest as they will come."""
+        return self.drawn_numbers + self.remaining[::-1]
+
+    def snapshot(self):
+        """Return a constant-size DrawerState for this game."""
+        return DrawerState(self.seed, len(self.drawn_numbers))
+
+    def restore(self, state):
+        """Rebuild the drawer from a DrawerState, as if replayed to that point."""
+        self._shuffle(state.seed)
+        self.draw_many(state.position)
+
+    def reset(self, seed=None):
+        """Restart the game (reshuffle)."""
+        self._shuffle(seed)
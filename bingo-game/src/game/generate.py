@@ -0,0 +1,177 @@
+# src/game/generate.py
+import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+CHUNK_SIZE = 1_000_000  # cards sampled per vectorized step
+
+# splitmix64 finalizer constants
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def column_ranges(cols=5, min_number=1, max_number=75):
+    """
+    Standard B-I-N-G-O ranges: the numbers split evenly over the columns,
+    e.g. 1-15, 16-30, 31-45, 46-60, 61-75 for 5 columns of 1-75.
+    """
+    count = max_number - min_number + 1
+    if count % cols:
+        raise ValueError(f"{count} numbers don't split evenly over {cols} columns")
+    span = count // cols
+    return [(min_number + c * span, min_number + (c + 1) * span - 1) for c in range(cols)]
+
+
+def distinct_cards(rows=3, cols=5, min_number=1, max_number=75, bingo_columns=False):
+    """How many different cards exist for these settings."""
+    if bingo_columns:
+        lo, hi = column_ranges(cols, min_number, max_number)[0]
+        return math.perm(hi - lo + 1, rows) ** cols
+    return math.perm(max_number - min_number + 1, rows * cols)
+
+
+def _partial_shuffle(sets, pool, k, rng):
+    """
+    k distinct indexes from range(pool) for each of `sets` rows, as an
+    (sets, k) array: the first k steps of a Fisher-Yates shuffle, each
+    step done for every row at once.
+    """
+    dtype = np.uint8 if pool <= 256 else np.int16
+    perm = np.broadcast_to(np.arange(pool, dtype=dtype), (sets, pool)).copy()
+    flat = perm.reshape(-1)
+    # Flat offset of each row, so a swap is two 1-D gathers and scatters
+    base = np.arange(sets, dtype=np.int64) * pool
+    for i in range(k):
+        j = base + rng.integers(i, pool, size=sets)
+        picked = flat[j]
+        flat[j] = flat[base + i]
+        flat[base + i] = picked
+    return perm[:, :k]
+
+
+def sample_cards(n, rng, rows=3, cols=5, min_number=1, max_number=75, bingo_columns=False):
+    """
+    n random cards as an (n, rows, cols) array, duplicates possible.
+
+    All n cards are drawn together by a partial shuffle of the numbers,
+    so every card is uniform over the possible cards. With
+    bingo_columns, column c only draws from the c-th column_ranges()
+    range.
+    """
+    dtype = np.uint8 if max_number <= 255 else np.int16
+    if bingo_columns:
+        lo, hi = column_ranges(cols, min_number, max_number)[0]
+        span = hi - lo + 1
+        picks = _partial_shuffle(n * cols, span, rows, rng).reshape(n, cols, rows).astype(dtype)
+        picks += (np.arange(cols, dtype=dtype) * span + min_number)[:, None]
+        return picks.transpose(0, 2, 1).copy()
+    picks = _partial_shuffle(n, max_number - min_number + 1, rows * cols, rng).astype(dtype)
+    picks += dtype(min_number)
+    return picks.reshape(n, rows, cols)
+
+
+def fingerprints(cards):
+    """
+    64-bit fingerprint per card from its numbers in cell order.
+
+    Equal cards always get equal fingerprints, so dropping repeated
+    fingerprints removes every duplicate; a rare hash collision only
+    drops a card that was in fact unique.
+    """
+    cells = cards.reshape(len(cards), -1).astype(np.uint64)
+    weights = np.uint64(0x100000001B3) ** np.arange(cells.shape[1], dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        h = (cells * weights).sum(axis=1, dtype=np.uint64)
+        h ^= h >> np.uint64(30)
+        h *= _MIX1
+        h ^= h >> np.uint64(27)
+        h *= _MIX2
+        h ^= h >> np.uint64(31)
+    return h
+
+
+class FingerprintSet:
+    """
+    Set of card fingerprints, kept as a sorted uint64 array so that a
+    whole chunk is checked and added with vectorized searches.
+    """
+
+    def __init__(self):
+        self.values = np.empty(0, dtype=np.uint64)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __contains__(self, fingerprint):
+        return bool(self.contains(np.asarray([fingerprint], dtype=np.uint64))[0])
+
+    def contains(self, fps):
+        """Per-fingerprint bool array: already in the set."""
+        pos = np.searchsorted(self.values, fps)
+        found = np.zeros(len(fps), dtype=bool)
+        inside = pos < len(self.values)
+        found[inside] = self.values[pos[inside]] == fps[inside]
+        return found
+
+    def add_new(self, fps):
+        """
+        Add fingerprints; returns a bool array marking the ones that
+        were new, counting only the first of any repeats within fps.
+        """
+        unique, first = np.unique(fps, return_index=True)
+        fresh = ~self.contains(unique)
+        keep = np.zeros(len(fps), dtype=bool)
+        keep[first[fresh]] = True
+        new = unique[fresh]
+        # Both sides are sorted, so inserting at the search positions keeps the order
+        self.values = np.insert(self.values, np.searchsorted(self.values, new), new)
+        return keep
+
+
+def _sample_chunk(seed, size, rows, cols, min_number, max_number, bingo_columns):
+    """Worker entry point: sample one chunk from its own seed."""
+    return sample_cards(size, np.random.default_rng(seed), rows, cols,
+                        min_number, max_number, bingo_columns)
+
+
+def generate_cards(n, seed=None, rows=3, cols=5, min_number=1, max_number=75,
+                   bingo_columns=False, unique=True, chunk_size=CHUNK_SIZE, workers=None, seen=None):
+    """
+    Generate n cards as one (n, rows, cols) array.
+
+    Cards are sampled chunk_size at a time, each chunk from its own
+    seed spawned from `seed`, so the result doesn't depend on the
+    number of worker processes (None or 1 samples in this process).
+    With unique=True every card in the result is different, and
+    different from any fingerprint already in `seen` (a FingerprintSet
+    shared across print runs); rejected duplicates are resampled.
+    """
+    available = distinct_cards(rows, cols, min_number, max_number, bingo_columns)
+    if unique and n > available:
+        raise ValueError(f"Only {available} distinct cards exist, asked for {n}")
+    if unique and seen is None:
+        seen = FingerprintSet()
+    seeds = np.random.SeedSequence(seed)
+    dtype = np.uint8 if max_number <= 255 else np.int16
+    out = np.empty((n, rows, cols), dtype=dtype)
+    filled = 0
+    sample = partial(_sample_chunk, rows=rows, cols=cols, min_number=min_number,
+                     max_number=max_number, bingo_columns=bingo_columns)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 else None
+    try:
+        while filled < n:
+            left = n - filled
+            sizes = [min(chunk_size, left - start) for start in range(0, left, chunk_size)]
+            chunk_seeds = seeds.spawn(len(sizes))
+            batches = (pool.map if pool else map)(sample, chunk_seeds, sizes)
+            for batch in batches:
+                if unique:
+                    batch = batch[seen.add_new(fingerprints(batch))]
+                out[filled:filled + len(batch)] = batch
+                filled += len(batch)
+    finally:
+        if pool:
+            pool.shutdown()
+    return out
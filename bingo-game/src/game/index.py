@@ -0,0 +1,245 @@
+# src/game/index.py
+from collections import namedtuple
+
+import numpy as np
+
+from src.game.card import card_from_grid
+from src.game.patterns import LINE_PATTERNS, compile_pattern
+
+# What one ball did to the hall: (card, line) pairs it completed and cards it filled
+Marked = namedtuple('Marked', ['card_ids', 'lines', 'bingo'])
+# Near wins as parallel arrays: card, line (or BINGO) and the cell still missing
+NearWins = namedtuple('NearWins', ['card_ids', 'lines', 'cells'])
+
+# Line index used for the whole card in near wins
+BINGO = -1
+
+
+class CardIndex:
+    """
+    Cards indexed by number, for halls where most cards miss most balls.
+
+    The numbers of all cards are sorted once into a CSR layout: for each
+    number, the ids of the cards that have it and the cell it is in.
+    A drawn number then touches only those cards (about N * 15 / 75 of
+    them) instead of comparing every cell of every card as CardBatch
+    does. Each card keeps a hit counter per line, like BingoCard, so
+    completed lines are found while marking without rescanning cards.
+    Cards are assumed to hold each number at most once.
+
+    Lines and cards that get down to one or two missing cells are also
+    filed under the numbers they are waiting on, so "who wins if 42 is
+    called next" is answered from those entries alone. Pass
+    track_near=False to skip that bookkeeping when it isn't needed.
+    """
+
+    def __init__(self, numbers, patterns=LINE_PATTERNS, track_near=True):
+        cards = np.asarray(numbers)
+        if cards.ndim != 3:
+            raise ValueError(f"Expected a (N, rows, cols) array, got shape {cards.shape}")
+        self.n_cards, self.rows, self.cols = cards.shape
+        self.cells = self.rows * self.cols
+        if self.cells > 64:
+            raise ValueError("Card masks need at most 64 cells per card")
+        if self.n_cards and cards.min() < 0:
+            raise ValueError("Card numbers can't be negative")
+        self.cards = cards
+        self.numbers = cards.reshape(self.n_cards, self.cells)
+        flat = cards.reshape(-1)
+        if flat.size and flat.max() <= 255:
+            flat = flat.astype(np.uint8)  # radix sort for small integers
+        order = np.argsort(flat, kind='stable')
+        counts = np.bincount(flat, minlength=1)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.card_ids = (order // self.cells).astype(np.int32)
+        self.cell_ids = (order % self.cells).astype(np.uint8)
+        self._build_lines(patterns)
+        self.masks = np.zeros(self.n_cards, dtype=np.uint64)
+        self.filled = np.zeros(self.n_cards, dtype=np.uint8)
+        self.line_hits = np.zeros((self.n_cards, len(self.lines) + 1), dtype=np.uint8)
+        self.track_near = track_near
+        # number -> chunks of NearWins, for cards one and two numbers away
+        self._waiting = ({}, {})
+        everyone = np.arange(self.n_cards, dtype=np.int32)
+        for k, size in enumerate(self.line_sizes[:-1].tolist()):
+            if 1 <= size <= 2:
+                self._wait(everyone, np.full(self.n_cards, k, dtype=np.intp), size)
+        if self.cells <= 2:
+            self._wait(everyone, np.full(self.n_cards, BINGO, dtype=np.intp), self.cells)
+
+    def _build_lines(self, patterns):
+        """
+        Lines as (pattern, placement) pairs, and a cell -> lines table.
+
+        The table is padded with a spare column whose size is 0, so it
+        is counted like the others but never reported as complete.
+        """
+        self.lines = []
+        sizes = []
+        masks = []
+        members = [[] for _ in range(self.cells)]
+        for name in patterns:
+            for k, mask in enumerate(compile_pattern(name, self.rows, self.cols)):
+                for cell in range(self.cells):
+                    if mask >> cell & 1:
+                        members[cell].append(len(self.lines))
+                self.lines.append((name, k))
+                sizes.append(bin(mask).count('1'))
+                masks.append(mask)
+        spare = len(self.lines)
+        width = max((len(m) for m in members), default=0)
+        self.cell_lines = np.array([m + [spare] * (width - len(m)) for m in members],
+                                   dtype=np.intp).reshape(self.cells, width)
+        self.line_sizes = np.array(sizes + [0], dtype=np.uint8)
+        # The last entry covers the whole card, so BINGO (-1) indexes it
+        self.line_masks = np.array(masks + [(1 << self.cells) - 1], dtype=np.uint64)
+
+    @classmethod
+    def from_cards(cls, cards, patterns=LINE_PATTERNS, track_near=True):
+        """Index BingoCard objects, keeping their marks."""
+        index = cls([card.card for card in cards], patterns, track_near)
+        masks = np.array([card.mask for card in cards], dtype=np.uint64)
+        # One call per cell: every card with that cell marked, each card once
+        for cell in range(index.cells):
+            ids = np.flatnonzero((masks >> np.uint64(cell)) & np.uint64(1)).astype(np.int32)
+            index._mark_cells(ids, np.full(len(ids), cell, dtype=np.uint8))
+        return index
+
+    def __len__(self):
+        return self.n_cards
+
+    def hits(self, number):
+        """(card_ids, cells) of every card that has the number."""
+        if not 0 <= number < len(self.offsets) - 1:
+            return self.card_ids[:0], self.cell_ids[:0]
+        start, end = self.offsets[number], self.offsets[number + 1]
+        return self.card_ids[start:end], self.cell_ids[start:end]
+
+    def mark_number(self, number):
+        """
+        Mark the number on the cards that have it.
+
+        Returns Marked(card_ids, lines, bingo): the lines this ball
+        completed, as parallel arrays of card ids and indexes into
+        self.lines, and the ids of the cards it filled. Balls already
+        marked complete nothing.
+        """
+        ids, cells = self.hits(number)
+        marked = self._mark_cells(ids, cells)
+        # Everything waiting on this number has just moved on
+        for waiting in self._waiting:
+            waiting.pop(number, None)
+        return marked
+
+    def _mark_cells(self, ids, cells):
+        bits = np.left_shift(np.uint64(1), cells.astype(np.uint64))
+        fresh = (self.masks[ids] & bits) == 0
+        ids, cells, bits = ids[fresh], cells[fresh], bits[fresh]
+        self.masks[ids] |= bits
+        self.filled[ids] += 1
+        # A card holds the number once, so every (card, line) pair is distinct
+        lines = self.cell_lines[cells]
+        rows = np.broadcast_to(ids[:, None], lines.shape)
+        self.line_hits[rows, lines] += 1
+        left = self.line_sizes[lines].astype(np.int16) - self.line_hits[rows, lines]
+        left[lines == len(self.lines)] = -1
+        card_left = self.cells - self.filled[ids].astype(np.int16)
+        for away in (1, 2):
+            near = left == away
+            self._wait(rows[near], lines[near], away)
+            near = card_left == away
+            self._wait(ids[near], np.full(near.sum(), BINGO, dtype=np.intp), away)
+        done = left == 0
+        return Marked(rows[done], lines[done], ids[card_left == 0])
+
+    def _wait(self, ids, lines, away):
+        """File (card, line) pairs with `away` cells left under each missing number."""
+        if not self.track_near or not len(ids):
+            return
+        need = self.line_masks[lines] & ~self.masks[ids]
+        low = need & (~need + np.uint64(1))
+        bits = [need] if away == 1 else [low, need ^ low]
+        for bit in bits:
+            # Single-bit masks are exact in float64, so log2 gives the cell
+            cells = np.log2(bit.astype(np.float64)).astype(np.uint8)
+            numbers = self.numbers[ids, cells]
+            order = np.argsort(numbers, kind='stable')
+            keys, starts = np.unique(numbers[order], return_index=True)
+            for number, part in zip(keys.tolist(), np.split(order, starts[1:])):
+                self._waiting[away - 1].setdefault(number, []).append(
+                    NearWins(ids[part], lines[part], cells[part]))
+
+    def _left(self, ids, lines):
+        """Cells still missing from each (card, line) pair."""
+        left = self.line_sizes[lines].astype(np.int16) - self.line_hits[ids, lines]
+        return np.where(lines == BINGO, self.cells - self.filled[ids].astype(np.int16), left)
+
+    def near_wins(self, number, away=1):
+        """
+        NearWins(card_ids, lines, cells) for the lines and cards that are
+        `away` (1 or 2) numbers from complete, `number` being one of them.
+        lines index self.lines, or are BINGO for the whole card.
+
+        Entries are checked and compacted here rather than on every
+        mark, so the cost is the entries filed under this number.
+        """
+        if not self.track_near:
+            raise ValueError("Near wins aren't tracked on this index")
+        if away not in (1, 2):
+            raise ValueError("Near wins are tracked one or two numbers away")
+        chunks = self._waiting[away - 1].get(number)
+        if not chunks:
+            return NearWins(np.array([], dtype=np.int32), np.array([], dtype=np.intp),
+                            np.array([], dtype=np.uint8))
+        ids, lines, cells = (np.concatenate(part) for part in zip(*chunks))
+        # Still waiting: the cell is unmarked and nothing else has been marked
+        valid = (self.masks[ids] >> cells.astype(np.uint64)) & np.uint64(1) == 0
+        valid &= self._left(ids, lines) == away
+        found = NearWins(ids[valid], lines[valid], cells[valid])
+        self._waiting[away - 1][number] = [found]
+        return found
+
+    def waiting_on(self, number, away=1):
+        """
+        Ids of the cards `away` numbers from a line or bingo that are
+        waiting on `number`; with away=1, the cards that complete
+        something if it is called next.
+        """
+        return np.unique(self.near_wins(number, away).card_ids)
+
+    def near(self, away=1):
+        """Every number some card is waiting on, mapped to those cards' ids."""
+        found = {}
+        for number in sorted(self._waiting[away - 1]):
+            ids = self.waiting_on(number, away)
+            if len(ids):
+                found[number] = ids
+        return found
+
+    def missing(self, index):
+        """Cells still missing from each line of card `index`, in self.lines order."""
+        return self.line_sizes[:-1].astype(np.int16) - self.line_hits[index, :-1]
+
+    def mark_numbers(self, numbers):
+        """Mark several drawn numbers in turn; returns the ids of cards filled."""
+        filled = [self.mark_number(number).bingo for number in numbers]
+        return np.concatenate(filled) if filled else np.array([], dtype=np.int32)
+
+    def completed(self, name):
+        """Completed placements of one indexed pattern per card."""
+        columns = [k for k, (line, _) in enumerate(self.lines) if line == name]
+        if not columns:
+            raise ValueError(f"Pattern {name} is not indexed")
+        return (self.line_hits[:, columns] == self.line_sizes[columns]).sum(axis=1)
+
+    def is_bingo(self):
+        """Per-card bool array: every cell marked, same as CardBatch.is_bingo."""
+        return self.filled == self.cells
+
+    def winners(self):
+        """Indices of the cards that have bingo."""
+        return np.flatnonzero(self.is_bingo())
+
+    def card(self, index):
+        """Return card `index` as a BingoCard with the same marks."""
+        return card_from_grid(self.cards[index], int(self.masks[index]))
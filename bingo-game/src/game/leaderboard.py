@@ -0,0 +1,37 @@
+# src/game/leaderboard.py
+from datetime import datetime
+
+PERIODS = ('all', 'daily', 'weekly')
+
+# Seconds a board is kept after its last update; 0 keeps it forever.
+# Period boards outlive their period so they can still be read just after.
+PERIOD_TTL = {
+    'all': 0,
+    'daily': 2 * 24 * 3600,
+    'weekly': 14 * 24 * 3600,
+}
+
+
+def leaderboard_key(period='all', when=None):
+    """Sorted-set key of the `period` board that covers `when` (default: now)."""
+    when = when or datetime.now()
+    if period == 'all':
+        return 'leaderboard:all'
+    if period == 'daily':
+        return f"leaderboard:daily:{when:%Y-%m-%d}"
+    if period == 'weekly':
+        year, week, _ = when.isocalendar()
+        return f"leaderboard:weekly:{year}-W{week:02d}"
+    raise ValueError(f"Unknown leaderboard period: {period}")
+
+
+def top_players(client, k=10, period='all', when=None):
+    """Best k (player, score) pairs, highest first. O(log N + k)."""
+    rows = client.zrevrange(leaderboard_key(period, when), 0, k - 1, withscores=True)
+    return [(player, int(score)) for player, score in rows]
+
+
+def player_rank(client, player, period='all', when=None):
+    """1-based rank of player's best score, or None if unranked. O(log N)."""
+    rank = client.zrevrank(leaderboard_key(period, when), player)
+    return None if rank is None else rank + 1
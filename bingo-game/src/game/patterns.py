@@ -0,0 +1,181 @@
+# src/game/patterns.py
+from collections import namedtuple
+from functools import lru_cache
+
+# Patterns made of one straight line, counted as lines_done when scoring
+LINE_PATTERNS = ('row', 'column', 'diagonal')
+
+CompiledPattern = namedtuple('CompiledPattern', ['name', 'masks'])
+
+_registry = {}
+
+
+def _rows(rows, cols):
+    return [[(i, j) for j in range(cols)] for i in range(rows)]
+
+
+def _columns(rows, cols):
+    return [[(i, j) for i in range(rows)] for j in range(cols)]
+
+
+def _diagonals(rows, cols):
+    """Both diagonals, main first; only on square cards, as in BingoCard."""
+    if rows != cols:
+        return []
+    return [[(i, i) for i in range(rows)], [(i, cols - 1 - i) for i in range(rows)]]
+
+
+def _four_corners(rows, cols):
+    return [sorted({(0, 0), (0, cols - 1), (rows - 1, 0), (rows - 1, cols - 1)})]
+
+
+def _x(rows, cols):
+    """
+    Both diagonals. On a non-square card each row takes the cell nearest
+    the diagonal, so 3x5 gives corners plus the centre.
+    """
+    cells = set()
+    for i in range(rows):
+        j = round(i * (cols - 1) / (rows - 1)) if rows > 1 else 0
+        cells.update({(i, j), (i, cols - 1 - j)})
+    return [sorted(cells)]
+
+
+def _blackout(rows, cols):
+    return [[(i, j) for i in range(rows) for j in range(cols)]]
+
+
+def register_pattern(name, shape):
+    """
+    Add a winning shape to the registry.
+
+    shape is either a list of (row, col) cells, or a function
+    shape(rows, cols) returning a list of placements, each a list of
+    cells, for cards of that size (e.g. one placement per row).
+    """
+    if name in _registry:
+        raise ValueError(f"Pattern {name} is already registered")
+    if not callable(shape):
+        cells = [tuple(cell) for cell in shape]
+        if not cells:
+            raise ValueError(f"Pattern {name} has no cells")
+        shape = lambda rows, cols: [cells]
+    _registry[name] = shape
+    compile_pattern.cache_clear()
+
+
+def unregister_pattern(name):
+    """Remove a registered shape."""
+    del _registry[name]
+    compile_pattern.cache_clear()
+
+
+def pattern_names():
+    return list(_registry)
+
+
+def cell_mask(cells, cols):
+    """Bitmask of cells, using BingoCard's bit (i * cols + j) for cell (i, j)."""
+    mask = 0
+    for i, j in cells:
+        mask |= 1 << (i * cols + j)
+    return mask
+
+
+@lru_cache(maxsize=None)
+def compile_pattern(name, rows, cols):
+    """
+    Tuple of bitmasks, one per placement of `name` on a rows x cols card.
+
+    Compiled once per size and shared, so checking a card is one
+    AND-compare per placement: mask & m == m.
+    """
+    if name not in _registry:
+        raise ValueError(f"Unknown pattern {name}")
+    masks = []
+    for cells in _registry[name](rows, cols):
+        for i, j in cells:
+            if not (0 <= i < rows and 0 <= j < cols):
+                raise ValueError(f"Pattern {name} cell {(i, j)} is outside a {rows}x{cols} card")
+        masks.append(cell_mask(cells, cols))
+    return tuple(masks)
+
+
+def compile_patterns(names, rows, cols):
+    """CompiledPattern for each name, in order."""
+    return tuple(CompiledPattern(name, compile_pattern(name, rows, cols)) for name in names)
+
+
+def complete(mask, masks):
+    """Indexes of the placements fully covered by mask."""
+    return [k for k, m in enumerate(masks) if mask & m == m]
+
+
+def matches(mask, masks):
+    """True if mask covers any placement."""
+    return any(mask & m == m for m in masks)
+
+
+def mask_from_marked(marked):
+    """Bitmask of a 2D list of booleans, e.g. a card's marked grid."""
+    cols = len(marked[0]) if marked else 0
+    mask = 0
+    for i, row in enumerate(marked):
+        for j, value in enumerate(row):
+            if value:
+                mask |= 1 << (i * cols + j)
+    return mask
+
+
+class Rules:
+    """
+    Which patterns score, their points, and which of them is bingo.
+
+    points maps pattern name to points per placement completed; bingo
+    names the patterns that win the game. Compiled masks, and the
+    placements through each cell, are cached per card size.
+    """
+
+    def __init__(self, points, bingo):
+        self.points = dict(points)
+        self.bingo = frozenset(bingo)
+        for name in self.bingo:
+            self.points.setdefault(name, 0)
+        for name in self.points:
+            if name not in _registry:
+                raise ValueError(f"Unknown pattern {name}")
+        self._compiled = {}
+        self._by_cell = {}
+
+    def compile(self, rows, cols):
+        """CompiledPattern for every scoring pattern on a rows x cols card."""
+        compiled = self._compiled.get((rows, cols))
+        if compiled is None:
+            compiled = compile_patterns(tuple(self.points), rows, cols)
+            self._compiled[(rows, cols)] = compiled
+        return compiled
+
+    def by_cell(self, rows, cols):
+        """
+        For each cell bit, the (name, index, mask) placements that use it,
+        so marking one cell only checks the placements through it.
+        """
+        table = self._by_cell.get((rows, cols))
+        if table is None:
+            table = [[] for _ in range(rows * cols)]
+            for name, masks in self.compile(rows, cols):
+                for index, m in enumerate(masks):
+                    for cell in range(rows * cols):
+                        if m >> cell & 1:
+                            table[cell].append((name, index, m))
+            table = tuple(tuple(placements) for placements in table)
+            self._by_cell[(rows, cols)] = table
+        return table
+
+
+register_pattern('row', _rows)
+register_pattern('column', _columns)
+register_pattern('diagonal', _diagonals)
+register_pattern('four_corners', _four_corners)
+register_pattern('x', _x)
+register_pattern('blackout', _blackout)
@@ -1,83 +1,490 @@
 # src/game/score.py
 import redis
+import atexit
 import json
 import os
+import threading
+import time
 from datetime import datetime
 
+from src.game.cache import MISSING, TTLCache
+from src.game.leaderboard import PERIODS, PERIOD_TTL, leaderboard_key, top_players, player_rank
+from src.game.patterns import LINE_PATTERNS, Rules, mask_from_marked
+from src.game.writer import ResultWriter
+
 LINE_POINTS = 10
 BINGO_POINTS = 50
 
-class ScoreTracker:
+# Points per full row and bingo on a full card (every row)
+DEFAULT_RULES = Rules({'row': LINE_POINTS, 'blackout': BINGO_POINTS}, bingo=['blackout'])
+
+# BingoCard.mark_number line kinds and the patterns they complete
+LINE_KINDS = {'row': 'row', 'col': 'column', 'diag': 'diagonal'}
+
+CONNECT_TIMEOUT = 5      # seconds to wait for a Redis socket to connect
+READ_WAIT = 0.5          # seconds a read waits for a first connection
+RETRY_BACKOFF = 1        # seconds before the first reconnect attempt
+MAX_RETRY_BACKOFF = 60
+MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', 50))
+
+DEFAULT_SPILL_FILE = 'result_spill.jsonl'
+
+READ_CACHE_TTL = float(os.getenv('READ_CACHE_TTL', 5))  # max staleness of cached reads
+
+HISTORY_KEY = 'game_history'
+HIGH_SCORE_KEY = 'high_score'
+HISTORY_MAX_LEN = int(os.getenv('HISTORY_MAX_LEN', 1000))
+HISTORY_PAGE_SIZE = 20
+
+# Push the history entry, trim the history, raise the player's
+# leaderboard scores and the high score in one atomic call.
+# KEYS: history list, high score, then any leaderboards.
+# ARGV: entry JSON, score, history cap, player, then a TTL per leaderboard.
+# Returns 1 if the high score was raised.
+SAVE_RESULT_SCRIPT = """
+redis.call('LPUSH', KEYS[1], ARGV[1])
+redis.call('LTRIM', KEYS[1], 0, tonumber(ARGV[3]) - 1)
+local score = tonumber(ARGV[2])
+for i = 3, #KEYS do
+    local best = tonumber(redis.call('ZSCORE', KEYS[i], ARGV[4]))
+    if not best or best < score then
+        redis.call('ZADD', KEYS[i], score, ARGV[4])
+    end
+    local ttl = tonumber(ARGV[i + 2])
+    if ttl > 0 then
+        redis.call('EXPIRE', KEYS[i], ttl)
+    end
+end
+local high = tonumber(redis.call('GET', KEYS[2]))
+if not high or high < score then
+    redis.call('SET', KEYS[2], score)
+    return 1
+end
+return 0
+"""
+
+
+def _debug(message):
+    if os.getenv('DEBUG', 'false').lower() == 'true':
+        print(message)
+
+
+class RedisHealth:
+    """
+    Circuit breaker shared by every tracker that talks to one Redis server.
+
+    After a failure, new connection attempts are refused until the
+    backoff expires, and then only one attempt is let through at a time.
+    Each further failure doubles the backoff, up to MAX_RETRY_BACKOFF.
+    A connection attempt in flight is shared too, so callers that arrive
+    while it runs neither start another one nor wait for it.
+    """
+
     def __init__(self):
+        self.failures = 0
+        self.retry_at = 0.0
+        self.healthy = False
+        # Set when the connection attempt in flight has finished
+        self.attempt = None
+        self._lock = threading.Lock()
+
+    def _backoff(self):
+        return min(MAX_RETRY_BACKOFF, RETRY_BACKOFF * 2 ** (self.failures - 1))
+
+    def _acquire(self):
+        if not self.failures:
+            return True
+        now = time.monotonic()
+        if now < self.retry_at:
+            return False
+        # Hold the breaker open while this attempt is in flight
+        self.retry_at = now + self._backoff()
+        return True
+
+    def try_acquire(self):
+        """Return True if a connection attempt may be made now."""
+        with self._lock:
+            return self._acquire()
+
+    def start_attempt(self):
+        """
+        Return a new Event for a connection attempt, to be set when it
+        ends; None if an attempt is already in flight or the breaker
+        is open.
+        """
+        with self._lock:
+            if self.attempt is not None and not self.attempt.is_set():
+                return None
+            if not self._acquire():
+                return None
+            self.attempt = threading.Event()
+            return self.attempt
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.retry_at = 0.0
+            self.healthy = True
+
+    def record_failure(self):
+        with self._lock:
+            self.healthy = False
+            self.failures += 1
+            self.retry_at = time.monotonic() + self._backoff()
+
+
+_health = {}
+_clients = {}
+_writers = {}
+_caches = {}
+_health_lock = threading.Lock()
+
+
+def get_health(host, port):
+    """Return the shared RedisHealth for host:port."""
+    with _health_lock:
+        return _health.setdefault((host, port), RedisHealth())
+
+
+def get_cache(host, port):
+    """Return the shared read cache for host:port."""
+    with _health_lock:
+        return _caches.setdefault((host, port), TTLCache(READ_CACHE_TTL))
+
+
+def get_client(host, port):
+    """
+    Return the process-wide client for host:port.
+
+    Every tracker shares one client and its connection pool. The pool
+    is capped at MAX_CONNECTIONS and blocks when it is exhausted, so many
+    concurrent games queue for a connection instead of opening more.
+    """
+    with _health_lock:
+        client = _clients.get((host, port))
+        if client is None:
+            pool = redis.BlockingConnectionPool(
+                host=host,
+                port=port,
+                decode_responses=True,
+                socket_connect_timeout=CONNECT_TIMEOUT,
+                max_connections=MAX_CONNECTIONS,
+                timeout=CONNECT_TIMEOUT
+            )
+            client = redis.Redis(connection_pool=pool)
+            _clients[(host, port)] = client
+        return client
+
+
+def save_result_call(result):
+    """Return the (keys, args) for SAVE_RESULT_SCRIPT to save one result."""
+    player = result.get('player') or ''
+    keys = [HISTORY_KEY, HIGH_SCORE_KEY]
+    args = [json.dumps(result), result['score'], HISTORY_MAX_LEN, player]
+    if player:
+        when = datetime.fromisoformat(result['timestamp'])
+        for period in PERIODS:
+            keys.append(leaderboard_key(period, when))
+            args.append(PERIOD_TTL[period])
+    return keys, args
+
+
+def _write_results(pipe, results):
+    """Queue the save script for each result on a pipeline."""
+    save_result = pipe.register_script(SAVE_RESULT_SCRIPT)
+    for result in results:
+        keys, args = save_result_call(result)
+        save_result(keys=keys, args=args)
+
+
+def get_writer(host, port, client_factory=get_client):
+    """
+    Return the process-wide ResultWriter for host:port.
+
+    Results spill to RESULT_SPILL_FILE while Redis is down. Whatever is
+    still queued is flushed when the process exits.
+    """
+    health = get_health(host, port)
+    cache = get_cache(host, port)
+    with _health_lock:
+        writer = _writers.get((host, port, client_factory))
+        if writer is None:
+            writer = ResultWriter(
+                lambda: client_factory(host, port),
+                health,
+                _write_results,
+                os.getenv('RESULT_SPILL_FILE', DEFAULT_SPILL_FILE),
+                # Our own writes make cached reads stale straight away
+                on_written=cache.invalidate
+            )
+            atexit.register(writer.flush)
+            _writers[(host, port, client_factory)] = writer
+        return writer
+
+
+def reset_connections():
+    """Close shared connection pools and forget health state, writers and caches."""
+    with _health_lock:
+        for client in _clients.values():
+            client.connection_pool.disconnect()
+        for writer in _writers.values():
+            atexit.unregister(writer.flush)
+        _clients.clear()
+        _writers.clear()
+        _caches.clear()
+        _health.clear()
+
+
+class BaseScoreTracker:
+    """
+    Scoring rules shared by ScoreTracker and AsyncScoreTracker.
+
+    Every placement of a pattern in rules scores its points once, and
+    the first bingo pattern completed ends the game. The default rules
+    score each full row and a full card as bingo.
+    """
+
+    def __init__(self, player=None, rules=None):
         self.score = 0
         self.lines_done = 0
         self.has_bingo = False
+        # Leaderboard name; anonymous games only count towards high_score
+        self.player = player
+        self.rules = rules or DEFAULT_RULES
+        # (pattern, placement) pairs already scored
+        self.won = set()
+        self._rows_done = set()
+        # None until the first mask has been fully checked
+        self._last_mask = None
+
+    def _win(self, name, index):
+        """Score one placement; True if it is the game's first bingo."""
+        self.won.add((name, index))
+        self.score += self.rules.points[name]
+        if name in LINE_PATTERNS:
+            self.lines_done += 1
+        if name in self.rules.bingo and not self.has_bingo:
+            self.has_bingo = True
+            return True
+        return False
+
+    def _award_mask(self, mask, rows, cols):
+        """
+        Score every newly covered placement of the rules' patterns.
+
+        The first call checks every placement, as the card may already
+        be marked; after that only the placements through a newly
+        marked cell are checked. Returns True when this call reached
+        bingo, i.e. the game result should be saved.
+        """
+        if self._last_mask is None:
+            self._last_mask = mask
+            reached = False
+            for name, masks in self.rules.compile(rows, cols):
+                for index, m in enumerate(masks):
+                    if mask & m == m and (name, index) not in self.won:
+                        reached = self._win(name, index) or reached
+            return reached
+        new = mask & ~self._last_mask
+        self._last_mask = mask
+        reached = False
+        by_cell = self.rules.by_cell(rows, cols)
+        while new:
+            bit = new & -new
+            new ^= bit
+            for name, index, m in by_cell[bit.bit_length() - 1]:
+                if mask & m == m and (name, index) not in self.won:
+                    reached = self._win(name, index) or reached
+        return reached
+
+    def _award_lines(self, completed, total_rows):
+        """
+        Score the lines returned by BingoCard.mark_number without reading
+        the card. Each line scores as its row, column or diagonal pattern,
+        and every row done is also blackout; other shapes need record_card.
+        """
+        reached = False
+        for kind, index in completed:
+            name = LINE_KINDS[kind]
+            if kind == 'row':
+                self._rows_done.add(index)
+            if name in self.rules.points and (name, index) not in self.won:
+                reached = self._win(name, index) or reached
+        if (len(self._rows_done) == total_rows and 'blackout' in self.rules.points
+                and ('blackout', 0) not in self.won):
+            reached = self._win('blackout', 0) or reached
+        return reached
+
+    def _game_result(self):
+        """The record saved for a finished game."""
+        game_data = {
+            'score': self.score,
+            'timestamp': datetime.now().isoformat(),
+            'bingo': True
+        }
+        if self.player:
+            game_data['player'] = self.player
+        return game_data
+
+    def get_score(self):
+        return self.score
+
+
+class ScoreTracker(BaseScoreTracker):
+    def __init__(self, use_redis=True, client_factory=None, writer=None, player=None, rules=None):
+        super().__init__(player, rules)
+        self.use_redis = use_redis
         
         # Get Redis configuration from environment variables
-        redis_host = os.getenv('REDIS_HOST', 'redis')
-        redis_port = int(os.getenv('REDIS_PORT', 6379))
+        self.redis_host = os.getenv('REDIS_HOST', 'redis')
+        self.redis_port = int(os.getenv('REDIS_PORT', 6379))
         
-        # Attempt to connect to Redis
+        # Called as client_factory(host, port); defaults to the shared pool
+        self.client_factory = client_factory or get_client
+        
+        # Connected lazily, on the first call that needs Redis
+        self.redis_client = None
+        self._connecting = None
+        # Results go through a write-behind ResultWriter; shared unless given
+        self.writer = writer
+        # High score and leaderboard reads are served from here when fresh
+        self.cache = get_cache(self.redis_host, self.redis_port)
+
+    def _connect(self, done):
+        """Get a client and ping it; runs on a background thread."""
+        health = get_health(self.redis_host, self.redis_port)
         try:
-            self.redis_client = redis.Redis(
-                host=redis_host,
-                port=redis_port,
-                decode_responses=True,
-                socket_connect_timeout=5
-            )
+            client = self.client_factory(self.redis_host, self.redis_port)
             # Test connection
-            self.redis_client.ping()
+            client.ping()
         except (redis.ConnectionError, redis.TimeoutError, Exception) as e:
             # Gracefully handle Redis unavailability
-            self.redis_client = None
-            if os.getenv('DEBUG', 'false').lower() == 'true':
-                print(f"Redis connection failed: {e}. Running without persistence.")
+            health.record_failure()
+            _debug(f"Redis connection failed: {e}. Running without persistence.")
+        else:
+            self.redis_client = client
+            health.record_success()
+        finally:
+            done.set()
+
+    def _get_client(self, wait):
+        """
+        Return a connected client, or None if Redis isn't available.
+
+        If another tracker has already reached this server, its client
+        is reused without a new ping. Otherwise the first call starts
+        connecting in the background and waits up to `wait` seconds for
+        it. While another tracker's attempt is in flight, and once the
+        breaker has seen a failure, calls return at once and reconnects
+        happen in the background.
+        """
+        if self.redis_client is not None or not self.use_redis:
+            return self.redis_client
+        health = get_health(self.redis_host, self.redis_port)
+        if health.healthy:
+            self.redis_client = self.client_factory(self.redis_host, self.redis_port)
+            return self.redis_client
+        if self._connecting is None or self._connecting.is_set():
+            attempt = health.start_attempt()
+            if attempt is None:
+                # Breaker open, or another tracker is connecting right now
+                return None
+            self._connecting = attempt
+            threading.Thread(target=self._connect, args=(attempt,), daemon=True).start()
+        if not health.failures:
+            self._connecting.wait(wait)
+        return self.redis_client
+
+    def _drop_client(self, error):
+        """Forget a client whose connection broke and open the breaker."""
+        self.redis_client = None
+        get_health(self.redis_host, self.redis_port).record_failure()
+        _debug(f"Lost Redis connection: {error}")
 
     def update_score(self, marked):
         """Update the player's score based on new lines or bingo."""
-        from src.game.check import count_lines, is_bingo
-
-        current_lines = count_lines(marked)
-        new_lines = current_lines - self.lines_done
+        rows, cols = len(marked), len(marked[0]) if marked else 0
+        if self._award_mask(mask_from_marked(marked), rows, cols):
+            self._save_game_result()
 
-        if new_lines > 0:
-            self.score += new_lines * LINE_POINTS
-            self.lines_done = current_lines
+    def record_card(self, card):
+        """Update the score from every pattern the card's marks now cover."""
+        if self._award_mask(card.mask, card.rows, card.cols):
+            self._save_game_result()
 
-        if is_bingo(marked) and not self.has_bingo:
-            self.score += BINGO_POINTS
-            self.has_bingo = True
+    def record_lines(self, completed, total_rows):
+        """Update the score from the lines returned by BingoCard.mark_number."""
+        if self._award_lines(completed, total_rows):
             self._save_game_result()
 
     def _save_game_result(self):
-        """Save completed game to Redis."""
-        if self.redis_client:
-            try:
-                game_data = {
-                    'score': self.score,
-                    'timestamp': datetime.now().isoformat(),
-                    'bingo': True
-                }
-                self.redis_client.lpush('game_history', json.dumps(game_data))
-                
-                # Update high score if needed
-                current_high = self.redis_client.get('high_score')
-                if not current_high or int(current_high) < self.score:
-                    self.redis_client.set('high_score', self.score)
-            except (redis.ConnectionError, redis.TimeoutError, Exception) as e:
-                # Silently fail if Redis is unavailable
-                if os.getenv('DEBUG', 'false').lower() == 'true':
-                    print(f"Failed to save game result: {e}")
+        """Queue the completed game for the background writer."""
+        if not self.use_redis:
+            return
+        if self.writer is None:
+            self.writer = get_writer(self.redis_host, self.redis_port, self.client_factory)
+        self.writer.submit(self._game_result())
 
-    def get_score(self):
-        return self.score
+    def _cached_read(self, key, read, fallback):
+        """
+        Serve key from the read cache, or call read(client) and cache it.
+
+        Failed reads return fallback and are not cached.
+        """
+        value = self.cache.get(key)
+        if value is not MISSING:
+            return value
+        client = self._get_client(READ_WAIT)
+        if client:
+            try:
+                value = read(client)
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                self._drop_client(e)
+                return fallback
+            except (ValueError, Exception):
+                return fallback
+            self.cache.set(key, value)
+            return value
+        return fallback
 
     def get_high_score(self):
         """Get high score from Redis."""
-        if self.redis_client:
+        def read(client):
+            high_score = client.get(HIGH_SCORE_KEY)
+            return int(high_score) if high_score else 0
+        return self._cached_read(HIGH_SCORE_KEY, read, 0)
+
+    def get_top_players(self, k=10, period='all'):
+        """Best k (player, score) pairs on the `period` leaderboard."""
+        key = ('top', leaderboard_key(period), k)
+        return self._cached_read(key, lambda client: top_players(client, k, period), [])
+
+    def get_rank(self, period='all'):
+        """This player's 1-based rank on the `period` leaderboard, or None."""
+        if not self.player:
+            return None
+        key = ('rank', leaderboard_key(period), self.player)
+        return self._cached_read(key, lambda client: player_rank(client, self.player, period), None)
+
+    def get_history(self, cursor=0, count=HISTORY_PAGE_SIZE):
+        """
+        Read one page of game history, newest first.
+
+        cursor is the offset to start from (0 for the newest game).
+        Returns (entries, next_cursor); next_cursor is None on the last
+        page. Offsets shift as new games are saved, so a page may repeat
+        an entry from the previous one.
+        """
+        client = self._get_client(READ_WAIT)
+        if client:
             try:
-                high_score = self.redis_client.get('high_score')
-                return int(high_score) if high_score else 0
-            except (redis.ConnectionError, redis.TimeoutError, ValueError, Exception):
-                return 0
-        return 0
+                raw = client.lrange(HISTORY_KEY, cursor, cursor + count - 1)
+                entries = [json.loads(item) for item in raw]
+                next_cursor = cursor + count if len(entries) == count else None
+                return entries, next_cursor
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                self._drop_client(e)
+                return [], None
+            except (ValueError, Exception):
+                return [], None
+        return [], None
@@ -0,0 +1,180 @@
+# src/game/store.py
+import os
+import struct
+
+import numpy as np
+
+from src.game.batch import draw_ranks
+from src.game.card import card_from_grid
+
+MAGIC = b'BINGOCRD'
+VERSION = 1
+# magic, version, rows, cols, min number, max number, card count, padding
+HEADER = struct.Struct('<8sHHHHHQ6x')
+HEADER_SIZE = HEADER.size   # 32 bytes
+CHUNK_SIZE = 1_000_000      # cards scanned per step
+
+
+class CardFileWriter:
+    """
+    Streams cards into a card file, so a series can be written in
+    chunks without holding it all in memory. The card count in the
+    header is filled in on close().
+    """
+
+    def __init__(self, path, rows=3, cols=5, min_number=1, max_number=75):
+        if not 0 <= min_number <= max_number <= 255:
+            raise ValueError(f"Card files store uint8 numbers, got range {min_number}-{max_number}")
+        self.path = path
+        self.rows = rows
+        self.cols = cols
+        self.min_number = min_number
+        self.max_number = max_number
+        self.count = 0
+        self._file = open(path, 'wb')
+        self._file.write(self._header())
+
+    def _header(self):
+        return HEADER.pack(MAGIC, VERSION, self.rows, self.cols,
+                           self.min_number, self.max_number, self.count)
+
+    def write(self, cards):
+        """Append an (n, rows, cols) array of cards."""
+        cards = np.asarray(cards)
+        if cards.ndim != 3 or cards.shape[1:] != (self.rows, self.cols):
+            raise ValueError(f"Expected (n, {self.rows}, {self.cols}) cards, got shape {cards.shape}")
+        if len(cards) and (cards.min() < self.min_number or cards.max() > self.max_number):
+            raise ValueError(f"Card numbers outside {self.min_number}-{self.max_number}")
+        self._file.write(np.ascontiguousarray(cards, dtype=np.uint8).tobytes())
+        self.count += len(cards)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(self._header())
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_cards(path, cards, min_number=1, max_number=75):
+    """Write an (n, rows, cols) array of cards to a new card file."""
+    cards = np.asarray(cards)
+    with CardFileWriter(path, cards.shape[1], cards.shape[2], min_number, max_number) as writer:
+        writer.write(cards)
+
+
+class CardStore:
+    """
+    Read-only card file, memory-mapped.
+
+    The file is a 32-byte header (magic, version, rows, cols, number
+    range, card count) followed by one rows * cols uint8 record per
+    card. Cards are read through numpy.memmap, so a series larger than
+    RAM is scanned a chunk at a time and only the pages touched are
+    loaded. BingoCard objects are built only when asked for with card().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            raw = f.read(HEADER_SIZE)
+        if len(raw) < HEADER_SIZE:
+            raise ValueError(f"{path} is too short to be a card file")
+        magic, version, rows, cols, min_number, max_number, count = HEADER.unpack(raw)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a card file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported card file version {version}")
+        expected = HEADER_SIZE + count * rows * cols
+        if os.path.getsize(path) != expected:
+            raise ValueError(f"{path} should be {expected} bytes for {count} cards")
+        self.rows = rows
+        self.cols = cols
+        self.min_number = min_number
+        self.max_number = max_number
+        self.count = count
+        if count:
+            self.cards = np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER_SIZE,
+                                   shape=(count, rows, cols))
+        else:
+            self.cards = np.empty((0, rows, cols), dtype=np.uint8)
+
+    def __len__(self):
+        return self.count
+
+    def chunks(self, chunk_size=CHUNK_SIZE):
+        """Yield (start, cards) views over the file, chunk_size cards at a time."""
+        for start in range(0, self.count, chunk_size):
+            yield start, self.cards[start:start + chunk_size]
+
+    def card(self, index, drawn=()):
+        """Build card `index` as a BingoCard, marked with any drawn numbers."""
+        card = card_from_grid(self.cards[index])
+        for number in drawn:
+            card.mark_number(number)
+        return card
+
+    def invalid_cards(self, chunk_size=CHUNK_SIZE):
+        """Indices of cards with a number out of range or used twice."""
+        bad = []
+        for start, chunk in self.chunks(chunk_size):
+            flat = np.sort(chunk.reshape(len(chunk), -1), axis=1)
+            wrong = (flat[:, 0] < self.min_number) | (flat[:, -1] > self.max_number)
+            wrong |= (flat[:, 1:] == flat[:, :-1]).any(axis=1)
+            bad.append(np.flatnonzero(wrong) + start)
+        return np.concatenate(bad) if bad else np.array([], dtype=np.intp)
+
+    def _ranks(self, sequence):
+        # Covers every uint8 value, so even a corrupt record can be looked up
+        return draw_ranks(sequence, max(255, max(sequence, default=0)))
+
+    def winning_draws(self, sequence, chunk_size=CHUNK_SIZE):
+        """
+        Draw index of each card's first line and bingo, as in
+        CardBatch.winning_draws, computed chunk by chunk.
+        """
+        ranks = self._ranks(sequence)
+        first_line = np.empty(self.count, dtype=np.int32)
+        bingo = np.empty(self.count, dtype=np.int32)
+        for start, chunk in self.chunks(chunk_size):
+            row_done = ranks[chunk].max(axis=2)
+            first_line[start:start + len(chunk)] = row_done.min(axis=1)
+            bingo[start:start + len(chunk)] = row_done.max(axis=1)
+        return first_line, bingo
+
+    def first_winners(self, sequence, chunk_size=CHUNK_SIZE):
+        """
+        Resolve a session's draw against the whole series.
+
+        Returns (draw_index, card_ids) for the earliest bingo, or
+        (None, empty array) if no card completes.
+        """
+        ranks = self._ranks(sequence)
+        best = len(sequence)
+        ids = []
+        for start, chunk in self.chunks(chunk_size):
+            bingo = ranks[chunk].max(axis=(1, 2))
+            low = int(bingo.min()) if len(bingo) else best
+            if low < best:
+                best, ids = low, []
+            if low == best and best < len(sequence):
+                ids.append(np.flatnonzero(bingo == best) + start)
+        if best >= len(sequence):
+            return None, np.array([], dtype=np.intp)
+        return best, np.concatenate(ids)
+
+    def close(self):
+        """Drop the memory map; it is unmapped once no views of it are left."""
+        self.cards = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
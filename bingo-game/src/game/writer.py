@@ -0,0 +1,190 @@
+# src/game/writer.py
+import json
+import os
+import threading
+
+import redis
+
+BATCH_SIZE = 100        # results per pipeline
+FLUSH_INTERVAL = 1.0    # seconds between background flushes
+
+
+def _debug(message):
+    if os.getenv('DEBUG', 'false').lower() == 'true':
+        print(message)
+
+
+class ResultWriter:
+    """
+    Write-behind buffer for finished game results.
+
+    submit() only queues the result. A background thread writes queued
+    results in one pipeline whenever BATCH_SIZE are waiting or every
+    FLUSH_INTERVAL seconds. If Redis can't be reached, the batch is
+    appended to spill_path as JSON lines and replayed ahead of new
+    results once a write succeeds again. Spill lines that can't be read
+    back, e.g. one cut short by a crash, are moved to spill_path + '.bad'.
+
+    client_factory() returns a Redis client, health is the RedisHealth
+    breaker for that server, and write_batch(pipe, results) queues the
+    commands for a list of results on a pipeline. on_written(), if
+    given, is called after each successful pipeline.
+    """
+
+    def __init__(self, client_factory, health, write_batch, spill_path,
+                 batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL, on_written=None):
+        self.client_factory = client_factory
+        self.health = health
+        self.write_batch = write_batch
+        self.spill_path = spill_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_written = on_written
+        self.written = 0
+        self.spilled = 0
+        self.skipped = 0
+        self._pending = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def submit(self, result):
+        """Queue a result dict; never blocks on Redis."""
+        with self._lock:
+            self._pending.append(result)
+            full = len(self._pending) >= self.batch_size
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def pending(self):
+        """Number of results waiting in memory."""
+        with self._lock:
+            return len(self._pending)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # The thread must outlive any one flush, or submit() queues forever
+                _debug(f"Result writer flush failed: {e}")
+
+    def flush(self):
+        """Write everything queued so far, spilling it if Redis is down."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch and not self._has_spill():
+                return
+            try:
+                batch = self._send(batch)
+                self._spill(batch)
+            except Exception as e:
+                _debug(f"Failed to save game results: {e}")
+                self._keep(batch)
+
+    def _send(self, batch):
+        """Replay the spill and write batch; returns the results left unwritten."""
+        client = self._connect()
+        if client is None or not self._replay_spill(client):
+            return batch
+        for start in range(0, len(batch), self.batch_size):
+            if not self._write(client, batch[start:start + self.batch_size]):
+                return batch[start:]
+        return []
+
+    def _keep(self, batch):
+        """Spill a batch after an unexpected error, or queue it again if even that fails."""
+        try:
+            self._spill(batch)
+        except OSError as e:
+            _debug(f"Failed to spill game results: {e}")
+            with self._lock:
+                self._pending[:0] = batch
+
+    def _has_spill(self):
+        return os.path.exists(self.spill_path) or os.path.exists(self.spill_path + '.replay')
+
+    def _connect(self):
+        """Return a client if the breaker allows talking to Redis now."""
+        if not self.health.healthy and not self.health.try_acquire():
+            return None
+        try:
+            return self.client_factory()
+        except Exception:
+            self.health.record_failure()
+            return None
+
+    def _write(self, client, results):
+        """Send one pipeline of results; False if Redis is unreachable."""
+        if not results:
+            return True
+        try:
+            pipe = client.pipeline(transaction=False)
+            self.write_batch(pipe, results)
+            pipe.execute()
+        except (redis.ConnectionError, redis.TimeoutError):
+            self.health.record_failure()
+            return False
+        except Exception as e:
+            # Not a connectivity problem; replaying wouldn't help
+            _debug(f"Failed to save game results: {e}")
+            return True
+        self.health.record_success()
+        self.written += len(results)
+        if self.on_written:
+            self.on_written()
+        return True
+
+    def _spill(self, results):
+        """Append results to the local spill file."""
+        if not results:
+            return
+        with open(self.spill_path, 'a', encoding='utf-8') as f:
+            for result in results:
+                f.write(json.dumps(result) + '\n')
+        self.spilled += len(results)
+
+    def _replay_spill(self, client):
+        """Write spilled results back to Redis; False if that failed."""
+        replay_path = self.spill_path + '.replay'
+        if not os.path.exists(replay_path):
+            if not os.path.exists(self.spill_path):
+                return True
+            # Move the file aside so new spills don't mix with the replay
+            os.replace(self.spill_path, replay_path)
+        results = self._read_spill(replay_path)
+        for start in range(0, len(results), self.batch_size):
+            if not self._write(client, results[start:start + self.batch_size]):
+                # Keep what is left for the next attempt
+                with open(replay_path, 'w', encoding='utf-8') as f:
+                    for result in results[start:]:
+                        f.write(json.dumps(result) + '\n')
+                return False
+        os.remove(replay_path)
+        return True
+
+    def _read_spill(self, path):
+        """Results in a spill file; lines that don't parse are moved aside."""
+        results = []
+        bad = []
+        with open(path, encoding='utf-8', errors='replace') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    results.append(json.loads(line))
+                except ValueError:
+                    bad.append(line.rstrip('\n'))
+        if bad:
+            with open(self.spill_path + '.bad', 'a', encoding='utf-8') as f:
+                for line in bad:
+                    f.write(line + '\n')
+            self.skipped += len(bad)
+        return results
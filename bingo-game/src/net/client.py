@@ -0,0 +1,70 @@
+# src/net/client.py
+import asyncio
+import json
+
+from src.game.card import BingoCard
+from src.game.score import ScoreTracker
+
+
+class BotClient:
+    """
+    Stand-in player for local testing.
+
+    Joins a room, keeps its own copy of the dealt cards, marks every
+    ball and claims bingo as soon as one of its cards has every row.
+    """
+
+    def __init__(self, name, room='lobby', cards=1):
+        self.name = name
+        self.room = room
+        self.n_cards = cards
+        self.cards = []
+        self.trackers = []
+        self.claimed = set()
+        self.messages = []
+
+    async def play(self, host='127.0.0.1', port=8765):
+        """Play until the game ends; returns the final game_over message."""
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            await self._send(writer, {'type': 'join', 'room': self.room, 'name': self.name, 'cards': self.n_cards})
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return None
+                message = json.loads(line)
+                self.messages.append(message)
+                kind = message['type']
+                if kind == 'joined':
+                    self.cards = [BingoCard(numbers=sum(card, [])) for card in message['cards']]
+                    self.trackers = [ScoreTracker(use_redis=False) for _ in self.cards]
+                    for number in message['drawn']:
+                        self._mark(number)
+                    await self._claim_bingos(writer)
+                elif kind == 'ball':
+                    self._mark(message['number'])
+                    await self._claim_bingos(writer)
+                elif kind == 'state':
+                    # Fell behind; the server skipped balls, catch up on all of them
+                    for number in message['drawn']:
+                        self._mark(number)
+                    await self._claim_bingos(writer)
+                elif kind in ('game_over', 'error'):
+                    return message
+        finally:
+            writer.close()
+
+    def _mark(self, number):
+        for card, tracker in zip(self.cards, self.trackers):
+            card.mark_number(number)
+            tracker.record_card(card)
+
+    async def _claim_bingos(self, writer):
+        for index, tracker in enumerate(self.trackers):
+            if tracker.has_bingo and index not in self.claimed:
+                self.claimed.add(index)
+                await self._send(writer, {'type': 'claim', 'card': index})
+
+    async def _send(self, writer, message):
+        writer.write((json.dumps(message) + "\n").encode())
+        await writer.drain()
@@ -0,0 +1,104 @@
+# src/net/fanout.py
+import asyncio
+from collections import deque
+
+QUEUE_SIZE = 64     # ball messages a client may fall behind by
+
+
+class Outbox:
+    """
+    Bounded outbound queue for one client connection.
+
+    send() never blocks the room: it queues the message and a writer
+    task drains the queue to the socket at the client's own pace. Once
+    QUEUE_SIZE balls are waiting, the queued balls are dropped and
+    replaced by one "state" message built by snapshot() when it is
+    finally written, so a slow client catches up in a single message
+    however many balls it missed. Other messages are rare and always
+    queued.
+    """
+
+    def __init__(self, writer, snapshot=None, maxsize=QUEUE_SIZE):
+        self.writer = writer
+        # snapshot() returns the client's full state message
+        self.snapshot = snapshot
+        self.maxsize = maxsize
+        self.max_depth = 0
+        self.dropped = 0
+        self.syncs = 0
+        self.sent = 0
+        self._queue = deque()
+        self._balls = 0
+        self._syncing = False
+        self._ready = asyncio.Event()
+
+    @property
+    def depth(self):
+        """Messages waiting to be written."""
+        return len(self._queue)
+
+    def __call__(self, message):
+        self.send(message)
+
+    def send(self, message):
+        """Queue a message for the client without waiting for the socket."""
+        if message['type'] == 'ball' and self.snapshot is not None:
+            if self._syncing:
+                # The queued state message will include this ball
+                self.dropped += 1
+                return
+            if self._balls >= self.maxsize:
+                self._coalesce()
+                self.dropped += 1
+                return
+            self._balls += 1
+        self._queue.append(message)
+        self.max_depth = max(self.max_depth, len(self._queue))
+        self._ready.set()
+
+    def _coalesce(self):
+        """Swap every queued ball for a single state message."""
+        kept = deque(m for m in self._queue if m['type'] != 'ball')
+        self.dropped += len(self._queue) - len(kept)
+        kept.append({'type': 'state'})
+        self._queue = kept
+        self._balls = 0
+        self._syncing = True
+        self.syncs += 1
+
+    def _next(self):
+        message = self._queue.popleft()
+        if message['type'] == 'ball':
+            self._balls -= 1
+        elif message['type'] == 'state':
+            # Built now, so it covers every ball dropped while queued
+            self._syncing = False
+            message = self.snapshot()
+        return message
+
+    async def run(self, encode):
+        """Write queued messages until game_over has gone out or the socket fails."""
+        while True:
+            if not self._queue:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            message = self._next()
+            self.writer.write(encode(message))
+            self.sent += 1
+            await self.writer.drain()
+            if message['type'] == 'game_over':
+                return
+
+
+def fanout_stats(outboxes):
+    """Aggregate queue depth and drop counts over a group of clients."""
+    outboxes = list(outboxes)
+    return {
+        'clients': len(outboxes),
+        'queued': sum(o.depth for o in outboxes),
+        'max_depth': max((o.max_depth for o in outboxes), default=0),
+        'sent': sum(o.sent for o in outboxes),
+        'dropped': sum(o.dropped for o in outboxes),
+        'syncs': sum(o.syncs for o in outboxes)
+    }
@@ -0,0 +1,158 @@
+# src/net/room.py
+import asyncio
+import random
+
+from src.game.async_score import AsyncScoreTracker
+from src.game.card import BingoCard
+from src.game.draw import NumberDrawer
+
+MAX_CARDS = 4
+
+
+class Player:
+    """A connected player, their server-side cards and one score tracker per card."""
+
+    def __init__(self, name, cards, send, use_redis=True, rules=None):
+        self.name = name
+        self.cards = cards
+        # send(message) delivers one dict to the client without blocking
+        self.send = send
+        self.trackers = [AsyncScoreTracker(use_redis=use_redis, player=name, rules=rules) for _ in cards]
+
+    def mark(self, number):
+        """
+        Mark number on every card and score any patterns it completes.
+
+        Returns the trackers that just reached bingo; their results
+        still need saving.
+        """
+        finished = []
+        for card, tracker in zip(self.cards, self.trackers):
+            before = card.mask
+            card.mark_number(number)
+            if card.mask != before and tracker.score_card(card):
+                finished.append(tracker)
+        return finished
+
+
+class Room:
+    """
+    One game: a NumberDrawer whose balls go to every player in the room.
+
+    Cards are marked and scored on the server, so a bingo claim is only
+    accepted if the claimed card really has a bingo pattern of `rules`
+    (by default every row) marked.
+    """
+
+    def __init__(self, name, draw_interval=1.0, seed=None, use_redis=True, rules=None):
+        self.name = name
+        self.draw_interval = draw_interval
+        self.use_redis = use_redis
+        self.rules = rules
+        # Seeds both the draw and the cards dealt, so a room can be replayed
+        self.rng = random.Random(seed)
+        self.drawer = NumberDrawer(rng=self.rng)
+        self.players = {}
+        self.winner = None
+        self.finished = False
+        # Result saves in flight; kept so they aren't garbage collected
+        self._saves = set()
+
+    async def add_player(self, name, n_cards, send):
+        """Deal `n_cards` cards to a new player, marked with the balls already drawn."""
+        if self.finished:
+            raise ValueError(f"Room {self.name} has finished")
+        if name in self.players:
+            raise ValueError(f"Name {name} is already taken in room {self.name}")
+        if not 1 <= n_cards <= MAX_CARDS:
+            raise ValueError(f"Expected 1 to {MAX_CARDS} cards, got {n_cards}")
+        cards = [BingoCard(rng=self.rng) for _ in range(n_cards)]
+        player = Player(name, cards, send, self.use_redis, self.rules)
+        for number in self.drawer.get_drawn_numbers():
+            self._save(player.mark(number))
+        self.players[name] = player
+        return player
+
+    def remove_player(self, name):
+        """Drop a player; the game ends when the last one leaves."""
+        self.players.pop(name, None)
+        if not self.players:
+            self.finish()
+
+    def state(self, player):
+        """Everything a client needs to resync: all balls so far and each card's marks."""
+        drawn = self.drawer.get_drawn_numbers()
+        return {
+            'type': 'state',
+            'drawn': list(drawn),
+            'count': len(drawn),
+            'masks': [card.mask for card in player.cards]
+        }
+
+    def broadcast(self, message):
+        for player in list(self.players.values()):
+            player.send(message)
+
+    def _save(self, trackers):
+        """Save finished games in the background, so Redis never holds up a draw."""
+        for tracker in trackers:
+            task = asyncio.create_task(tracker.save_game_result())
+            self._saves.add(task)
+            task.add_done_callback(self._saves.discard)
+
+    async def draw(self):
+        """Draw one ball, broadcast it and mark it for everyone."""
+        number = self.drawer.draw_number()
+        if number is None:
+            self.finish()
+            return None
+        self.broadcast({
+            'type': 'ball',
+            'number': number,
+            'count': len(self.drawer.get_drawn_numbers())
+        })
+        # Marking doesn't await, so no claim can be read before it is done
+        for player in list(self.players.values()):
+            self._save(player.mark(number))
+        return number
+
+    async def claim(self, name, card_index):
+        """Verify a bingo claim; the first valid one wins the room."""
+        player = self.players.get(name)
+        valid = (
+            not self.finished
+            and player is not None
+            and 0 <= card_index < len(player.cards)
+            and player.trackers[card_index].has_bingo
+        )
+        if player is not None:
+            player.send({'type': 'claim', 'card': card_index, 'ok': valid})
+        if valid:
+            self.winner = (name, card_index)
+            self.broadcast({
+                'type': 'winner',
+                'name': name,
+                'card': card_index,
+                'score': player.trackers[card_index].get_score(),
+                'balls': len(self.drawer.get_drawn_numbers())
+            })
+            self.finish()
+        return valid
+
+    def finish(self):
+        if not self.finished:
+            self.finished = True
+            self.broadcast({'type': 'game_over', 'winner': self.winner and self.winner[0]})
+
+    async def run(self):
+        """Draw a ball every draw_interval seconds until someone wins or the balls run out."""
+        while not self.finished:
+            await asyncio.sleep(self.draw_interval)
+            if not self.finished:
+                await self.draw()
+        await self.wait_saved()
+
+    async def wait_saved(self):
+        """Wait for the results still being saved."""
+        if self._saves:
+            await asyncio.gather(*self._saves)
@@ -0,0 +1,143 @@
+# src/net/server.py
+import asyncio
+import json
+import random
+
+from src.net.fanout import Outbox, QUEUE_SIZE, fanout_stats
+from src.net.room import Room
+
+DEFAULT_PORT = 8765
+
+
+def encode(message):
+    """One protocol line: a JSON object followed by a newline."""
+    return (json.dumps(message) + "\n").encode()
+
+
+class GameServer:
+    """
+    Asyncio TCP server hosting many rooms on one event loop.
+
+    The protocol is JSON lines. A client sends
+    {"type": "join", "room": ..., "name": ..., "cards": n} and then
+    {"type": "claim", "card": i} when it thinks it has bingo. The server
+    replies with "joined" (the dealt cards and balls so far) and then
+    pushes "ball", "claim", "winner" and "game_over" messages. A client
+    that falls too far behind gets one "state" message (every ball so
+    far and its card marks) in place of the balls it missed.
+    """
+
+    def __init__(self, draw_interval=1.0, use_redis=True, seed=None, queue_size=QUEUE_SIZE):
+        self.draw_interval = draw_interval
+        self.use_redis = use_redis
+        self.queue_size = queue_size
+        # Hands each new room its own seed
+        self.rng = random.Random(seed)
+        self.rooms = {}
+        self.outboxes = set()
+        # Counters from connections that have closed
+        self._closed = fanout_stats([])
+        self._tasks = set()
+
+    def get_room(self, name):
+        """Return the open room called name, starting a new game if needed."""
+        room = self.rooms.get(name)
+        if room is None or room.finished:
+            room = Room(name, self.draw_interval, self.rng.getrandbits(64), self.use_redis)
+            self.rooms[name] = room
+            task = asyncio.create_task(self._run_room(room))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return room
+
+    async def _run_room(self, room):
+        try:
+            await room.run()
+        finally:
+            if self.rooms.get(room.name) is room:
+                del self.rooms[room.name]
+
+    def stats(self):
+        """
+        Outbound queue metrics: clients and queued are for live
+        connections, the other counters cover every connection so far.
+        """
+        stats = fanout_stats(self.outboxes)
+        for key in ('sent', 'dropped', 'syncs'):
+            stats[key] += self._closed[key]
+        stats['max_depth'] = max(stats['max_depth'], self._closed['max_depth'])
+        return stats
+
+    def _retire(self, send):
+        self.outboxes.discard(send)
+        closed = fanout_stats([send])
+        for key in ('sent', 'dropped', 'syncs'):
+            self._closed[key] += closed[key]
+        self._closed['max_depth'] = max(self._closed['max_depth'], closed['max_depth'])
+
+    async def _write(self, send, writer):
+        try:
+            await send.run(encode)
+        except ConnectionError:
+            pass
+        finally:
+            # Nothing follows game_over; hang up once it is flushed
+            writer.close()
+
+    async def handle(self, reader, writer):
+        """Serve one client connection."""
+        send = Outbox(writer, maxsize=self.queue_size)
+        self.outboxes.add(send)
+        sender = asyncio.create_task(self._write(send, writer))
+        room = player = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    kind = message['type']
+                except (ValueError, KeyError, TypeError):
+                    send({'type': 'error', 'message': 'Malformed message'})
+                    continue
+
+                if kind == 'join' and player is None:
+                    try:
+                        room = self.get_room(str(message.get('room', 'lobby')))
+                        player = await room.add_player(str(message['name']), int(message.get('cards', 1)), send)
+                    except (KeyError, ValueError, TypeError) as e:
+                        # Don't leave a room this join just opened drawing for nobody
+                        if room is not None and not room.players:
+                            room.finish()
+                        room = None
+                        send({'type': 'error', 'message': str(e)})
+                        continue
+                    send.snapshot = lambda: room.state(player)
+                    send({
+                        'type': 'joined',
+                        'room': room.name,
+                        'cards': [card.card for card in player.cards],
+                        'drawn': list(room.drawer.get_drawn_numbers())
+                    })
+                elif kind == 'claim' and player is not None:
+                    try:
+                        card_index = int(message.get('card', 0))
+                    except (ValueError, TypeError):
+                        send({'type': 'error', 'message': f"Invalid card: {message.get('card')!r}"})
+                        continue
+                    await room.claim(player.name, card_index)
+                else:
+                    send({'type': 'error', 'message': f'Unexpected message: {kind}'})
+        except ConnectionError:
+            pass
+        finally:
+            if room is not None and player is not None:
+                room.remove_player(player.name)
+            self._retire(send)
+            sender.cancel()
+            writer.close()
+
+    async def start(self, host='0.0.0.0', port=DEFAULT_PORT):
+        """Start listening; returns the asyncio.Server."""
+        return await asyncio.start_server(self.handle, host, port)
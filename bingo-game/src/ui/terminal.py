@@ -1,4 +1,13 @@
 # src/ui/terminal.py
+import shutil
+import sys
+
+ESC = "\x1b["
+CLEAR_SCREEN = ESC + "2J" + ESC + "H"
+CLEAR_LINE = ESC + "2K"
+REVERSE = ESC + "7m"
+RESET = ESC + "0m"
+
 
 def ask_card_numbers(rows=3, cols=5, min_n=1, max_n=75):
     """
@@ -51,3 +60,163 @@ def ask_card_numbers(rows=3, cols=5, min_n=1, max_n=75):
     print(f"\n✓ Card created successfully with {total_numbers} numbers!")
     return numbers
 
+
+
+def ask_player_name(default="Player"):
+    """
+    Prompt for the name shown on the leaderboard.
+    
+    Args:
+        default: Name used when the player just presses Enter
+    
+    Returns:
+        str: The player's name, at most 20 characters
+    """
+    name = input(f"Enter your name for the leaderboard [{default}]: ").strip()
+    return name[:20] or default
+
+
+def format_leaderboard(top, player=None, rank=None):
+    """
+    Format leaderboard rows for display.
+    
+    Args:
+        top: List of (player, score) pairs, best first
+        player: Name to highlight, if present
+        rank: The player's rank, shown when outside the listed rows
+    
+    Returns:
+        str: Multi-line leaderboard text
+    """
+    lines = ["🏆 Leaderboard"]
+    for position, (name, points) in enumerate(top, 1):
+        marker = " ◀" if name == player else ""
+        lines.append(f"  {position:>2}. {name:<20} {points:>5}{marker}")
+    if player and rank and rank > len(top):
+        lines.append(f"  Your rank: {rank}")
+    return "\n".join(lines)
+
+
+def goto(row, col):
+    """ANSI sequence moving the cursor to a 1-based row and column."""
+    return f"{ESC}{row};{col}H"
+
+
+class CardGrid:
+    """
+    Draws many cards side by side and redraws only the cells that change.
+
+    draw() writes the whole layout once and remembers, for every card,
+    the mask on screen plus the escape sequence that marks or unmarks
+    each cell. update() diffs each card's mask against that and writes
+    only the cells that changed, so a ball costs a few bytes per card it
+    hits rather than reformatting every card.
+
+    compact=True shows a marked cell in reverse video instead of a ✔,
+    which fits several times as many cards on one screen.
+    """
+
+    GAP = 2   # spaces between cards
+
+    def __init__(self, cards, out=None, width=None, compact=False, titles=None):
+        self.cards = list(cards)
+        self.out = out or sys.stdout
+        self.width = width or shutil.get_terminal_size().columns
+        self.compact = compact
+        self.titles = titles or [f"Card {k + 1}" for k in range(len(self.cards))]
+        first = self.cards[0]
+        self.rows, self.cols = first.rows, first.cols
+        digits = len(str(max(n for card in self.cards for row in card.card for n in row)))
+        self.cell_width = digits + 1 if compact else digits + 4
+        self.digits = digits
+        card_width = max(self.cell_width * self.cols, len(max(self.titles, key=len)))
+        self.card_width = card_width
+        self.per_row = max(1, (self.width + self.GAP) // (card_width + self.GAP))
+        # Title line, the card rows, then a blank line
+        self.block_height = self.rows + 2
+        grid_rows = -(-len(self.cards) // self.per_row)
+        self.height = grid_rows * self.block_height
+        # Mask currently on screen for each card
+        self._shown = [0] * len(self.cards)
+        self._drawn = False
+        self._patches = [self._cell_patches(k) for k in range(len(self.cards))]
+
+    def origin(self, k):
+        """Screen (row, col) of card k's title line."""
+        block_row, block_col = divmod(k, self.per_row)
+        return 1 + block_row * self.block_height, 1 + block_col * (self.card_width + self.GAP)
+
+    def _cell_text(self, value, marked):
+        if self.compact:
+            text = f"{value:>{self.digits}}"
+            return (REVERSE + text + RESET if marked else text) + " "
+        return f"{value:>{self.digits + 1}}{'✔' if marked else ' '}  "
+
+    def _cell_patches(self, k):
+        """(unmark, mark) escape strings for every cell bit of card k."""
+        card = self.cards[k]
+        top, left = self.origin(k)
+        patches = []
+        for i in range(card.rows):
+            for j in range(card.cols):
+                value = card.card[i][j]
+                at = goto(top + 1 + i, left + j * self.cell_width)
+                patches.append((at + self._cell_text(value, False), at + self._cell_text(value, True)))
+        return patches
+
+    def render(self):
+        """The full screen for the current marks, starting with a clear."""
+        parts = [CLEAR_SCREEN]
+        for k, card in enumerate(self.cards):
+            top, left = self.origin(k)
+            parts.append(goto(top, left) + self.titles[k])
+            mask = card.mask
+            for i in range(card.rows):
+                parts.append(goto(top + 1 + i, left))
+                for j in range(card.cols):
+                    bit = i * card.cols + j
+                    parts.append(self._cell_text(card.card[i][j], mask >> bit & 1))
+            self._shown[k] = mask
+        return "".join(parts)
+
+    def draw(self):
+        """Write every card from scratch."""
+        self.out.write(self.render() + goto(self.height + 1, 1))
+        self.out.flush()
+        self._drawn = True
+
+    def patch(self):
+        """Escape sequences for cells whose mark changed since the last draw or patch."""
+        parts = []
+        for k, card in enumerate(self.cards):
+            mask = card.mask
+            changed = mask ^ self._shown[k]
+            if not changed:
+                continue
+            patches = self._patches[k]
+            while changed:
+                low = changed & -changed
+                bit = low.bit_length() - 1
+                parts.append(patches[bit][1 if mask & low else 0])
+                changed ^= low
+            self._shown[k] = mask
+        return "".join(parts)
+
+    def update(self):
+        """Redraw only the changed cells (everything the first time); True if anything was written."""
+        if not self._drawn:
+            self.draw()
+            return True
+        patch = self.patch()
+        if patch:
+            self.out.write(patch + goto(self.height + 1, 1))
+            self.out.flush()
+        return bool(patch)
+
+    def status(self, *lines):
+        """Overwrite the lines under the grid and leave the cursor after them."""
+        row = self.height + 1
+        parts = [goto(row + n, 1) + CLEAR_LINE + line for n, line in enumerate(lines)]
+        parts.append(goto(row + len(lines), 1) + CLEAR_LINE)
+        self.out.write("".join(parts))
+        self.out.flush()
@@ -0,0 +1,142 @@
+"""
+Tests for AsyncScoreTracker.
+An AsyncMock client stands in for redis.asyncio.
+"""
+import asyncio
+
+import pytest
+import redis
+from unittest.mock import AsyncMock, MagicMock
+from src.game import score as score_module
+from src.game.async_score import AsyncScoreTracker, get_async_client
+from src.game.card import BingoCard
+from src.game.score import ScoreTracker, LINE_POINTS, BINGO_POINTS
+
+
+@pytest.fixture(autouse=True)
+def reset_redis_health():
+    """Each test starts with no shared state."""
+    score_module.reset_connections()
+    yield
+    score_module.reset_connections()
+
+
+@pytest.fixture
+def async_client():
+    """Mock redis.asyncio client; scripts and commands are awaitable."""
+    client = MagicMock()
+    client.get = AsyncMock(return_value=None)
+    client.zrevrange = AsyncMock(return_value=[])
+    client.zrevrank = AsyncMock(return_value=None)
+    client.register_script.return_value = AsyncMock(return_value=1)
+    return client
+
+
+class TestAsyncScoring:
+    """Test that scoring matches ScoreTracker."""
+    
+    def test_same_scores_as_sync_tracker(self, async_client, one_line_marked, all_lines_marked):
+        """Test the same updates give the same score and flags."""
+        sync_tracker = ScoreTracker(use_redis=False)
+        async_tracker = AsyncScoreTracker(client=async_client)
+        for marked in (one_line_marked, all_lines_marked, all_lines_marked):
+            sync_tracker.update_score(marked)
+            asyncio.run(async_tracker.update_score(marked))
+        assert async_tracker.get_score() == sync_tracker.get_score() == LINE_POINTS * 3 + BINGO_POINTS
+        assert async_tracker.lines_done == sync_tracker.lines_done
+        assert async_tracker.has_bingo is True
+    
+    def test_record_lines(self, async_client):
+        """Test scoring from mark_number results."""
+        tracker = AsyncScoreTracker(client=async_client)
+        asyncio.run(tracker.record_lines([("row", 0), ("col", 1)], 3))
+        assert tracker.score == LINE_POINTS
+    
+    def test_empty_grid(self, async_client):
+        """Test that an empty grid is bingo, as in ScoreTracker."""
+        tracker = AsyncScoreTracker(client=async_client)
+        asyncio.run(tracker.update_score([]))
+        assert tracker.has_bingo is True
+    
+    def test_score_card_leaves_saving_to_caller(self, async_client, sample_card_numbers):
+        """Test that score_card reports bingo without saving."""
+        tracker = AsyncScoreTracker(client=async_client)
+        card = BingoCard(numbers=sample_card_numbers)
+        for n in sample_card_numbers:
+            card.mark_number(n)
+        assert tracker.score_card(card) is True
+        async_client.register_script.return_value.assert_not_awaited()
+        asyncio.run(tracker.save_game_result())
+        async_client.register_script.return_value.assert_awaited_once()
+
+
+class TestAsyncPersistence:
+    """Test awaited saves and reads."""
+    
+    def test_bingo_saves_once_with_script(self, async_client, all_lines_marked):
+        """Test that bingo awaits one script call with the player's boards."""
+        tracker = AsyncScoreTracker(client=async_client, player='ana')
+        
+        async def play():
+            await tracker.update_score(all_lines_marked)
+            await tracker.update_score(all_lines_marked)
+        asyncio.run(play())
+        
+        async_client.register_script.assert_called_once_with(score_module.SAVE_RESULT_SCRIPT)
+        save_result = async_client.register_script.return_value
+        save_result.assert_awaited_once()
+        assert save_result.call_args.kwargs['keys'][2] == 'leaderboard:all'
+    
+    def test_save_failure_opens_breaker(self, async_client, all_lines_marked):
+        """Test that a connection error doesn't escape and marks Redis down."""
+        async_client.register_script.return_value.side_effect = redis.ConnectionError("down")
+        tracker = AsyncScoreTracker(client=async_client)
+        asyncio.run(tracker.update_score(all_lines_marked))
+        assert tracker.has_bingo is True
+        assert tracker.health.failures == 1
+    
+    def test_get_high_score(self, async_client):
+        """Test reading and caching the high score."""
+        async_client.get.return_value = "90"
+        tracker = AsyncScoreTracker(client=async_client)
+        
+        async def read_twice():
+            return await tracker.get_high_score(), await tracker.get_high_score()
+        assert asyncio.run(read_twice()) == (90, 90)
+        async_client.get.assert_awaited_once()
+    
+    def test_leaderboard_reads(self, async_client):
+        """Test top-K and rank reads."""
+        async_client.zrevrange.return_value = [('ana', 80.0)]
+        async_client.zrevrank.return_value = 0
+        tracker = AsyncScoreTracker(client=async_client, player='ana')
+        
+        assert asyncio.run(tracker.get_top_players(3)) == [('ana', 80)]
+        assert asyncio.run(tracker.get_rank()) == 1
+    
+    def test_no_redis(self, all_lines_marked):
+        """Test that use_redis=False never builds a client."""
+        tracker = AsyncScoreTracker(use_redis=False)
+        asyncio.run(tracker.update_score(all_lines_marked))
+        assert asyncio.run(tracker.get_high_score()) == 0
+        assert tracker.redis_client is None
+    
+    def test_breaker_open_skips_redis(self, async_client):
+        """Test that reads fall back at once while the breaker is open."""
+        tracker = AsyncScoreTracker(client=async_client)
+        tracker.health.record_failure()
+        assert asyncio.run(tracker.get_high_score()) == 0
+        async_client.get.assert_not_awaited()
+
+
+class TestSharedAsyncClient:
+    """Test the per-loop shared client."""
+    
+    def test_one_client_per_loop(self):
+        """Test that a loop reuses its client and a new loop gets its own."""
+        async def grab():
+            return get_async_client('localhost', 6379), get_async_client('localhost', 6379)
+        first, again = asyncio.run(grab())
+        other, _ = asyncio.run(grab())
+        assert first is again
+        assert other is not first
@@ -0,0 +1,160 @@
+"""
+Tests for the vectorized CardBatch engine.
+Results are compared against check.py and BingoCard on the same marks.
+"""
+import random
+
+import numpy as np
+import pytest
+from src.game.batch import CardBatch
+from src.game.card import BingoCard
+from src.game.check import count_lines, is_bingo
+
+
+@pytest.fixture
+def random_cards():
+    """A few dozen random cards with a fixed seed."""
+    rng = random.Random(1234)
+    return [BingoCard(numbers=rng.sample(range(1, 76), 15)) for _ in range(40)]
+
+
+class TestCardBatchInitialization:
+    """Test building batches."""
+    
+    def test_init_shape(self, sample_card_numbers):
+        """Test that numbers are stored as (N, rows, cols)."""
+        batch = CardBatch([np.reshape(sample_card_numbers, (3, 5))] * 4)
+        assert len(batch) == 4
+        assert batch.cards.shape == (4, 3, 5)
+        assert batch.marked.shape == (4, 3, 5)
+        assert not batch.marked.any()
+    
+    def test_init_rejects_flat_input(self, sample_card_numbers):
+        """Test that a 2D array is rejected."""
+        with pytest.raises(ValueError, match="Expected a"):
+            CardBatch([sample_card_numbers])
+    
+    def test_from_cards_keeps_marks(self, sample_card_numbers):
+        """Test that existing BingoCard marks are copied."""
+        card = BingoCard(numbers=sample_card_numbers)
+        card.mark_number(12)
+        batch = CardBatch.from_cards([card])
+        assert batch.marked[0, 1, 2]
+        assert batch.marked.sum() == 1
+
+
+class TestCardBatchMatchesScalar:
+    """Test that batch results agree with the per-card code."""
+    
+    def test_draw_sequence_matches(self, random_cards):
+        """Test line counts and bingo flags after every ball."""
+        batch = CardBatch.from_cards(random_cards)
+        order = random.Random(99).sample(range(1, 76), 75)
+        for n in order:
+            batch.mark_number(n)
+            for card in random_cards:
+                card.mark_number(n)
+            assert batch.count_lines().tolist() == [count_lines(c.marked) for c in random_cards]
+            assert batch.is_bingo().tolist() == [is_bingo(c.marked) for c in random_cards]
+            assert batch.has_bingo().tolist() == [c.has_bingo() for c in random_cards]
+    
+    def test_masks_and_patterns(self, random_cards):
+        """Test bitmasks and pattern checks against BingoCard."""
+        batch = CardBatch.from_cards(random_cards)
+        for n in random.Random(5).sample(range(1, 76), 45):
+            batch.mark_number(n)
+            for card in random_cards:
+                card.mark_number(n)
+        assert batch.masks().tolist() == [card.mask for card in random_cards]
+        for name in ('row', 'column', 'four_corners', 'x', 'blackout'):
+            assert batch.has_pattern(name).tolist() == [c.has_bingo([name]) for c in random_cards]
+        assert batch.pattern_counts('row').tolist() == batch.count_lines().tolist()
+    
+    def test_winners(self, sample_card_numbers):
+        """Test that winners lists the cards with every row marked."""
+        batch = CardBatch([np.reshape(sample_card_numbers, (3, 5)),
+                           np.reshape(list(range(31, 46)), (3, 5))])
+        for n in sample_card_numbers:
+            batch.mark_number(n)
+        assert batch.winners().tolist() == [0]
+    
+    def test_card_round_trip(self, random_cards):
+        """Test that card() rebuilds a BingoCard with the same marks."""
+        batch = CardBatch.from_cards(random_cards)
+        for n in range(1, 30):
+            batch.mark_number(n)
+        card = batch.card(3)
+        assert card.card == random_cards[3].card
+        assert card.marked == batch.marked[3].tolist()
+    
+    def test_card_other_size(self):
+        """Test that only 3x5 cards can become a BingoCard."""
+        batch = CardBatch(np.arange(1, 26).reshape(1, 5, 5))
+        with pytest.raises(ValueError, match="3x5"):
+            batch.card(0)
+
+
+class TestWinningDraws:
+    """Test resolving games from a known draw sequence."""
+    
+    def test_winning_draws_match_marking(self, random_cards):
+        """Test that precomputed indices match ball-by-ball marking."""
+        order = random.Random(7).sample(range(1, 76), 75)
+        first_line, bingo = CardBatch.from_cards(random_cards).winning_draws(order)
+        for k, card in enumerate(random_cards):
+            line_at = bingo_at = None
+            for index, n in enumerate(order):
+                card.mark_number(n)
+                lines = count_lines(card.marked)
+                if line_at is None and lines:
+                    line_at = index
+                if lines == 3:
+                    bingo_at = index
+                    break
+            assert first_line[k] == line_at
+            assert bingo[k] == bingo_at
+    
+    def test_winning_draws_short_sequence(self, sample_card_numbers):
+        """Test that cards not completed by the sequence get len(sequence)."""
+        batch = CardBatch([np.reshape(sample_card_numbers, (3, 5))])
+        first_line, bingo = batch.winning_draws([1, 2, 3, 4, 5, 10])
+        assert first_line[0] == 4
+        assert bingo[0] == 6
+    
+    def test_first_winners(self, sample_card_numbers):
+        """Test that the earliest bingo and its cards are returned."""
+        batch = CardBatch([np.reshape(sample_card_numbers, (3, 5)),
+                           np.reshape(list(range(31, 46)), (3, 5))])
+        draw_index, winners = batch.first_winners(sample_card_numbers + list(range(31, 46)))
+        assert draw_index == 14
+        assert winners.tolist() == [0]
+    
+    def test_first_winners_none(self, sample_card_numbers):
+        """Test that an unfinished game has no winner."""
+        batch = CardBatch([np.reshape(sample_card_numbers, (3, 5))])
+        draw_index, winners = batch.first_winners([1, 2, 3])
+        assert draw_index is None
+        assert len(winners) == 0
+    
+    def test_empty_sequence(self, sample_card_numbers):
+        """Test that no balls means never, not an error."""
+        batch = CardBatch([np.reshape(sample_card_numbers, (3, 5))])
+        first_line, bingo = batch.winning_draws([])
+        assert first_line.tolist() == bingo.tolist() == [0]
+        draw_index, winners = batch.first_winners([])
+        assert draw_index is None
+        assert len(winners) == 0
+
+
+class TestMarkNumbers:
+    """Test marking several balls at once."""
+    
+    def test_mark_numbers_matches_single_marks(self, random_cards):
+        """Test that one batch mark equals marking ball by ball."""
+        numbers = list(range(1, 40, 3))
+        batched = CardBatch.from_cards(random_cards)
+        single = CardBatch.from_cards(random_cards)
+        batched.mark_numbers(numbers)
+        for n in numbers:
+            single.mark_number(n)
+        assert (batched.marked == single.marked).all()
@@ -0,0 +1,54 @@
+"""
+Tests for the TTL read cache.
+"""
+import pytest
+from unittest.mock import Mock
+from src.game.cache import TTLCache, MISSING
+
+
+@pytest.fixture
+def clock():
+    return Mock(return_value=100.0)
+
+
+class TestTTLCache:
+    """Test expiry and invalidation."""
+    
+    def test_get_missing(self, clock):
+        """Test that unknown keys return MISSING or the default."""
+        cache = TTLCache(5, clock)
+        assert cache.get('x') is MISSING
+        assert cache.get('x', 0) == 0
+    
+    def test_set_and_get(self, clock):
+        """Test that a fresh entry is returned."""
+        cache = TTLCache(5, clock)
+        cache.set('x', 1)
+        clock.return_value = 104.9
+        assert cache.get('x') == 1
+    
+    def test_entry_expires(self, clock):
+        """Test that entries vanish after ttl seconds."""
+        cache = TTLCache(5, clock)
+        cache.set('x', 1)
+        clock.return_value = 105.0
+        assert cache.get('x') is MISSING
+    
+    def test_falsy_values_are_cached(self, clock):
+        """Test that 0 and empty lists count as hits."""
+        cache = TTLCache(5, clock)
+        cache.set('score', 0)
+        cache.set('top', [])
+        assert cache.get('score') == 0
+        assert cache.get('top') == []
+    
+    def test_invalidate_one_and_all(self, clock):
+        """Test dropping a single key and the whole cache."""
+        cache = TTLCache(5, clock)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.invalidate('a')
+        assert cache.get('a') is MISSING
+        assert cache.get('b') == 2
+        cache.invalidate()
+        assert cache.get('b') is MISSING
@@ -1,8 +1,10 @@
 """
 Comprehensive tests for BingoCard class.
 """
+import random
+
 import pytest
-from src.game.card import BingoCard
+from src.game.card import BingoCard, card_from_grid
 
 
 class TestBingoCardInitialization:
@@ -35,6 +37,12 @@ class TestBingoCardInitialization:
         assert len(card.marked[0]) == 5
         assert all(not cell for row in card.marked for cell in row)
     
+    def test_init_with_seeded_rng(self):
+        """Test that equally seeded RNGs generate the same card."""
+        first = BingoCard(rng=random.Random(9))
+        second = BingoCard(rng=random.Random(9))
+        assert first.card == second.card
+    
     def test_build_from_numbers_valid_input(self, sample_card_numbers):
         """Test building card from valid number list."""
         card = BingoCard(numbers=sample_card_numbers)
@@ -47,6 +55,11 @@ class TestBingoCardInitialization:
         with pytest.raises(ValueError, match="Expected 15 numbers"):
             BingoCard(numbers=[1, 2, 3])  # Too few numbers
     
+    def test_build_from_numbers_duplicates(self):
+        """Test that repeated numbers raise ValueError."""
+        with pytest.raises(ValueError, match="different"):
+            BingoCard(numbers=[1] * 15)
+    
     def test_build_from_numbers_exact_length(self):
         """Test building with exactly 15 numbers."""
         numbers = list(range(1, 16))
@@ -134,6 +147,18 @@ class TestHasBingo:
         card.mark_number(3)
         card.mark_number(10)
         assert card.has_bingo() is False
+    
+    def test_bingo_other_patterns(self, sample_card_numbers):
+        """Test has_bingo with a chosen set of patterns."""
+        card = BingoCard(numbers=sample_card_numbers)
+        for n in (1, 5, 20, 24):
+            card.mark_number(n)
+        assert card.has_bingo() is False
+        assert card.has_bingo(['four_corners']) is True
+        assert card.has_bingo(['x']) is False
+        card.mark_number(12)
+        assert card.has_bingo(['x']) is True
+        assert card.has_bingo(['blackout']) is False
 
 
 class TestCardDisplay:
@@ -162,3 +187,78 @@ class TestCardDisplay:
         card_str = str(card)
         lines = card_str.strip().split('\n')
         assert len(lines) == 3  # Should have 3 rows
+
+
+class TestBitmask:
+    """Test the bitmask-backed marked state."""
+    
+    def test_cell_bits_index(self, sample_card_numbers):
+        """Test that every number maps to its own cell bit."""
+        card = BingoCard(numbers=sample_card_numbers)
+        assert card.cell_bits[1] == 1 << 0
+        assert card.cell_bits[5] == 1 << 4
+        assert card.cell_bits[10] == 1 << 5
+        assert card.cell_bits[24] == 1 << 14
+    
+    def test_mark_sets_mask_bit(self, sample_card_numbers):
+        """Test that marking ORs the cell bit into the mask."""
+        card = BingoCard(numbers=sample_card_numbers)
+        card.mark_number(12)
+        assert card.mask == 1 << 7
+        assert card.marked[1][2] is True
+    
+    def test_mark_number_not_on_card_leaves_mask(self, sample_card_numbers):
+        """Test that unknown numbers leave the mask untouched."""
+        card = BingoCard(numbers=sample_card_numbers)
+        card.mark_number(99)
+        assert card.mask == 0
+
+
+class TestCompletedLines:
+    """Test the lines reported by mark_number."""
+    
+    def test_mark_returns_empty_without_completion(self, sample_card_numbers):
+        """Test that a mark that completes nothing returns no lines."""
+        card = BingoCard(numbers=sample_card_numbers)
+        assert card.mark_number(1) == []
+        assert card.mark_number(99) == []
+    
+    def test_mark_returns_completed_row(self, sample_card_numbers):
+        """Test that the last cell of a row reports the row."""
+        card = BingoCard(numbers=sample_card_numbers)
+        for n in [1, 2, 3, 4]:
+            card.mark_number(n)
+        assert card.mark_number(5) == [("row", 0)]
+    
+    def test_mark_returns_row_and_column(self, sample_card_numbers):
+        """Test that one mark can complete a row and a column together."""
+        card = BingoCard(numbers=sample_card_numbers)
+        for n in [2, 3, 4, 5, 10, 20]:
+            card.mark_number(n)
+        assert card.mark_number(1) == [("row", 0), ("col", 0)]
+        assert card.completed_lines == [("row", 0), ("col", 0)]
+    
+    def test_remark_does_not_recount(self, sample_card_numbers):
+        """Test that marking a number twice doesn't bump the counters."""
+        card = BingoCard(numbers=sample_card_numbers)
+        card.mark_number(1)
+        card.mark_number(1)
+        assert card.row_hits[0] == 1
+        assert card.col_hits[0] == 1
+
+
+class TestCardFromGrid:
+    """Test building a BingoCard from an array row."""
+    
+    def test_marks_from_mask(self, sample_card_numbers):
+        """Test that the mask bits are marked."""
+        grid = [sample_card_numbers[i * 5:(i + 1) * 5] for i in range(3)]
+        card = card_from_grid(grid, mask=0b11111)
+        assert card.card == grid
+        assert card.mask == 0b11111
+        assert card.completed_lines == [("row", 0)]
+    
+    def test_wrong_size(self):
+        """Test that a grid of another size is rejected clearly."""
+        with pytest.raises(ValueError, match="3x5, this card is 5x5"):
+            card_from_grid([[1, 2, 3, 4, 5]] * 5)
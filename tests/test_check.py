@@ -2,7 +2,7 @@
 Comprehensive tests for check module functions.
 """
 import pytest
-from src.game.check import count_lines, is_bingo, count_diagonals
+from src.game.check import count_lines, is_bingo, count_diagonals, completed_patterns
 
 
 class TestCountLines:
@@ -123,3 +123,18 @@ class TestCountDiagonals:
         marked[1][1] = True
         # Last position not marked
         assert count_diagonals(marked) == 0
+
+
+class TestCompletedPatterns:
+    """Test completed_patterns function."""
+    
+    def test_completed_patterns(self, one_line_marked):
+        """Test counting several patterns on one grid."""
+        assert completed_patterns(one_line_marked, ['row', 'column', 'blackout']) == {
+            'row': 1, 'column': 0, 'blackout': 0
+        }
+    
+    def test_completed_patterns_all_marked(self, all_lines_marked):
+        """Test that a full card completes every pattern."""
+        counts = completed_patterns(all_lines_marked, ['row', 'column', 'four_corners', 'x', 'blackout'])
+        assert counts == {'row': 3, 'column': 5, 'four_corners': 1, 'x': 1, 'blackout': 1}
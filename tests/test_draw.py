@@ -1,6 +1,8 @@
 """
 Comprehensive tests for NumberDrawer class.
 """
+import random
+
 import pytest
 from src.game.draw import NumberDrawer
 
@@ -169,4 +171,155 @@ class TestReset:
         drawer.reset()
         number = drawer.draw_number()
         assert number is not None
-        assert 1 <= number <= 5
\ No newline at end of file
+        assert 1 <= number <= 5
+
+class TestDrawOrder:
+    """Test draw_order method."""
+    
+    def test_draw_order_predicts_draws(self):
+        """Test that draw_order lists the balls in the order they come out."""
+        drawer = NumberDrawer(min_number=1, max_number=10)
+        drawer.draw_number()
+        order = drawer.draw_order()
+        assert len(order) == 10
+        assert order[0] == drawer.drawn_numbers[0]
+        assert [drawer.draw_number() for _ in range(9)] == order[1:]
+
+
+class TestSeeding:
+    """Test reproducible draws, snapshots and replay."""
+    
+    def test_same_seed_same_order(self):
+        """Test that a seed fixes the draw order."""
+        assert NumberDrawer(seed=7).remaining == NumberDrawer(seed=7).remaining
+        assert NumberDrawer(seed=7).remaining != NumberDrawer(seed=8).remaining
+    
+    def test_injected_rng_is_reproducible(self):
+        """Test that drawers built from equally seeded RNGs match."""
+        first = NumberDrawer(rng=random.Random(3))
+        second = NumberDrawer(rng=random.Random(3))
+        assert first.seed == second.seed
+        assert first.remaining == second.remaining
+    
+    def test_snapshot_is_seed_and_position(self):
+        """Test that a snapshot only records seed and position."""
+        drawer = NumberDrawer(seed=11)
+        drawer.draw_number()
+        drawer.draw_number()
+        assert drawer.snapshot() == (11, 2)
+    
+    def test_restore_replays_game(self):
+        """Test that restoring a snapshot reproduces drawn and upcoming balls."""
+        drawer = NumberDrawer(seed=5)
+        for _ in range(10):
+            drawer.draw_number()
+        state = drawer.snapshot()
+        drawn = drawer.get_drawn_numbers()[:]
+        upcoming = [drawer.draw_number() for _ in range(5)]
+        
+        replay = NumberDrawer()
+        replay.restore(state)
+        assert replay.get_drawn_numbers() == drawn
+        assert len(replay.remaining) == 65
+        assert [replay.draw_number() for _ in range(5)] == upcoming
+    
+    def test_reset_with_seed(self):
+        """Test that reset can start a specific game."""
+        drawer = NumberDrawer()
+        drawer.draw_number()
+        drawer.reset(seed=7)
+        assert drawer.remaining == NumberDrawer(seed=7).remaining
+        assert drawer.drawn_numbers == []
+
+
+class TestBatchDraws:
+    """Test draw_many and the iterator interfaces."""
+    
+    def test_draw_many_matches_single_draws(self):
+        """Test that draw_many returns the same balls as repeated draw_number."""
+        single = NumberDrawer(seed=4)
+        batched = NumberDrawer(seed=4)
+        expected = [single.draw_number() for _ in range(10)]
+        assert batched.draw_many(10) == expected
+        assert batched.get_drawn_numbers() == expected
+        assert batched.remaining == single.remaining
+    
+    def test_draw_many_past_end(self):
+        """Test that draw_many stops when the drawer is empty."""
+        drawer = NumberDrawer(min_number=1, max_number=5)
+        assert len(drawer.draw_many(10)) == 5
+        assert drawer.draw_many(3) == []
+        assert drawer.draw_number() is None
+    
+    def test_draw_many_zero(self):
+        """Test that non-positive counts draw nothing."""
+        drawer = NumberDrawer(min_number=1, max_number=5)
+        assert drawer.draw_many(0) == []
+        assert drawer.draw_many(-2) == []
+        assert len(drawer.remaining) == 5
+    
+    def test_iterate_drawer(self):
+        """Test that iterating draws every remaining ball in order."""
+        drawer = NumberDrawer(seed=2)
+        order = drawer.draw_order()
+        assert list(drawer) == order
+        assert drawer.get_drawn_numbers() == order
+    
+    def test_iter_batches(self):
+        """Test that batches cover the whole draw order."""
+        drawer = NumberDrawer(min_number=1, max_number=10, seed=2)
+        order = drawer.draw_order()
+        batches = list(drawer.iter_batches(4))
+        assert [len(b) for b in batches] == [4, 4, 2]
+        assert sum(batches, []) == order
+
+
+class TestIsDrawn:
+    """Test the drawn-number membership index."""
+    
+    def test_is_drawn_tracks_draws(self):
+        """Test that is_drawn follows draw_number and draw_many."""
+        drawer = NumberDrawer(seed=1)
+        first = drawer.draw_number()
+        batch = drawer.draw_many(5)
+        assert drawer.is_drawn(first)
+        assert all(drawer.is_drawn(n) for n in batch)
+        assert not any(drawer.is_drawn(n) for n in drawer.remaining)
+    
+    def test_is_drawn_out_of_range(self):
+        """Test that numbers outside the range are never drawn."""
+        drawer = NumberDrawer(min_number=1, max_number=5)
+        drawer.draw_many(5)
+        assert drawer.is_drawn(0) is False
+        assert drawer.is_drawn(6) is False
+    
+    def test_drawn_mask_matches_drawn_numbers(self):
+        """Test that the mask is indexed by n - min_number."""
+        drawer = NumberDrawer(min_number=10, max_number=20, seed=3)
+        drawn = drawer.draw_many(4)
+        mask = drawer.drawn_mask
+        assert len(mask) == 11
+        assert sorted(n + 10 for n in mask.nonzero()[0]) == sorted(drawn)
+    
+    def test_drawn_mask_is_read_only(self):
+        """Test that callers can't edit the mask."""
+        drawer = NumberDrawer()
+        with pytest.raises(ValueError):
+            drawer.drawn_mask[0] = True
+    
+    def test_reset_clears_mask_in_place(self):
+        """Test that reset clears the same mask instead of reallocating."""
+        drawer = NumberDrawer(seed=1)
+        mask = drawer.drawn_mask
+        drawer.draw_many(10)
+        drawer.reset()
+        assert drawer.drawn_mask is mask
+        assert not mask.any()
+    
+    def test_restore_rebuilds_mask(self):
+        """Test that restore marks exactly the replayed balls."""
+        drawer = NumberDrawer(seed=8)
+        drawer.draw_many(12)
+        replay = NumberDrawer()
+        replay.restore(drawer.snapshot())
+        assert (replay.drawn_mask == drawer.drawn_mask).all()
@@ -0,0 +1,137 @@
+"""
+Tests for per-client outbound queues.
+A fake writer records what reaches the socket and can stall on drain().
+"""
+import asyncio
+import json
+
+from src.net.fanout import Outbox, fanout_stats
+from src.net.server import encode
+
+
+class FakeWriter:
+    """Socket writer whose drain() waits until the test opens the gate."""
+
+    def __init__(self, stalled=False):
+        self.lines = []
+        self.gate = asyncio.Event()
+        if not stalled:
+            self.gate.set()
+
+    def write(self, data):
+        self.lines.append(json.loads(data))
+
+    async def drain(self):
+        await self.gate.wait()
+
+
+def ball(number):
+    return {'type': 'ball', 'number': number, 'count': number}
+
+
+def snapshot_of(drawn):
+    return lambda: {'type': 'state', 'drawn': list(drawn)}
+
+
+class TestOutbox:
+    """Test queueing, coalescing and metrics for one client."""
+    
+    def test_fast_client_gets_every_ball(self):
+        """Test that a client keeping up receives balls in order."""
+        async def play():
+            writer = FakeWriter()
+            outbox = Outbox(writer, snapshot_of([]), maxsize=4)
+            task = asyncio.create_task(outbox.run(encode))
+            for n in range(1, 11):
+                outbox.send(ball(n))
+                await asyncio.sleep(0)
+            outbox.send({'type': 'game_over', 'winner': None})
+            await task
+            return writer, outbox
+        writer, outbox = asyncio.run(play())
+        assert [m.get('number') for m in writer.lines[:-1]] == list(range(1, 11))
+        assert writer.lines[-1]['type'] == 'game_over'
+        assert outbox.dropped == 0
+        assert outbox.syncs == 0
+        assert outbox.sent == 11
+    
+    def test_send_never_blocks(self):
+        """Test that send() returns while the socket is stalled."""
+        async def play():
+            outbox = Outbox(FakeWriter(stalled=True), snapshot_of([]), maxsize=4)
+            task = asyncio.create_task(outbox.run(encode))
+            for n in range(1, 76):
+                outbox.send(ball(n))
+            depth = outbox.depth
+            task.cancel()
+            return depth
+        assert asyncio.run(play()) <= 5
+    
+    def test_slow_client_gets_one_state_message(self):
+        """Test that balls beyond the limit are replaced by a fresh state snapshot."""
+        async def play():
+            writer = FakeWriter(stalled=True)
+            drawn = []
+            outbox = Outbox(writer, lambda: {'type': 'state', 'drawn': list(drawn)}, maxsize=4)
+            task = asyncio.create_task(outbox.run(encode))
+            await asyncio.sleep(0)
+            for n in range(1, 21):
+                drawn.append(n)
+                outbox.send(ball(n))
+            outbox.send({'type': 'winner', 'name': 'ana'})
+            outbox.send({'type': 'game_over', 'winner': 'ana'})
+            writer.gate.set()
+            await task
+            return writer, outbox
+        writer, outbox = asyncio.run(play())
+        kinds = [m['type'] for m in writer.lines]
+        assert kinds.count('state') == 1
+        assert kinds[-2:] == ['winner', 'game_over']
+        state = writer.lines[kinds.index('state')]
+        assert state['drawn'] == list(range(1, 21))
+        assert outbox.syncs == 1
+        # Every ball either went out on its own or was folded into the state
+        balls_sent = kinds.count('ball')
+        assert balls_sent + outbox.dropped == 20
+    
+    def test_control_messages_never_dropped(self):
+        """Test that non-ball messages are queued even past the limit."""
+        outbox = Outbox(FakeWriter(stalled=True), snapshot_of([]), maxsize=2)
+        for n in range(1, 10):
+            outbox.send(ball(n))
+        outbox.send({'type': 'claim', 'card': 0, 'ok': False})
+        queued = [m['type'] for m in outbox._queue]
+        assert queued == ['state', 'claim']
+        assert outbox.max_depth == 2
+    
+    def test_without_snapshot_nothing_is_dropped(self):
+        """Test that a client that hasn't joined yet gets every message."""
+        outbox = Outbox(FakeWriter(stalled=True), maxsize=2)
+        for n in range(1, 6):
+            outbox.send(ball(n))
+        assert outbox.depth == 5
+        assert outbox.dropped == 0
+
+
+class TestFanoutStats:
+    """Test aggregate metrics."""
+    
+    def test_sums_over_clients(self):
+        """Test that counters add up and max_depth takes the deepest queue."""
+        first = Outbox(FakeWriter(stalled=True), snapshot_of([]), maxsize=2)
+        second = Outbox(FakeWriter(stalled=True), snapshot_of([]), maxsize=2)
+        for n in range(1, 6):
+            first.send(ball(n))
+        second.send(ball(1))
+        stats = fanout_stats([first, second])
+        assert stats['clients'] == 2
+        assert stats['queued'] == first.depth + second.depth
+        assert stats['max_depth'] == 2
+        assert stats['dropped'] == first.dropped
+        assert stats['syncs'] == 1
+    
+    def test_empty(self):
+        """Test stats with no clients."""
+        assert fanout_stats([]) == {
+            'clients': 0, 'queued': 0, 'max_depth': 0, 'sent': 0, 'dropped': 0, 'syncs': 0
+        }
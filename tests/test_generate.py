@@ -0,0 +1,141 @@
+"""
+Tests for bulk card generation.
+"""
+import numpy as np
+import pytest
+from src.game.batch import CardBatch
+from src.game.card import BingoCard
+from src.game.generate import (
+    FingerprintSet, column_ranges, distinct_cards, fingerprints, generate_cards, sample_cards,
+)
+
+
+def assert_valid(cards, min_number=1, max_number=75):
+    """Every card has distinct numbers in range."""
+    flat = cards.reshape(len(cards), -1).astype(np.int64)
+    assert flat.min() >= min_number
+    assert flat.max() <= max_number
+    assert (np.diff(np.sort(flat, axis=1), axis=1) > 0).all()
+
+
+class TestSampleCards:
+    """Test vectorized sampling."""
+    
+    def test_shape_and_range(self):
+        """Test dense (n, rows, cols) output with distinct numbers per card."""
+        cards = sample_cards(5000, np.random.default_rng(1))
+        assert cards.shape == (5000, 3, 5)
+        assert cards.dtype == np.uint8
+        assert_valid(cards)
+    
+    def test_roughly_uniform(self):
+        """Test that every number turns up about equally often in a cell."""
+        cards = sample_cards(75_000, np.random.default_rng(2))
+        counts = np.bincount(cards[:, 0, 0], minlength=76)[1:]
+        assert counts.min() > 800
+        assert counts.max() < 1200
+    
+    def test_bingo_columns(self):
+        """Test that column c only uses the c-th B-I-N-G-O range."""
+        cards = sample_cards(5000, np.random.default_rng(3), bingo_columns=True)
+        assert_valid(cards)
+        for c, (lo, hi) in enumerate(column_ranges()):
+            assert cards[:, :, c].min() == lo
+            assert cards[:, :, c].max() == hi
+    
+    def test_wide_number_range(self):
+        """Test numbers above 255 use a wider dtype."""
+        cards = sample_cards(100, np.random.default_rng(4), min_number=1, max_number=300)
+        assert cards.dtype == np.int16
+        assert_valid(cards, 1, 300)
+
+
+class TestColumnRanges:
+    """Test B-I-N-G-O column ranges."""
+    
+    def test_standard_ranges(self):
+        """Test 1-75 over five columns."""
+        assert column_ranges() == [(1, 15), (16, 30), (31, 45), (46, 60), (61, 75)]
+    
+    def test_uneven_split(self):
+        """Test that ranges must split evenly."""
+        with pytest.raises(ValueError):
+            column_ranges(cols=4, max_number=75)
+    
+    def test_distinct_cards(self):
+        """Test counting the possible cards."""
+        assert distinct_cards(rows=1, cols=2, max_number=4) == 12
+        assert distinct_cards(rows=1, cols=2, max_number=4, bingo_columns=True) == 4
+
+
+class TestFingerprints:
+    """Test fingerprints and the fingerprint set."""
+    
+    def test_equal_cards_equal_fingerprints(self):
+        """Test that fingerprints depend only on the numbers in cell order."""
+        cards = sample_cards(100, np.random.default_rng(5))
+        copies = cards.copy()
+        assert (fingerprints(cards) == fingerprints(copies)).all()
+        swapped = cards.copy()
+        swapped[:, 0, [0, 1]] = swapped[:, 0, [1, 0]]
+        assert (fingerprints(cards) != fingerprints(swapped)).all()
+    
+    def test_add_new_drops_repeats(self):
+        """Test that only unseen fingerprints, first occurrence, are new."""
+        seen = FingerprintSet()
+        fps = np.array([5, 3, 5, 9], dtype=np.uint64)
+        assert seen.add_new(fps).tolist() == [True, True, False, True]
+        assert seen.add_new(np.array([9, 1], dtype=np.uint64)).tolist() == [False, True]
+        assert len(seen) == 4
+        assert 3 in seen
+        assert 4 not in seen
+        assert seen.values.tolist() == sorted(seen.values.tolist())
+
+
+class TestGenerateCards:
+    """Test bulk generation with uniqueness."""
+    
+    def test_unique_cards(self):
+        """Test that generated cards are all different."""
+        cards = generate_cards(20_000, seed=1, chunk_size=3000)
+        assert cards.shape == (20_000, 3, 5)
+        assert_valid(cards)
+        assert len(np.unique(cards.reshape(len(cards), -1), axis=0)) == len(cards)
+    
+    def test_duplicates_resampled(self):
+        """Test a tiny card space where duplicates are certain."""
+        cards = generate_cards(12, seed=2, rows=1, cols=2, max_number=4, chunk_size=5)
+        pairs = {tuple(card.ravel()) for card in cards}
+        assert len(pairs) == 12
+    
+    def test_more_than_possible(self):
+        """Test asking for more cards than exist."""
+        with pytest.raises(ValueError):
+            generate_cards(13, rows=1, cols=2, max_number=4)
+    
+    def test_not_unique_allows_repeats(self):
+        """Test that unique=False skips deduplication."""
+        cards = generate_cards(50, seed=3, rows=1, cols=2, max_number=4, unique=False)
+        assert len(cards) == 50
+    
+    def test_seen_spans_runs(self):
+        """Test that a shared FingerprintSet keeps two print runs apart."""
+        seen = FingerprintSet()
+        first = generate_cards(6, seed=4, rows=1, cols=2, max_number=4, seen=seen)
+        second = generate_cards(6, seed=5, rows=1, cols=2, max_number=4, seen=seen)
+        pairs = {tuple(card.ravel()) for card in np.concatenate([first, second])}
+        assert len(pairs) == 12
+    
+    def test_seed_independent_of_workers(self):
+        """Test that the same seed gives the same cards with or without workers."""
+        serial = generate_cards(4000, seed=6, chunk_size=1000)
+        parallel = generate_cards(4000, seed=6, chunk_size=1000, workers=2)
+        assert (serial == parallel).all()
+    
+    def test_usable_as_batch_and_cards(self):
+        """Test that the array feeds CardBatch and BingoCard."""
+        cards = generate_cards(10, seed=7, bingo_columns=True)
+        batch = CardBatch(cards)
+        assert len(batch) == 10
+        card = BingoCard(numbers=cards[0].ravel().tolist())
+        assert card.card == cards[0].tolist()
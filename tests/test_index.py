@@ -0,0 +1,217 @@
+"""
+Tests for the number -> cards index.
+"""
+import random
+
+import numpy as np
+import pytest
+from src.game.batch import CardBatch
+from src.game.card import BingoCard
+from src.game.generate import generate_cards
+from src.game.index import CardIndex
+
+
+@pytest.fixture
+def hall():
+    """A few hundred random cards."""
+    return generate_cards(500, seed=3)
+
+
+@pytest.fixture
+def draw():
+    return random.Random(9).sample(range(1, 76), 75)
+
+
+class TestIndexLayout:
+    """Test the CSR layout."""
+    
+    def test_hits_point_at_the_number(self, hall):
+        """Test that every hit is a cell holding the number."""
+        index = CardIndex(hall)
+        for number in (1, 40, 75):
+            ids, cells = index.hits(number)
+            assert (hall.reshape(len(hall), -1)[ids, cells] == number).all()
+            assert len(ids) == (hall == number).sum()
+    
+    def test_every_cell_indexed_once(self, hall):
+        """Test that the index holds each cell of each card exactly once."""
+        index = CardIndex(hall)
+        assert index.offsets[-1] == hall.size
+        pairs = set(zip(index.card_ids.tolist(), index.cell_ids.tolist()))
+        assert len(pairs) == hall.size
+    
+    def test_unknown_numbers(self, hall):
+        """Test numbers on no card."""
+        index = CardIndex(hall)
+        assert len(index.hits(0)[0]) == 0
+        assert len(index.hits(500)[0]) == 0
+        assert len(index.mark_number(500).bingo) == 0
+    
+    def test_rejects_bad_shapes(self):
+        """Test that cards must be a 3D array."""
+        with pytest.raises(ValueError):
+            CardIndex(np.arange(15))
+
+
+class TestSparseMarking:
+    """Test marking through the index against CardBatch."""
+    
+    def test_marks_match_batch(self, hall, draw):
+        """Test masks, rows and bingo after part of a draw."""
+        index = CardIndex(hall)
+        batch = CardBatch(hall)
+        for number in draw[:45]:
+            index.mark_number(number)
+            batch.mark_number(number)
+        assert (index.masks == batch.masks()).all()
+        assert (index.completed('row') == batch.count_lines()).all()
+        assert (index.is_bingo() == batch.is_bingo()).all()
+    
+    def test_completed_lines_reported_once(self, hall, draw):
+        """Test that each line is reported by the ball that completes it."""
+        index = CardIndex(hall, patterns=('row',))
+        batch = CardBatch(hall)
+        for number in draw:
+            before = batch.marked.all(axis=2)
+            batch.mark_number(number)
+            new = batch.marked.all(axis=2) & ~before
+            marked = index.mark_number(number)
+            assert sorted(zip(marked.card_ids.tolist(), marked.lines.tolist())) == \
+                sorted(zip(*map(np.ndarray.tolist, np.nonzero(new))))
+    
+    def test_bingo_on_last_cell(self, hall, draw):
+        """Test that a card is reported filled by the winning ball only."""
+        index = CardIndex(hall)
+        first, winners = CardBatch(hall).first_winners(draw)
+        index.mark_numbers(draw[:first])
+        assert len(index.winners()) == 0
+        assert index.mark_number(draw[first]).bingo.tolist() == winners.tolist()
+    
+    def test_repeat_ball_completes_nothing(self, hall, draw):
+        """Test that marking a number twice changes nothing."""
+        index = CardIndex(hall)
+        index.mark_numbers(draw[:60])
+        hits = index.line_hits.copy()
+        marked = index.mark_number(draw[0])
+        assert len(marked.card_ids) == 0
+        assert (index.line_hits == hits).all()
+    
+    def test_lines_match_bingo_card(self, sample_card_numbers):
+        """Test that rows, columns and diagonals match BingoCard.mark_number."""
+        cards = np.array(sample_card_numbers).reshape(1, 3, 5)
+        index = CardIndex(cards)
+        card = BingoCard(numbers=sample_card_numbers)
+        names = {'row': 'row', 'column': 'col', 'diagonal': 'diag'}
+        for number in sample_card_numbers:
+            expected = card.mark_number(number)
+            marked = index.mark_number(number)
+            got = [index.lines[k] for k in marked.lines.tolist()]
+            assert [(names[name], k) for name, k in got] == expected
+
+
+class TestConversions:
+    """Test moving between BingoCard objects and the index."""
+    
+    def test_from_cards_keeps_marks(self):
+        """Test that existing marks are counted."""
+        rng = random.Random(1)
+        cards = [BingoCard(rng=rng) for _ in range(20)]
+        for card in cards:
+            for number in card.card[0]:
+                card.mark_number(number)
+        index = CardIndex.from_cards(cards)
+        assert (index.completed('row') == 1).all()
+        assert index.card(3).mask == cards[3].mask
+    
+    def test_from_cards_matches_marking(self, hall, draw):
+        """Test that a hall built from marked cards matches one marked ball by ball."""
+        cards = [BingoCard(numbers=card.ravel().tolist()) for card in hall]
+        for card in cards:
+            for number in draw[:35]:
+                card.mark_number(number)
+        built = CardIndex.from_cards(cards)
+        marked = CardIndex(hall)
+        marked.mark_numbers(draw[:35])
+        assert (built.masks == marked.masks).all()
+        assert (built.line_hits == marked.line_hits).all()
+        for number in draw[35:45]:
+            assert built.waiting_on(number).tolist() == marked.waiting_on(number).tolist()
+    
+    def test_card_on_demand(self, hall, draw):
+        """Test rebuilding one card with its marks."""
+        index = CardIndex(hall)
+        index.mark_numbers(draw[:30])
+        card = index.card(7)
+        assert card.card == hall[7].tolist()
+        assert card.mask == int(index.masks[7])
+
+
+def brute_near(batch, number):
+    """Cards that complete a row, column or the whole card if number is called next."""
+    after = batch.marked | (batch.cards == number)
+    lines = lambda marked: marked.all(axis=2).sum(axis=1) + marked.all(axis=1).sum(axis=1)
+    bingo = after.all(axis=(1, 2)) & ~batch.marked.all(axis=(1, 2))
+    return np.flatnonzero((lines(after) > lines(batch.marked)) | bingo)
+
+
+class TestNearWins:
+    """Test one- and two-to-go tracking."""
+    
+    def test_waiting_on_matches_rescan(self, hall, draw):
+        """Test "who wins if n is called next" against a full rescan."""
+        index = CardIndex(hall)
+        batch = CardBatch(hall)
+        for number in draw[:40]:
+            index.mark_number(number)
+            batch.mark_number(number)
+        for number in draw[40:50]:
+            assert index.waiting_on(number).tolist() == brute_near(batch, number).tolist()
+    
+    def test_two_away_becomes_one_away(self, sample_card_numbers):
+        """Test a row moving from two to go to one to go."""
+        index = CardIndex(np.array(sample_card_numbers).reshape(1, 3, 5), patterns=('row',))
+        for number in (1, 2, 3):
+            index.mark_number(number)
+        assert index.near_wins(4, away=2).lines.tolist() == [0]
+        assert index.waiting_on(5, away=2).tolist() == [0]
+        assert len(index.waiting_on(4)) == 0
+        index.mark_number(4)
+        assert index.waiting_on(5).tolist() == [0]
+        assert len(index.waiting_on(4, away=2)) == 0
+        assert len(index.waiting_on(5, away=2)) == 0
+        index.mark_number(5)
+        assert len(index.waiting_on(5)) == 0
+    
+    def test_bingo_one_away(self, sample_card_numbers):
+        """Test that a card missing one cell waits on it for bingo."""
+        index = CardIndex(np.array(sample_card_numbers).reshape(1, 3, 5), patterns=('row',))
+        last = sample_card_numbers[-1]
+        index.mark_numbers(sample_card_numbers[:-1])
+        near = index.near_wins(last)
+        assert sorted(near.lines.tolist()) == [-1, 2]
+        assert near.cells.tolist() == [14, 14]
+        assert {n: ids.tolist() for n, ids in index.near().items()} == {last: [0]}
+    
+    def test_missing_counts(self, sample_card_numbers):
+        """Test per-line missing cells of one card."""
+        index = CardIndex(np.array(sample_card_numbers).reshape(1, 3, 5), patterns=('row',))
+        index.mark_numbers(sample_card_numbers[:7])
+        assert index.missing(0).tolist() == [0, 3, 5]
+    
+    def test_from_cards_drops_stale_entries(self):
+        """Test near wins on cards that were already marked."""
+        card = BingoCard(numbers=list(range(1, 16)))
+        for number in (1, 2, 3, 4, 5, 6, 7, 8, 9):
+            card.mark_number(number)
+        index = CardIndex.from_cards([card], patterns=('row',))
+        assert list(index.near()) == [10]
+        assert index.near(away=2) == {}
+        index.mark_number(10)
+        assert index.near() == {}
+    
+    def test_not_tracked(self, hall):
+        """Test turning near-win tracking off."""
+        index = CardIndex(hall, track_near=False)
+        index.mark_number(1)
+        with pytest.raises(ValueError):
+            index.waiting_on(2)
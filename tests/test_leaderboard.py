@@ -0,0 +1,58 @@
+"""
+Tests for the sorted-set leaderboard helpers.
+"""
+from datetime import datetime
+
+import pytest
+from unittest.mock import MagicMock
+from src.game.leaderboard import leaderboard_key, top_players, player_rank, PERIODS, PERIOD_TTL
+
+
+class TestLeaderboardKey:
+    """Test per-period key names."""
+    
+    def test_all_time_key(self):
+        """Test that the all-time board has a fixed key."""
+        assert leaderboard_key('all') == 'leaderboard:all'
+    
+    def test_daily_key(self):
+        """Test that daily boards are keyed by date."""
+        assert leaderboard_key('daily', datetime(2024, 3, 9, 23, 59)) == 'leaderboard:daily:2024-03-09'
+    
+    def test_weekly_key_uses_iso_week(self):
+        """Test that weekly boards are keyed by ISO year and week."""
+        assert leaderboard_key('weekly', datetime(2024, 12, 30)) == 'leaderboard:weekly:2025-W01'
+    
+    def test_unknown_period(self):
+        """Test that unknown periods are rejected."""
+        with pytest.raises(ValueError, match="Unknown leaderboard period"):
+            leaderboard_key('monthly')
+    
+    def test_every_period_has_ttl(self):
+        """Test that each period has an expiry setting."""
+        assert set(PERIOD_TTL) == set(PERIODS)
+        assert PERIOD_TTL['all'] == 0
+
+
+class TestQueries:
+    """Test top-K and rank lookups."""
+    
+    def test_top_players(self):
+        """Test that top_players asks for k rows and converts scores."""
+        client = MagicMock()
+        client.zrevrange.return_value = [('ana', 130.0), ('bo', 80.0)]
+        assert top_players(client, 2) == [('ana', 130), ('bo', 80)]
+        client.zrevrange.assert_called_once_with('leaderboard:all', 0, 1, withscores=True)
+    
+    def test_player_rank_is_one_based(self):
+        """Test that the best player is rank 1."""
+        client = MagicMock()
+        client.zrevrank.return_value = 0
+        assert player_rank(client, 'ana') == 1
+        client.zrevrank.assert_called_once_with('leaderboard:all', 'ana')
+    
+    def test_player_rank_unranked(self):
+        """Test that players without a score have no rank."""
+        client = MagicMock()
+        client.zrevrank.return_value = None
+        assert player_rank(client, 'nobody', 'daily') is None
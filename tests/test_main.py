@@ -0,0 +1,131 @@
+"""
+Tests for unattended (auto-draw) games in main.py.
+All runs use --no-redis, so no Redis is needed.
+"""
+import io
+import json
+
+import pytest
+from main import main, play_auto, play_interactive
+from src.ui.terminal import CLEAR_SCREEN
+from unittest.mock import patch
+
+
+def run(*argv):
+    """Parse argv the way main() does and play into a StringIO."""
+    out = io.StringIO()
+    with patch('main.play_auto', wraps=lambda args: play_auto(args, out)):
+        main(['--no-redis', *argv])
+    return out.getvalue()
+
+
+class TestAutoMode:
+    """Test auto-draw flags and output formats."""
+    
+    def test_jsonl_one_line_per_ball(self):
+        """Test JSON lines output: every ball, a game_over per game, then a summary."""
+        text = run('--fast', '--games', '2', '--seed', '1', '--output', 'jsonl')
+        records = [json.loads(line) for line in text.splitlines()]
+        balls = [r for r in records if 'number' in r]
+        overs = [r for r in records if r.get('event') == 'game_over']
+        assert len(overs) == 2
+        assert records[-1]['event'] == 'summary'
+        assert records[-1]['balls'] == len(balls) == sum(r['balls'] for r in overs)
+        assert all(r['latency_us'] >= 0 for r in balls)
+    
+    def test_seed_reproducible(self):
+        """Test that the same seed plays the same games."""
+        def games():
+            text = run('--fast', '--games', '3', '--cards', '2', '--seed', '9', '--output', 'jsonl')
+            return [json.loads(line) for line in text.splitlines() if 'event' in json.loads(line)][:-1]
+        assert games() == games()
+    
+    def test_summary_only(self):
+        """Test that summary output skips per-ball lines."""
+        text = run('--fast', '--games', '5', '--seed', '2', '--output', 'summary')
+        assert "5 games" in text
+        assert "Ball latency" in text
+        assert "Ball 1:" not in text
+    
+    def test_more_cards_finish_sooner(self):
+        """Test that a game ends as soon as any card reaches bingo."""
+        class Args:
+            interval = 0.0
+            games = 50
+            seed = 4
+            output = 'summary'
+            player = 'bench'
+            no_redis = True
+        one = Args()
+        one.cards = 1
+        many = Args()
+        many.cards = 8
+        summary_one = play_auto(one, io.StringIO())
+        summary_many = play_auto(many, io.StringIO())
+        assert summary_many['balls_to_bingo']['mean'] < summary_one['balls_to_bingo']['mean']
+    
+    def test_interval_sleeps_between_balls(self):
+        """Test that --auto waits the given interval after each ball."""
+        with patch('main.time.sleep') as sleep:
+            run('--auto', '0.5', '--seed', '1', '--output', 'summary')
+        assert sleep.call_count > 0
+        sleep.assert_called_with(0.5)
+    
+    def test_text_output_without_terminal(self):
+        """Test that text output falls back to one line per ball."""
+        text = run('--fast', '--seed', '1')
+        assert "Ball 1:" in text
+        assert "Game 1:" in text
+    
+    def test_rejects_zero_cards(self):
+        """Test argument validation."""
+        with pytest.raises(SystemExit):
+            main(['--fast', '--cards', '0'])
+    
+    def test_no_flags_is_interactive(self):
+        """Test that without --auto/--fast the interactive game runs."""
+        with patch('main.play_interactive') as interactive, patch('main.play_auto') as auto:
+            main([])
+        interactive.assert_called_once()
+        auto.assert_not_called()
+
+
+class TestInteractive:
+    """Test the interactive game on a terminal."""
+    
+    def test_leaderboard_survives_grid(self):
+        """Test that the leaderboard is written after the grid clears the screen."""
+        out = io.StringIO()
+        out.isatty = lambda: True
+        tracker = ScoreTrackerStub()
+        answers = iter(['n', '', ''])
+        def ask(prompt=''):
+            try:
+                return next(answers)
+            except StopIteration:
+                raise KeyboardInterrupt
+        with patch('main.ask_player_name', return_value='ana'), patch('builtins.input', ask), \
+                patch('main.ScoreTracker', return_value=tracker), patch('sys.stdout', out):
+            play_interactive()
+        screen = out.getvalue()
+        after_clear = screen[screen.rindex(CLEAR_SCREEN):]
+        assert after_clear.count("Leaderboard") == 3
+        assert "Your card:" not in screen
+
+
+class ScoreTrackerStub:
+    """Just enough of ScoreTracker for the interactive loop."""
+    
+    has_bingo = False
+    
+    def get_top_players(self, k):
+        return [('bob', 90), ('ana', 40)]
+    
+    def get_rank(self):
+        return 2
+    
+    def record_card(self, card):
+        pass
+    
+    def get_score(self):
+        return 0
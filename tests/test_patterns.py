@@ -0,0 +1,148 @@
+"""
+Tests for the winning pattern registry.
+"""
+import pytest
+from src.game.patterns import (
+    Rules, cell_mask, compile_pattern, compile_patterns, complete, mask_from_marked, matches,
+    pattern_names, register_pattern, unregister_pattern,
+)
+
+
+@pytest.fixture
+def custom_pattern():
+    """Register a small custom shape for one test."""
+    register_pattern('top_corners', [(0, 0), (0, 4)])
+    yield 'top_corners'
+    unregister_pattern('top_corners')
+
+
+class TestCompile:
+    """Test compiling built-in shapes to bitmasks."""
+    
+    def test_builtins_registered(self):
+        """Test that every built-in pattern is available."""
+        for name in ('row', 'column', 'diagonal', 'four_corners', 'x', 'blackout'):
+            assert name in pattern_names()
+    
+    def test_rows_and_columns(self):
+        """Test one mask per row and per column."""
+        rows = compile_pattern('row', 3, 5)
+        assert rows == (0b11111, 0b11111 << 5, 0b11111 << 10)
+        columns = compile_pattern('column', 3, 5)
+        assert len(columns) == 5
+        assert columns[0] == cell_mask([(0, 0), (1, 0), (2, 0)], 5)
+    
+    def test_diagonals_only_on_square_cards(self):
+        """Test diagonals match check.count_diagonals: none unless square."""
+        assert compile_pattern('diagonal', 3, 5) == ()
+        assert compile_pattern('diagonal', 3, 3) == (
+            cell_mask([(0, 0), (1, 1), (2, 2)], 3),
+            cell_mask([(0, 2), (1, 1), (2, 0)], 3),
+        )
+    
+    def test_four_corners(self):
+        """Test the four corner cells."""
+        assert compile_pattern('four_corners', 3, 5) == (cell_mask([(0, 0), (0, 4), (2, 0), (2, 4)], 5),)
+    
+    def test_x_on_3x5(self):
+        """Test that X on a 3x5 card is the corners plus the centre."""
+        assert compile_pattern('x', 3, 5) == (cell_mask([(0, 0), (0, 4), (1, 2), (2, 0), (2, 4)], 5),)
+    
+    def test_x_on_square_is_both_diagonals(self):
+        """Test that X on a square card is the union of its diagonals."""
+        first, second = compile_pattern('diagonal', 5, 5)
+        assert compile_pattern('x', 5, 5) == (first | second,)
+    
+    def test_blackout(self):
+        """Test that blackout covers every cell."""
+        assert compile_pattern('blackout', 3, 5) == ((1 << 15) - 1,)
+    
+    def test_compiled_once_per_size(self):
+        """Test that the same tuple is shared between calls."""
+        assert compile_pattern('row', 3, 5) is compile_pattern('row', 3, 5)
+    
+    def test_unknown_pattern(self):
+        """Test that unknown names are rejected."""
+        with pytest.raises(ValueError):
+            compile_pattern('zigzag', 3, 5)
+    
+    def test_compile_patterns_keeps_order(self):
+        """Test compiling several names at once."""
+        compiled = compile_patterns(['blackout', 'row'], 3, 5)
+        assert [p.name for p in compiled] == ['blackout', 'row']
+        assert compiled[1].masks == compile_pattern('row', 3, 5)
+
+
+class TestCustomPatterns:
+    """Test registering custom shapes."""
+    
+    def test_custom_cells(self, custom_pattern):
+        """Test a fixed list of cells compiles to one mask."""
+        assert compile_pattern(custom_pattern, 3, 5) == (0b10001,)
+    
+    def test_custom_outside_card(self, custom_pattern):
+        """Test a shape that doesn't fit the card size is rejected."""
+        with pytest.raises(ValueError):
+            compile_pattern(custom_pattern, 3, 3)
+    
+    def test_duplicate_name(self, custom_pattern):
+        """Test that names can't be registered twice."""
+        with pytest.raises(ValueError):
+            register_pattern(custom_pattern, [(0, 0)])
+    
+    def test_custom_function(self):
+        """Test a shape function with one placement per row pair."""
+        register_pattern('two_rows', lambda rows, cols: [
+            [(i, j) for i in (r, r + 1) for j in range(cols)] for r in range(rows - 1)
+        ])
+        try:
+            assert compile_pattern('two_rows', 3, 5) == (0b11111_11111, 0b11111_11111 << 5)
+        finally:
+            unregister_pattern('two_rows')
+
+
+class TestMatching:
+    """Test evaluating masks against compiled patterns."""
+    
+    def test_complete_and_matches(self):
+        """Test finding the placements a mark mask covers."""
+        rows = compile_pattern('row', 3, 5)
+        mask = rows[0] | rows[2] | 1 << 5
+        assert complete(mask, rows) == [0, 2]
+        assert matches(mask, rows) is True
+        assert matches(1 << 5, rows) is False
+    
+    def test_mask_from_marked(self, one_line_marked):
+        """Test converting a marked grid to the same bits BingoCard uses."""
+        assert mask_from_marked(one_line_marked) == 0b11111
+        assert mask_from_marked([]) == 0
+
+
+class TestRules:
+    """Test rule sets."""
+    
+    def test_bingo_patterns_always_included(self):
+        """Test that a bingo pattern without points still gets checked."""
+        rules = Rules({'row': 10}, bingo=['four_corners'])
+        assert rules.points == {'row': 10, 'four_corners': 0}
+        assert [p.name for p in rules.compile(3, 5)] == ['row', 'four_corners']
+    
+    def test_unknown_pattern(self):
+        """Test that rules reject unknown patterns."""
+        with pytest.raises(ValueError):
+            Rules({'zigzag': 10}, bingo=[])
+    
+    def test_by_cell(self):
+        """Test the placements through each cell."""
+        rules = Rules({'row': 10, 'four_corners': 5}, bingo=['blackout'])
+        table = rules.by_cell(3, 5)
+        assert len(table) == 15
+        assert [(name, index) for name, index, _ in table[0]] == \
+            [('row', 0), ('four_corners', 0), ('blackout', 0)]
+        assert [(name, index) for name, index, _ in table[7]] == [('row', 1), ('blackout', 0)]
+        assert rules.by_cell(3, 5) is table
+    
+    def test_compile_cached(self):
+        """Test that rules compile once per size."""
+        rules = Rules({'row': 10}, bingo=['blackout'])
+        assert rules.compile(3, 5) is rules.compile(3, 5)
@@ -3,52 +3,195 @@ Comprehensive tests for ScoreTracker class.
 Tests use mocking to avoid requiring actual Redis connection.
 """
 import pytest
+import json
 import os
+import redis
+import threading
+import time
 from unittest.mock import Mock, MagicMock, patch, call
-from src.game.score import ScoreTracker, LINE_POINTS, BINGO_POINTS
+from src.game import score as score_module
+from src.game.card import BingoCard
+from src.game.patterns import Rules
+from src.game.score import ScoreTracker, RedisHealth, LINE_POINTS, BINGO_POINTS
+
+
+@pytest.fixture(autouse=True)
+def reset_redis_health(tmp_path, monkeypatch):
+    """Each test starts with no shared clients and a closed circuit breaker."""
+    monkeypatch.setenv('RESULT_SPILL_FILE', str(tmp_path / 'spill.jsonl'))
+    score_module.reset_connections()
+    yield
+    score_module.reset_connections()
 
 
 class TestScoreTrackerInitialization:
     """Test ScoreTracker initialization."""
     
     @patch('src.game.score.redis.Redis')
-    def test_init_with_redis_connection(self, mock_redis_class, mock_redis_client):
-        """Test initialization when Redis is available."""
+    def test_init_does_not_connect(self, mock_redis_class, mock_redis_client):
+        """Test that constructing a tracker doesn't touch Redis."""
         mock_redis_class.return_value = mock_redis_client
-        mock_redis_client.ping.return_value = True
         
         tracker = ScoreTracker()
         assert tracker.score == 0
         assert tracker.lines_done == 0
         assert tracker.has_bingo is False
-        assert tracker.redis_client is not None
+        assert tracker.redis_client is None
+        mock_redis_class.assert_not_called()
+        mock_redis_client.ping.assert_not_called()
+    
+    @patch('src.game.score.redis.Redis')
+    def test_connects_on_first_use(self, mock_redis_class, mock_redis_client):
+        """Test that the first persistence call connects and pings once."""
+        mock_redis_class.return_value = mock_redis_client
+        mock_redis_client.ping.return_value = True
+        
+        tracker = ScoreTracker()
+        tracker.get_high_score()
+        tracker.get_high_score()
+        assert tracker.redis_client is mock_redis_client
         mock_redis_client.ping.assert_called_once()
     
     @patch('src.game.score.redis.Redis')
     def test_init_without_redis_connection(self, mock_redis_class):
-        """Test initialization when Redis is unavailable."""
+        """Test behaviour when Redis is unavailable."""
         mock_redis_class.side_effect = Exception("Connection failed")
         
         tracker = ScoreTracker()
+        assert tracker.get_high_score() == 0
         assert tracker.score == 0
         assert tracker.lines_done == 0
         assert tracker.has_bingo is False
         assert tracker.redis_client is None
     
     @patch('src.game.score.redis.Redis')
+    @patch('src.game.score.redis.BlockingConnectionPool')
     @patch.dict(os.environ, {'REDIS_HOST': 'custom-host', 'REDIS_PORT': '6380'})
-    def test_init_with_custom_redis_config(self, mock_redis_class, mock_redis_client):
-        """Test initialization with custom Redis host/port from environment."""
+    def test_init_with_custom_redis_config(self, mock_pool_class, mock_redis_class, mock_redis_client):
+        """Test that the shared pool uses Redis host/port from environment."""
         mock_redis_class.return_value = mock_redis_client
         mock_redis_client.ping.return_value = True
         
         tracker = ScoreTracker()
-        mock_redis_class.assert_called_once_with(
+        tracker.get_high_score()
+        mock_pool_class.assert_called_once_with(
             host='custom-host',
             port=6380,
             decode_responses=True,
-            socket_connect_timeout=5
+            socket_connect_timeout=5,
+            max_connections=score_module.MAX_CONNECTIONS,
+            timeout=5
         )
+        mock_redis_class.assert_called_once_with(connection_pool=mock_pool_class.return_value)
+    
+    @patch('src.game.score.redis.Redis')
+    def test_init_without_persistence(self, mock_redis_class):
+        """Test that use_redis=False never builds a client."""
+        tracker = ScoreTracker(use_redis=False)
+        assert tracker.redis_client is None
+        mock_redis_class.assert_not_called()
+
+
+class TestSharedClient:
+    """Test the shared connection pool and client factory."""
+    
+    @patch('src.game.score.redis.Redis')
+    def test_trackers_share_one_client(self, mock_redis_class, mock_redis_client):
+        """Test that many trackers reuse one client and ping only once."""
+        mock_redis_class.return_value = mock_redis_client
+        
+        trackers = [ScoreTracker() for _ in range(5)]
+        for tracker in trackers:
+            tracker.get_history()
+        assert all(t.redis_client is mock_redis_client for t in trackers)
+        assert mock_redis_class.call_count == 1
+        mock_redis_client.ping.assert_called_once()
+    
+    def test_injected_client_factory(self, mock_redis_client):
+        """Test that a custom factory is called with host and port."""
+        factory = Mock(return_value=mock_redis_client)
+        mock_redis_client.get.return_value = "30"
+        
+        tracker = ScoreTracker(client_factory=factory)
+        assert tracker.get_high_score() == 30
+        factory.assert_called_once_with(tracker.redis_host, tracker.redis_port)
+    
+    @patch('src.game.score.redis.Redis')
+    def test_reset_connections_disconnects_pool(self, mock_redis_class, mock_redis_client):
+        """Test that reset_connections closes pools and forgets health."""
+        mock_redis_class.return_value = mock_redis_client
+        ScoreTracker().get_high_score()
+        
+        score_module.reset_connections()
+        mock_redis_client.connection_pool.disconnect.assert_called_once()
+        assert score_module._clients == {}
+        assert score_module._health == {}
+
+
+class TestCircuitBreaker:
+    """Test the shared Redis health state."""
+    
+    @patch('src.game.score.redis.Redis')
+    def test_outage_is_shared_between_trackers(self, mock_redis_class):
+        """Test that after a failed connect, new trackers don't retry."""
+        mock_redis_class.side_effect = Exception("Connection failed")
+        
+        ScoreTracker().get_high_score()
+        assert ScoreTracker().get_high_score() == 0
+        assert mock_redis_class.call_count == 1
+    
+    @patch('src.game.score.time.monotonic')
+    def test_backoff_doubles(self, mock_monotonic):
+        """Test that each failure doubles the wait before the next attempt."""
+        mock_monotonic.return_value = 100.0
+        health = RedisHealth()
+        assert health.try_acquire() is True
+        
+        health.record_failure()
+        assert health.try_acquire() is False
+        mock_monotonic.return_value = 101.0
+        assert health.try_acquire() is True
+        # Only one attempt is let through while it's in flight
+        assert health.try_acquire() is False
+        
+        health.record_failure()
+        mock_monotonic.return_value = 102.5
+        assert health.try_acquire() is False
+        mock_monotonic.return_value = 103.0
+        assert health.try_acquire() is True
+    
+    def test_one_connect_attempt_at_a_time(self, mock_redis_client, monkeypatch):
+        """Test that trackers arriving mid-connect don't start or wait on another attempt."""
+        monkeypatch.setattr(score_module, 'READ_WAIT', 0.05)
+        answered = threading.Event()
+        mock_redis_client.ping.side_effect = lambda: answered.wait(5)
+        factory = Mock(return_value=mock_redis_client)
+        ScoreTracker(client_factory=factory).get_high_score()
+        start = time.monotonic()
+        for _ in range(5):
+            assert ScoreTracker(client_factory=factory).get_high_score() == 0
+        assert time.monotonic() - start < 0.05
+        answered.set()
+        factory.assert_called_once()
+    
+    def test_success_closes_breaker(self):
+        """Test that a successful connect resets the failure count."""
+        health = RedisHealth()
+        health.record_failure()
+        health.record_success()
+        assert health.failures == 0
+        assert health.try_acquire() is True
+    
+    @patch('src.game.score.redis.Redis')
+    def test_connection_error_drops_client(self, mock_redis_class, mock_redis_client):
+        """Test that a broken connection is forgotten and opens the breaker."""
+        mock_redis_class.return_value = mock_redis_client
+        mock_redis_client.get.side_effect = redis.ConnectionError("gone")
+        
+        tracker = ScoreTracker()
+        assert tracker.get_high_score() == 0
+        assert tracker.redis_client is None
+        assert score_module.get_health(tracker.redis_host, tracker.redis_port).failures == 1
 
 
 class TestUpdateScore:
@@ -128,11 +271,29 @@ class TestUpdateScore:
         
         tracker = ScoreTracker()
         tracker.update_score(all_lines_marked)
+        tracker.writer.flush()
+        
+        # Should save through the atomic script in one pipeline
+        pipe = mock_redis_client.pipeline.return_value
+        pipe.register_script.assert_called_once_with(score_module.SAVE_RESULT_SCRIPT)
+        save_result = pipe.register_script.return_value
+        save_result.assert_called_once()
+        assert save_result.call_args.kwargs['keys'] == ['game_history', 'high_score']
+        assert save_result.call_args.kwargs['args'][2] == score_module.HISTORY_MAX_LEN
+        pipe.execute.assert_called_once()
+        assert not mock_redis_client.lpush.called
+        assert not mock_redis_client.set.called
+    
+    @patch('src.game.score.redis.Redis')
+    def test_update_score_bingo_does_not_block(self, mock_redis_class, mock_redis_client, all_lines_marked):
+        """Test that bingo only queues the result for the writer."""
+        mock_redis_class.return_value = mock_redis_client
         
-        # Should have called lpush for game history
-        assert mock_redis_client.lpush.called
-        # Should have called set for high score
-        assert mock_redis_client.set.called
+        tracker = ScoreTracker(writer=Mock())
+        tracker.update_score(all_lines_marked)
+        tracker.writer.submit.assert_called_once()
+        assert tracker.writer.submit.call_args.args[0]['score'] == tracker.score
+        mock_redis_class.assert_not_called()
     
     @patch('src.game.score.redis.Redis')
     def test_update_score_bingo_only_once(self, mock_redis_class, mock_redis_client, all_lines_marked):
@@ -151,6 +312,128 @@ class TestUpdateScore:
         assert tracker.score == initial_score  # No change
 
 
+class TestRecordLines:
+    """Test scoring from the lines reported by BingoCard.mark_number."""
+    
+    @patch('src.game.score.redis.Redis')
+    def test_record_lines_no_lines(self, mock_redis_class, mock_redis_client):
+        """Test that an empty completion list scores nothing."""
+        mock_redis_class.return_value = mock_redis_client
+        
+        tracker = ScoreTracker()
+        tracker.record_lines([], 3)
+        assert tracker.score == 0
+        assert tracker.lines_done == 0
+    
+    @patch('src.game.score.redis.Redis')
+    def test_record_lines_ignores_columns(self, mock_redis_class, mock_redis_client):
+        """Test that only rows score, like check.count_lines."""
+        mock_redis_class.return_value = mock_redis_client
+        
+        tracker = ScoreTracker()
+        tracker.record_lines([("row", 0), ("col", 2)], 3)
+        assert tracker.score == LINE_POINTS
+        assert tracker.lines_done == 1
+    
+    @patch('src.game.score.redis.Redis')
+    def test_record_lines_bingo(self, mock_redis_class, mock_redis_client):
+        """Test that completing every row awards the bingo bonus once."""
+        mock_redis_class.return_value = mock_redis_client
+        mock_redis_client.get.return_value = None
+        
+        tracker = ScoreTracker()
+        tracker.record_lines([("row", 0)], 3)
+        tracker.record_lines([("row", 1)], 3)
+        tracker.record_lines([("row", 2)], 3)
+        assert tracker.score == (LINE_POINTS * 3) + BINGO_POINTS
+        assert tracker.has_bingo is True
+        assert tracker.writer.pending() == 1
+
+
+class TestPatternRules:
+    """Test scoring per pattern with custom rules."""
+    
+    def test_default_rules_match_record_lines(self, sample_card_numbers):
+        """Test that record_card and record_lines score a game the same way."""
+        card_a = BingoCard(numbers=sample_card_numbers)
+        card_b = BingoCard(numbers=sample_card_numbers)
+        by_card = ScoreTracker(use_redis=False)
+        by_lines = ScoreTracker(use_redis=False)
+        for n in sample_card_numbers:
+            card_a.mark_number(n)
+            by_card.record_card(card_a)
+            by_lines.record_lines(card_b.mark_number(n), card_b.rows)
+            assert by_card.get_score() == by_lines.get_score()
+            assert by_card.lines_done == by_lines.lines_done
+            assert by_card.has_bingo == by_lines.has_bingo
+        assert by_card.has_bingo is True
+    
+    def test_four_corners_bingo(self, sample_card_numbers):
+        """Test that a corners game ends on the fourth corner."""
+        rules = Rules({'row': LINE_POINTS, 'four_corners': BINGO_POINTS}, bingo=['four_corners'])
+        tracker = ScoreTracker(use_redis=False, rules=rules)
+        card = BingoCard(numbers=sample_card_numbers)
+        for n in (1, 5, 20):
+            card.mark_number(n)
+            tracker.record_card(card)
+        assert tracker.has_bingo is False
+        card.mark_number(24)
+        tracker.record_card(card)
+        assert tracker.has_bingo is True
+        assert tracker.score == BINGO_POINTS
+        assert tracker.won == {('four_corners', 0)}
+    
+    def test_each_placement_scores_once(self, sample_card_numbers):
+        """Test that columns score per column and never twice."""
+        rules = Rules({'column': 5}, bingo=['blackout'])
+        tracker = ScoreTracker(use_redis=False, rules=rules)
+        card = BingoCard(numbers=sample_card_numbers)
+        for n in (1, 10, 20, 2, 11, 21):
+            card.mark_number(n)
+            tracker.record_card(card)
+            tracker.record_card(card)
+        assert tracker.score == 10
+        assert tracker.lines_done == 2
+    
+    def test_pre_marked_card(self, sample_card_numbers):
+        """Test that the first record_card scores marks made before it."""
+        card = BingoCard(numbers=sample_card_numbers)
+        for n in (1, 2, 3, 4, 5, 10):
+            card.mark_number(n)
+        tracker = ScoreTracker(use_redis=False)
+        tracker.record_card(card)
+        assert tracker.score == LINE_POINTS
+        card.mark_number(11)
+        tracker.record_card(card)
+        assert tracker.score == LINE_POINTS
+    
+    def test_only_placements_through_new_cells(self, sample_card_numbers):
+        """Test that a mark only checks the placements through its cell."""
+        tracker = ScoreTracker(use_redis=False)
+        card = BingoCard(numbers=sample_card_numbers)
+        tracker.record_card(card)
+        # A placement the new cell isn't part of is left alone
+        tracker._last_mask = card.mask = 0b11111
+        card.mark_number(10)
+        tracker.record_card(card)
+        assert tracker.score == 0
+    
+    def test_empty_grid(self):
+        """Test that update_score([]) is bingo, as check.is_bingo([]) is."""
+        tracker = ScoreTracker(use_redis=False)
+        tracker.update_score([])
+        assert tracker.has_bingo is True
+        assert tracker.score == BINGO_POINTS
+    
+    def test_record_lines_uses_rules(self):
+        """Test that record_lines scores columns when the rules do."""
+        rules = Rules({'row': 10, 'column': 5}, bingo=['blackout'])
+        tracker = ScoreTracker(use_redis=False, rules=rules)
+        tracker.record_lines([("row", 0), ("col", 2)], 3)
+        assert tracker.score == 15
+        assert tracker.lines_done == 2
+
+
 class TestGetScore:
     """Test get_score method."""
     
@@ -214,11 +497,156 @@ class TestGetHighScore:
         
         tracker = ScoreTracker()
         tracker.update_score(all_lines_marked)
-        # Should have called set with new high score
-        mock_redis_client.set.assert_called()
-        # Get the score that was set
-        set_calls = mock_redis_client.set.call_args_list
-        assert any('high_score' in str(call) for call in set_calls)
+        tracker.writer.flush()
+        # Should have passed the new score to the max-update script
+        save_result = mock_redis_client.pipeline.return_value.register_script.return_value
+        entry, new_score = save_result.call_args.kwargs['args'][:2]
+        assert new_score == tracker.score
+        assert json.loads(entry)['score'] == tracker.score
+
+
+class TestLeaderboard:
+    """Test leaderboard updates and reads through the tracker."""
+    
+    @patch('src.game.score.redis.Redis')
+    def test_save_updates_player_leaderboards(self, mock_redis_class, mock_redis_client, all_lines_marked):
+        """Test that a named player's result targets every period board."""
+        mock_redis_class.return_value = mock_redis_client
+        
+        tracker = ScoreTracker(player='ana')
+        tracker.update_score(all_lines_marked)
+        tracker.writer.flush()
+        save_result = mock_redis_client.pipeline.return_value.register_script.return_value
+        keys = save_result.call_args.kwargs['keys']
+        args = save_result.call_args.kwargs['args']
+        assert keys[:3] == ['game_history', 'high_score', 'leaderboard:all']
+        assert keys[3].startswith('leaderboard:daily:')
+        assert keys[4].startswith('leaderboard:weekly:')
+        assert args[3] == 'ana'
+        assert args[4:] == [0, 2 * 24 * 3600, 14 * 24 * 3600]
+    
+    @patch('src.game.score.redis.Redis')
+    def test_anonymous_save_skips_leaderboards(self, mock_redis_class, mock_redis_client, all_lines_marked):
+        """Test that games without a player only touch history and high score."""
+        mock_redis_class.return_value = mock_redis_client
+        
+        tracker = ScoreTracker()
+        tracker.update_score(all_lines_marked)
+        tracker.writer.flush()
+        save_result = mock_redis_client.pipeline.return_value.register_script.return_value
+        assert save_result.call_args.kwargs['keys'] == ['game_history', 'high_score']
+    
+    @patch('src.game.score.redis.Redis')
+    def test_get_top_players(self, mock_redis_class, mock_redis_client):
+        """Test reading the top of the leaderboard."""
+        mock_redis_class.return_value = mock_redis_client
+        mock_redis_client.zrevrange.return_value = [('ana', 80.0)]
+        
+        assert ScoreTracker().get_top_players(5) == [('ana', 80)]
+    
+    @patch('src.game.score.redis.Redis')
+    def test_get_rank(self, mock_redis_class, mock_redis_client):
+        """Test reading the player's rank."""
+        mock_redis_class.return_value = mock_redis_client
+        mock_redis_client.zrevrank.return_value = 4
+        
+        assert ScoreTracker(player='ana').get_rank() == 5
+        assert ScoreTracker().get_rank() is None
+    
+    @patch('src.game.score.redis.Redis')
+    def test_leaderboard_no_redis(self, mock_redis_class):
+        """Test that leaderboard reads degrade to empty without Redis."""
+        mock_redis_class.side_effect = Exception("Connection failed")
+        
+        tracker = ScoreTracker(player='ana')
+        assert tracker.get_top_players() == []
+        assert tracker.get_rank() is None
+
+
+class TestReadCache:
+    """Test that high score and leaderboard reads are cached."""
+    
+    @patch('src.game.score.redis.Redis')
+    def test_high_score_served_from_cache(self, mock_redis_class, mock_redis_client):
+        """Test that repeated reads across trackers cost one round trip."""
+        mock_redis_class.return_value = mock_redis_client
+        mock_redis_client.get.return_value = "120"
+        
+        assert ScoreTracker().get_high_score() == 120
+        assert ScoreTracker().get_high_score() == 120
+        mock_redis_client.get.assert_called_once()
+    
+    @patch('src.game.score.redis.Redis')
+    def test_cache_expires(self, mock_redis_class, mock_redis_client):
+        """Test that entries are re-read once the TTL has passed."""
+        mock_redis_class.return_value = mock_redis_client
+        mock_redis_client.get.return_value = "120"
+        
+        tracker = ScoreTracker()
+        tracker.cache.clock = Mock(return_value=0.0)
+        tracker.get_high_score()
+        tracker.cache.clock.return_value = score_module.READ_CACHE_TTL + 0.1
+        mock_redis_client.get.return_value = "150"
+        assert tracker.get_high_score() == 150
+        assert mock_redis_client.get.call_count == 2
+    
+    @patch('src.game.score.redis.Redis')
+    def test_failed_reads_not_cached(self, mock_redis_class, mock_redis_client):
+        """Test that a fallback value isn't cached."""
+        mock_redis_class.return_value = mock_redis_client
+        mock_redis_client.get.side_effect = [Exception("Redis error"), "90"]
+        
+        tracker = ScoreTracker()
+        assert tracker.get_high_score() == 0
+        assert tracker.get_high_score() == 90
+    
+    @patch('src.game.score.redis.Redis')
+    def test_own_writes_invalidate_cache(self, mock_redis_class, mock_redis_client, all_lines_marked):
+        """Test that flushing a result drops cached reads."""
+        mock_redis_class.return_value = mock_redis_client
+        mock_redis_client.zrevrange.return_value = []
+        
+        tracker = ScoreTracker(player='ana')
+        assert tracker.get_top_players() == []
+        tracker.update_score(all_lines_marked)
+        tracker.writer.flush()
+        mock_redis_client.zrevrange.return_value = [('ana', 80.0)]
+        assert tracker.get_top_players() == [('ana', 80)]
+
+
+class TestGetHistory:
+    """Test paging through game history."""
+    
+    @patch('src.game.score.redis.Redis')
+    def test_get_history_first_page(self, mock_redis_class, mock_redis_client):
+        """Test that a full page returns a cursor to the next one."""
+        mock_redis_class.return_value = mock_redis_client
+        mock_redis_client.lrange.return_value = [json.dumps({'score': s}) for s in (80, 70)]
+        
+        tracker = ScoreTracker()
+        entries, cursor = tracker.get_history(count=2)
+        assert [e['score'] for e in entries] == [80, 70]
+        assert cursor == 2
+        mock_redis_client.lrange.assert_called_once_with('game_history', 0, 1)
+    
+    @patch('src.game.score.redis.Redis')
+    def test_get_history_last_page(self, mock_redis_class, mock_redis_client):
+        """Test that a short page ends the paging."""
+        mock_redis_class.return_value = mock_redis_client
+        mock_redis_client.lrange.return_value = [json.dumps({'score': 60})]
+        
+        tracker = ScoreTracker()
+        entries, cursor = tracker.get_history(cursor=4, count=2)
+        assert len(entries) == 1
+        assert cursor is None
+        mock_redis_client.lrange.assert_called_once_with('game_history', 4, 5)
+    
+    @patch('src.game.score.redis.Redis')
+    def test_get_history_no_redis(self, mock_redis_class):
+        """Test that history is empty without Redis."""
+        mock_redis_class.side_effect = Exception("Connection failed")
+        
+        assert ScoreTracker().get_history() == ([], None)
 
 
 class TestRedisErrorHandling:
@@ -229,14 +657,29 @@ class TestRedisErrorHandling:
         """Test that game continues if Redis save fails."""
         mock_redis_class.return_value = mock_redis_client
         mock_redis_client.ping.return_value = True
-        mock_redis_client.lpush.side_effect = Exception("Redis error")
+        mock_redis_client.pipeline.return_value.execute.side_effect = Exception("Redis error")
         
         tracker = ScoreTracker()
         # Should not raise exception
         tracker.update_score(all_lines_marked)
+        tracker.writer.flush()
         assert tracker.has_bingo is True
         assert tracker.score > 0
     
+    @patch('src.game.score.redis.Redis')
+    def test_save_game_result_connection_lost(self, mock_redis_class, mock_redis_client, all_lines_marked):
+        """Test that results are spilled to disk when Redis drops during save."""
+        mock_redis_class.return_value = mock_redis_client
+        mock_redis_client.pipeline.return_value.execute.side_effect = redis.ConnectionError("gone")
+        
+        tracker = ScoreTracker()
+        tracker.update_score(all_lines_marked)
+        tracker.writer.flush()
+        assert tracker.has_bingo is True
+        with open(os.environ['RESULT_SPILL_FILE']) as f:
+            assert json.loads(f.readline())['score'] == tracker.score
+        assert score_module.get_health(tracker.redis_host, tracker.redis_port).failures == 1
+    
     @patch('src.game.score.redis.Redis')
     def test_get_high_score_redis_error(self, mock_redis_class, mock_redis_client):
         """Test that get_high_score handles Redis errors gracefully."""
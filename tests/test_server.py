@@ -0,0 +1,270 @@
+"""
+Tests for the multiplayer room and server.
+Rooms run with use_redis=False so no Redis is needed.
+"""
+import asyncio
+import json
+
+import pytest
+from src.game.async_score import AsyncScoreTracker
+from src.net.client import BotClient
+from src.net.room import Room, MAX_CARDS
+from src.net.server import GameServer
+
+
+def new_room(**kwargs):
+    return Room('test', draw_interval=0, seed=7, use_redis=False, **kwargs)
+
+
+def marked_numbers(card):
+    return {card.card[i][j] for i in range(card.rows) for j in range(card.cols) if card.marked[i][j]}
+
+
+async def join(room, name, cards=1):
+    """Add a player whose messages are collected in a list."""
+    inbox = []
+    player = await room.add_player(name, cards, inbox.append)
+    return player, inbox
+
+
+class TestRoom:
+    """Test drawing, joining and claims in one room."""
+    
+    def test_same_seed_same_game(self):
+        """Test that a seeded room deals the same cards and balls."""
+        async def play():
+            room = new_room()
+            player, _ = await join(room, 'ana')
+            balls = [await room.draw() for _ in range(5)]
+            return player.cards[0].card, balls
+        assert asyncio.run(play()) == asyncio.run(play())
+    
+    def test_ball_broadcast_and_marked(self):
+        """Test that every player gets each ball and their cards are marked."""
+        async def play():
+            room = new_room()
+            ana, ana_inbox = await join(room, 'ana')
+            bob, bob_inbox = await join(room, 'bob', cards=2)
+            number = await room.draw()
+            return number, ana, ana_inbox, bob, bob_inbox
+        number, ana, ana_inbox, bob, bob_inbox = asyncio.run(play())
+        assert ana_inbox == bob_inbox == [{'type': 'ball', 'number': number, 'count': 1}]
+        for card in ana.cards + bob.cards:
+            assert marked_numbers(card) == ({number} & set(card.cell_pos))
+    
+    def test_slow_save_does_not_hold_up_balls(self, monkeypatch):
+        """Test that a bingo's result is saved in the background."""
+        gate = None
+        saved = []
+        async def slow_save(tracker):
+            await gate.wait()
+            saved.append(tracker.player)
+        monkeypatch.setattr(AsyncScoreTracker, 'save_game_result', slow_save)
+        async def play():
+            nonlocal gate
+            gate = asyncio.Event()
+            room = new_room()
+            player, inbox = await join(room, 'ana')
+            while not player.trackers[0].has_bingo:
+                await room.draw()
+            balls = len(inbox)
+            await room.draw()
+            pending = (len(inbox), balls, list(saved))
+            gate.set()
+            await room.wait_saved()
+            return pending
+        count, balls, pending = asyncio.run(play())
+        assert count == balls + 1
+        assert pending == []
+        assert saved == ['ana']
+    
+    def test_late_joiner_catches_up(self):
+        """Test that a player joining mid-game has the drawn balls marked."""
+        async def play():
+            room = new_room()
+            for _ in range(30):
+                await room.draw()
+            player, _ = await join(room, 'late')
+            return room, player
+        room, player = asyncio.run(play())
+        card = player.cards[0]
+        assert marked_numbers(card) == set(card.cell_pos) & set(room.drawer.get_drawn_numbers())
+    
+    def test_rejects_bad_joins(self):
+        """Test duplicate names and card counts are refused."""
+        async def play():
+            room = new_room()
+            await join(room, 'ana')
+            with pytest.raises(ValueError):
+                await join(room, 'ana')
+            with pytest.raises(ValueError):
+                await join(room, 'bob', cards=0)
+            with pytest.raises(ValueError):
+                await join(room, 'bob', cards=MAX_CARDS + 1)
+        asyncio.run(play())
+    
+    def test_false_claim_rejected(self):
+        """Test that claiming before bingo is refused and the game goes on."""
+        async def play():
+            room = new_room()
+            _, inbox = await join(room, 'ana')
+            valid = await room.claim('ana', 0)
+            return room, inbox, valid
+        room, inbox, valid = asyncio.run(play())
+        assert valid is False
+        assert inbox == [{'type': 'claim', 'card': 0, 'ok': False}]
+        assert room.finished is False
+    
+    def test_valid_claim_wins(self):
+        """Test that a real bingo wins the room and ends the game."""
+        async def play():
+            room = new_room()
+            player, inbox = await join(room, 'ana')
+            while not player.trackers[0].has_bingo:
+                await room.draw()
+            valid = await room.claim('ana', 0)
+            return room, inbox, valid
+        room, inbox, valid = asyncio.run(play())
+        assert valid is True
+        assert room.winner == ('ana', 0)
+        assert room.finished is True
+        assert [m['type'] for m in inbox[-3:]] == ['claim', 'winner', 'game_over']
+        assert inbox[-1]['winner'] == 'ana'
+    
+    def test_state_for_resync(self):
+        """Test that state() carries every ball so far and the card masks."""
+        async def play():
+            room = new_room()
+            player, _ = await join(room, 'ana', cards=2)
+            for _ in range(10):
+                await room.draw()
+            return room, player
+        room, player = asyncio.run(play())
+        state = room.state(player)
+        assert state['drawn'] == list(room.drawer.get_drawn_numbers())
+        assert state['count'] == 10
+        assert state['masks'] == [card.mask for card in player.cards]
+    
+    def test_last_player_leaving_ends_game(self):
+        """Test that an empty room stops drawing."""
+        async def play():
+            room = new_room()
+            await join(room, 'ana')
+            room.remove_player('ana')
+            return room
+        assert asyncio.run(play()).finished is True
+    
+    def test_run_stops_when_balls_run_out(self):
+        """Test that run() ends with game_over even if nobody claims."""
+        async def play():
+            room = new_room()
+            _, inbox = await join(room, 'ana')
+            await room.run()
+            return room, inbox
+        room, inbox = asyncio.run(play())
+        assert len(room.drawer.get_drawn_numbers()) == 75
+        assert inbox[-1] == {'type': 'game_over', 'winner': None}
+
+
+class TestGameServer:
+    """Test whole games over TCP with bot players."""
+    
+    def test_bots_play_to_a_winner(self):
+        """Test that several bots share a room and one of them wins."""
+        async def play():
+            server = GameServer(draw_interval=0, use_redis=False, seed=3)
+            listener = await server.start('127.0.0.1', 0)
+            port = listener.sockets[0].getsockname()[1]
+            async with listener:
+                bots = [BotClient(f"bot{i}", cards=2) for i in range(5)]
+                results = await asyncio.gather(*(bot.play('127.0.0.1', port) for bot in bots))
+            return bots, results
+        bots, results = asyncio.run(play())
+        winners = {result['winner'] for result in results}
+        assert len(winners) == 1
+        assert winners.pop() in {bot.name for bot in bots}
+        for bot in bots:
+            assert [m['type'] for m in bot.messages if m['type'] == 'winner'] == ['winner']
+    
+    def test_tiny_queues_still_finish(self):
+        """Test that bots resynced from state messages still play to a winner."""
+        async def play():
+            server = GameServer(draw_interval=0, use_redis=False, seed=5, queue_size=1)
+            listener = await server.start('127.0.0.1', 0)
+            port = listener.sockets[0].getsockname()[1]
+            async with listener:
+                bots = [BotClient(f"bot{i}") for i in range(10)]
+                results = await asyncio.gather(*(bot.play('127.0.0.1', port) for bot in bots))
+            return server, results
+        server, results = asyncio.run(play())
+        assert len({result['winner'] for result in results}) == 1
+        stats = server.stats()
+        assert stats['clients'] == 0
+        assert stats['sent'] > 0
+        assert stats['max_depth'] >= 1
+    
+    def test_duplicate_name_gets_error(self):
+        """Test that joining with a taken name returns an error message."""
+        async def play():
+            server = GameServer(draw_interval=0.05, use_redis=False)
+            listener = await server.start('127.0.0.1', 0)
+            port = listener.sockets[0].getsockname()[1]
+            async with listener:
+                first = BotClient('ana')
+                second = BotClient('ana')
+                first_game = asyncio.create_task(first.play('127.0.0.1', port))
+                while 'lobby' not in server.rooms or not server.rooms['lobby'].players:
+                    await asyncio.sleep(0.01)
+                error = await second.play('127.0.0.1', port)
+                await first_game
+            return error
+        error = asyncio.run(play())
+        assert error['type'] == 'error'
+        assert 'already taken' in error['message']
+    
+    def test_bad_claim_gets_error(self):
+        """Test that a claim with a non-numeric card is answered, not fatal."""
+        async def play():
+            server = GameServer(draw_interval=60, use_redis=False)
+            listener = await server.start('127.0.0.1', 0)
+            port = listener.sockets[0].getsockname()[1]
+            async with listener:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                replies = []
+                for message in ({'type': 'join', 'name': 'ana'}, {'type': 'claim', 'card': 'x'},
+                                {'type': 'claim', 'card': None}, {'type': 'claim', 'card': 0}):
+                    writer.write((json.dumps(message) + '\n').encode())
+                    await writer.drain()
+                    replies.append(json.loads(await reader.readline()))
+                writer.close()
+                server.rooms['lobby'].finish()
+            return replies
+        replies = asyncio.run(play())
+        assert [reply['type'] for reply in replies] == ['joined', 'error', 'error', 'claim']
+        assert replies[3]['ok'] is False
+    
+    def test_failed_join_closes_new_room(self):
+        """Test that a rejected join doesn't leave an empty room running."""
+        async def play():
+            server = GameServer(draw_interval=0.01, use_redis=False)
+            listener = await server.start('127.0.0.1', 0)
+            port = listener.sockets[0].getsockname()[1]
+            async with listener:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                replies = []
+                for k in range(5):
+                    message = {'type': 'join', 'room': f'room{k}', 'name': 'ana', 'cards': 99}
+                    writer.write((json.dumps(message) + '\n').encode())
+                    await writer.drain()
+                    replies.append(json.loads(await reader.readline()))
+                finished = [room.finished for room in server.rooms.values()]
+                writer.close()
+                for _ in range(100):
+                    if not server.rooms:
+                        break
+                    await asyncio.sleep(0.01)
+            return replies, finished, server.rooms
+        replies, finished, rooms = asyncio.run(play())
+        assert [reply['type'] for reply in replies] == ['error'] * 5
+        assert all(finished)
+        assert rooms == {}
@@ -0,0 +1,69 @@
+"""
+Tests for the headless Monte Carlo simulation.
+"""
+from simulate import play_game, run_chunk, simulate, summarize, format_summary, main
+from src.game.score import LINE_POINTS, BINGO_POINTS
+
+
+class TestPlayGame:
+    """Test a single headless game."""
+    
+    def test_play_game_reaches_bingo(self):
+        """Test that a full draw always ends in bingo with full points."""
+        first_line, bingo, score = play_game()
+        assert 5 <= first_line <= bingo <= 75
+        assert score == LINE_POINTS * 3 + BINGO_POINTS
+
+
+class TestRunChunk:
+    """Test seeded work units."""
+    
+    def test_run_chunk_is_reproducible(self):
+        """Test that the same seed gives the same games."""
+        assert run_chunk(42, 20) == run_chunk(42, 20)
+    
+    def test_run_chunk_size(self):
+        """Test that a chunk plays the requested number of games."""
+        assert len(run_chunk(1, 7)) == 7
+
+
+class TestSimulate:
+    """Test the process pool driver."""
+    
+    def test_simulate_independent_of_workers(self):
+        """Test that results depend on the seed, not on the worker count."""
+        one = simulate(30, workers=1, chunk_size=8, seed=5)
+        two = simulate(30, workers=2, chunk_size=8, seed=5)
+        assert len(one) == 30
+        assert one == two
+
+
+class TestSummarize:
+    """Test distribution summaries."""
+    
+    def test_summarize_values(self):
+        """Test summary statistics of a simple list."""
+        summary = summarize([1, 2, 3, 4, None])
+        assert summary['count'] == 4
+        assert summary['mean'] == 2.5
+        assert summary['min'] == 1
+        assert summary['max'] == 4
+        assert summary['p50'] == 3
+    
+    def test_summarize_empty(self):
+        """Test that no data gives a zero count."""
+        assert summarize([None]) == {'count': 0}
+        assert "no data" in format_summary("Score", {'count': 0})
+
+
+class TestMain:
+    """Test the command line entry point."""
+    
+    def test_main_prints_report(self, capsys):
+        """Test that main prints all three distributions."""
+        main(['--games', '10', '--workers', '1', '--seed', '3'])
+        out = capsys.readouterr().out
+        assert "10 games" in out
+        assert "Balls to first line" in out
+        assert "Balls to bingo" in out
+        assert "Score" in out
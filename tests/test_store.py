@@ -0,0 +1,134 @@
+"""
+Tests for the memory-mapped card store.
+Card files are written to pytest's tmp_path.
+"""
+import random
+
+import numpy as np
+import pytest
+from src.game.batch import CardBatch
+from src.game.generate import generate_cards
+from src.game.store import CardFileWriter, CardStore, HEADER_SIZE, write_cards
+
+
+@pytest.fixture
+def series():
+    """A small series of unique cards."""
+    return generate_cards(2000, seed=11, bingo_columns=True)
+
+
+@pytest.fixture
+def card_file(tmp_path, series):
+    path = str(tmp_path / 'series.bin')
+    write_cards(path, series)
+    return path
+
+
+@pytest.fixture
+def draw():
+    return random.Random(5).sample(range(1, 76), 75)
+
+
+class TestCardFile:
+    """Test writing and opening card files."""
+    
+    def test_round_trip(self, card_file, series):
+        """Test that cards and header fields come back unchanged."""
+        with CardStore(card_file) as store:
+            assert len(store) == 2000
+            assert (store.rows, store.cols) == (3, 5)
+            assert (store.min_number, store.max_number) == (1, 75)
+            assert isinstance(store.cards, np.memmap)
+            assert (np.asarray(store.cards) == series).all()
+    
+    def test_record_size(self, card_file):
+        """Test one byte per number after a fixed header."""
+        with open(card_file, 'rb') as f:
+            assert len(f.read()) == HEADER_SIZE + 2000 * 15
+    
+    def test_streamed_writes(self, tmp_path, series):
+        """Test that chunked writes produce the same file as one write."""
+        path = str(tmp_path / 'chunked.bin')
+        with CardFileWriter(path) as writer:
+            for start in range(0, len(series), 300):
+                writer.write(series[start:start + 300])
+        with CardStore(path) as store:
+            assert len(store) == len(series)
+            assert (np.asarray(store.cards) == series).all()
+    
+    def test_empty_file(self, tmp_path):
+        """Test a series with no cards."""
+        path = str(tmp_path / 'empty.bin')
+        write_cards(path, np.empty((0, 3, 5), dtype=np.uint8))
+        with CardStore(path) as store:
+            assert len(store) == 0
+            index, ids = store.first_winners([1, 2, 3])
+            assert index is None
+            assert len(ids) == 0
+    
+    def test_rejects_bad_shape_and_range(self, tmp_path):
+        """Test that the writer checks shapes and numbers."""
+        with CardFileWriter(str(tmp_path / 'x.bin')) as writer:
+            with pytest.raises(ValueError):
+                writer.write(np.ones((2, 5, 5), dtype=np.uint8))
+            with pytest.raises(ValueError):
+                writer.write(np.full((2, 3, 5), 80, dtype=np.uint8))
+        with pytest.raises(ValueError):
+            CardFileWriter(str(tmp_path / 'y.bin'), max_number=300)
+    
+    def test_rejects_other_files(self, tmp_path, card_file):
+        """Test bad magic and truncated files."""
+        other = tmp_path / 'other.bin'
+        other.write_bytes(b'x' * 64)
+        with pytest.raises(ValueError):
+            CardStore(str(other))
+        with open(card_file, 'rb') as f:
+            data = f.read()
+        truncated = tmp_path / 'truncated.bin'
+        truncated.write_bytes(data[:-7])
+        with pytest.raises(ValueError):
+            CardStore(str(truncated))
+
+
+class TestCardStoreQueries:
+    """Test validating a draw against the stored series."""
+    
+    def test_winning_draws_match_batch(self, card_file, series, draw):
+        """Test chunked results against CardBatch on the same cards."""
+        with CardStore(card_file) as store:
+            first_line, bingo = store.winning_draws(draw, chunk_size=333)
+        expected = CardBatch(series).winning_draws(draw)
+        assert (first_line == expected[0]).all()
+        assert (bingo == expected[1]).all()
+    
+    def test_first_winners_match_batch(self, card_file, series, draw):
+        """Test that the earliest bingo is found across chunks."""
+        with CardStore(card_file) as store:
+            index, ids = store.first_winners(draw, chunk_size=250)
+        expected_index, expected_ids = CardBatch(series).first_winners(draw)
+        assert index == expected_index
+        assert ids.tolist() == expected_ids.tolist()
+    
+    def test_no_winner_in_short_draw(self, card_file):
+        """Test that a few balls can't complete a card."""
+        with CardStore(card_file) as store:
+            index, ids = store.first_winners([1, 2, 3])
+        assert index is None
+        assert len(ids) == 0
+    
+    def test_card_on_demand(self, card_file, series, draw):
+        """Test building a winning BingoCard only when needed."""
+        with CardStore(card_file) as store:
+            index, ids = store.first_winners(draw)
+            card = store.card(int(ids[0]), drawn=draw[:index + 1])
+        assert card.card == series[ids[0]].tolist()
+        assert card.has_bingo(['blackout'])
+    
+    def test_invalid_cards(self, tmp_path):
+        """Test finding repeated numbers in a record."""
+        cards = generate_cards(10, seed=1)
+        cards[4, 1, 2] = cards[4, 0, 0]
+        path = str(tmp_path / 'bad.bin')
+        write_cards(path, cards)
+        with CardStore(path) as store:
+            assert store.invalid_cards(chunk_size=3).tolist() == [4]
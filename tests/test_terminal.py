@@ -0,0 +1,97 @@
+"""
+Tests for the incremental card grid.
+Output goes to a StringIO so the escape sequences can be inspected.
+"""
+import io
+
+from src.game.card import BingoCard
+from src.ui.terminal import CardGrid, CLEAR_SCREEN, REVERSE, goto
+
+NUMBERS = list(range(1, 16))
+
+
+def grid_of(n_cards, **kwargs):
+    cards = [BingoCard(numbers=[n + 15 * k for n in NUMBERS]) for k in range(n_cards)]
+    out = io.StringIO()
+    return CardGrid(cards, out=out, width=80, **kwargs), cards, out
+
+
+class TestCardGrid:
+    """Test layout, full draws and cell patches."""
+    
+    def test_layout_wraps_to_width(self):
+        """Test that cards are placed side by side until the width runs out."""
+        grid, _, _ = grid_of(5)
+        assert grid.per_row == 2
+        assert grid.origin(0) == (1, 1)
+        assert grid.origin(1) == (1, 1 + grid.card_width + CardGrid.GAP)
+        assert grid.origin(2) == (1 + grid.block_height, 1)
+        assert grid.height == 3 * grid.block_height
+    
+    def test_compact_fits_more_cards(self):
+        """Test that compact cells pack more cards per row."""
+        grid, _, _ = grid_of(5, compact=True)
+        assert grid.per_row > 2
+    
+    def test_first_update_draws_everything(self):
+        """Test that the first update clears the screen and draws every card."""
+        grid, cards, out = grid_of(3)
+        assert grid.update() is True
+        text = out.getvalue()
+        assert text.startswith(CLEAR_SCREEN)
+        for k in range(3):
+            assert f"Card {k + 1}" in text
+        assert f"{45:>3} " in text
+    
+    def test_update_patches_only_changed_cells(self):
+        """Test that marking one number writes just that cell."""
+        grid, cards, out = grid_of(3)
+        grid.draw()
+        out.truncate(0)
+        out.seek(0)
+        cards[1].mark_number(22)
+        grid.update()
+        patch = out.getvalue()
+        # Row 1, column 1 of the second card
+        top, left = grid.origin(1)
+        assert goto(top + 2, left + grid.cell_width) + " 22✔  " in patch
+        assert "Card" not in patch
+        assert CLEAR_SCREEN not in patch
+    
+    def test_no_change_writes_nothing(self):
+        """Test that a ball missing every card produces no output."""
+        grid, _, out = grid_of(2)
+        grid.draw()
+        before = out.getvalue()
+        assert grid.update() is False
+        assert out.getvalue() == before
+    
+    def test_compact_marks_in_reverse_video(self):
+        """Test that compact mode highlights marked cells."""
+        grid, cards, _ = grid_of(1, compact=True)
+        grid.draw()
+        cards[0].mark_number(1)
+        assert REVERSE + " 1" in grid.patch()
+    
+    def test_unmarked_cells_are_restored(self):
+        """Test that a cleared mark is redrawn unmarked."""
+        grid, cards, _ = grid_of(1)
+        cards[0].mark_number(3)
+        grid.draw()
+        cards[0].mask = 0
+        assert "  3   " in grid.patch()
+    
+    def test_render_matches_card_text(self):
+        """Test that a full draw shows the same cells as str(card)."""
+        grid, cards, _ = grid_of(1)
+        cards[0].mark_number(7)
+        screen = grid.render()
+        for line in str(cards[0]).splitlines():
+            assert line in screen
+    
+    def test_status_lines_under_grid(self):
+        """Test that status text is written below the cards."""
+        grid, _, out = grid_of(2)
+        grid.status("🎲 Number drawn: 5")
+        assert goto(grid.height + 1, 1) in out.getvalue()
+        assert "Number drawn: 5" in out.getvalue()
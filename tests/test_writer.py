@@ -0,0 +1,184 @@
+"""
+Tests for the write-behind ResultWriter.
+Uses a mock client and a real RedisHealth breaker.
+"""
+import json
+
+import pytest
+import redis
+from unittest.mock import MagicMock
+from src.game.score import RedisHealth
+from src.game.writer import ResultWriter
+
+
+def write_batch(pipe, results):
+    """Record each result as one pipeline command."""
+    for result in results:
+        pipe.lpush('game_history', json.dumps(result))
+
+
+@pytest.fixture
+def spill_path(tmp_path):
+    return str(tmp_path / 'spill.jsonl')
+
+
+@pytest.fixture
+def writer_client():
+    return MagicMock()
+
+
+def make_writer(client, spill_path, **kwargs):
+    return ResultWriter(lambda: client, RedisHealth(), write_batch, spill_path, **kwargs)
+
+
+class TestSubmit:
+    """Test queueing results."""
+    
+    def test_submit_only_queues(self, writer_client, spill_path):
+        """Test that submit doesn't talk to Redis."""
+        writer = make_writer(writer_client, spill_path, flush_interval=60)
+        writer.submit({'score': 80})
+        assert writer.pending() == 1
+        writer_client.pipeline.assert_not_called()
+
+
+class TestFlush:
+    """Test batched writes."""
+    
+    def test_flush_writes_one_pipeline(self, writer_client, spill_path):
+        """Test that queued results go out in a single pipeline."""
+        writer = make_writer(writer_client, spill_path, flush_interval=60)
+        for score in [10, 20, 30]:
+            writer.submit({'score': score})
+        writer.flush()
+        pipe = writer_client.pipeline.return_value
+        assert pipe.lpush.call_count == 3
+        pipe.execute.assert_called_once()
+        assert writer.pending() == 0
+        assert writer.written == 3
+    
+    def test_flush_splits_batches(self, writer_client, spill_path):
+        """Test that big backlogs are sent batch_size at a time."""
+        writer = make_writer(writer_client, spill_path, batch_size=2, flush_interval=60)
+        for score in range(5):
+            writer._pending.append({'score': score})
+        writer.flush()
+        assert writer_client.pipeline.return_value.execute.call_count == 3
+    
+    def test_flush_nothing_queued(self, writer_client, spill_path):
+        """Test that an idle flush doesn't connect."""
+        writer = make_writer(writer_client, spill_path)
+        writer.flush()
+        writer_client.pipeline.assert_not_called()
+    
+    def test_background_flush_on_full_batch(self, writer_client, spill_path):
+        """Test that a full batch wakes the background thread."""
+        writer = make_writer(writer_client, spill_path, batch_size=2, flush_interval=60)
+        writer.submit({'score': 1})
+        writer.submit({'score': 2})
+        for _ in range(100):
+            if writer.written == 2:
+                break
+            writer._thread.join(0.01)
+        assert writer.written == 2
+
+
+class TestSpill:
+    """Test spilling to disk and replaying."""
+    
+    def test_spill_when_redis_down(self, writer_client, spill_path):
+        """Test that a failed write lands in the spill file."""
+        writer_client.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+        writer = make_writer(writer_client, spill_path, flush_interval=60)
+        writer.submit({'score': 80})
+        writer.flush()
+        with open(spill_path) as f:
+            assert [json.loads(line) for line in f] == [{'score': 80}]
+        assert writer.spilled == 1
+        assert writer.health.failures == 1
+    
+    def test_spill_while_breaker_open(self, writer_client, spill_path):
+        """Test that an open breaker spills without trying Redis."""
+        writer = make_writer(writer_client, spill_path, flush_interval=60)
+        writer.health.record_failure()
+        writer.submit({'score': 80})
+        writer.flush()
+        writer_client.pipeline.assert_not_called()
+        assert writer.spilled == 1
+    
+    def test_replay_on_reconnect(self, writer_client, spill_path):
+        """Test that spilled results are written before new ones."""
+        with open(spill_path, 'w') as f:
+            f.write(json.dumps({'score': 1}) + '\n')
+            f.write(json.dumps({'score': 2}) + '\n')
+        writer = make_writer(writer_client, spill_path, flush_interval=60)
+        writer.submit({'score': 3})
+        writer.flush()
+        pipe = writer_client.pipeline.return_value
+        scores = [json.loads(c.args[1])['score'] for c in pipe.lpush.call_args_list]
+        assert scores == [1, 2, 3]
+        assert not writer._has_spill()
+    
+    def test_replay_failure_keeps_file(self, writer_client, spill_path):
+        """Test that a failed replay keeps old and new results on disk."""
+        with open(spill_path, 'w') as f:
+            f.write(json.dumps({'score': 1}) + '\n')
+        writer_client.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+        writer = make_writer(writer_client, spill_path, flush_interval=60)
+        writer.submit({'score': 2})
+        writer.flush()
+        with open(spill_path + '.replay') as f:
+            assert [json.loads(line)['score'] for line in f] == [1]
+        with open(spill_path) as f:
+            assert [json.loads(line)['score'] for line in f] == [2]
+    
+    def test_truncated_spill_line_moved_aside(self, writer_client, spill_path):
+        """Test that a line cut short by a crash doesn't stop the replay."""
+        with open(spill_path, 'w') as f:
+            f.write(json.dumps({'score': 1}) + '\n')
+            f.write('{"score": 2')
+        writer = make_writer(writer_client, spill_path, flush_interval=60)
+        writer.submit({'score': 3})
+        writer.flush()
+        pipe = writer_client.pipeline.return_value
+        scores = [json.loads(c.args[1])['score'] for c in pipe.lpush.call_args_list]
+        assert scores == [1, 3]
+        assert writer.skipped == 1
+        with open(spill_path + '.bad') as f:
+            assert f.read() == '{"score": 2\n'
+    
+    def test_unexpected_error_spills_batch(self, writer_client, spill_path, monkeypatch):
+        """Test that an error outside the pipeline still keeps the batch."""
+        writer = make_writer(writer_client, spill_path, flush_interval=60)
+        monkeypatch.setattr(writer, '_replay_spill', MagicMock(side_effect=OSError("disk")))
+        writer.submit({'score': 4})
+        writer.flush()
+        with open(spill_path) as f:
+            assert [json.loads(line) for line in f] == [{'score': 4}]
+    
+    def test_unwritable_spill_requeues(self, writer_client, tmp_path):
+        """Test that results stay queued when the spill file can't be written."""
+        writer_client.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+        writer = make_writer(writer_client, str(tmp_path / 'missing' / 'spill.jsonl'), flush_interval=60)
+        writer.submit({'score': 5})
+        writer.flush()
+        assert writer.pending() == 1
+    
+    def test_thread_survives_failed_flush(self, writer_client, spill_path, monkeypatch):
+        """Test that the background thread keeps flushing after an error."""
+        writer = make_writer(writer_client, spill_path, batch_size=1, flush_interval=0.01)
+        flush = writer.flush
+        calls = []
+        def failing_once():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            flush()
+        monkeypatch.setattr(writer, 'flush', failing_once)
+        writer.submit({'score': 6})
+        for _ in range(200):
+            if writer.written == 1:
+                break
+            writer._thread.join(0.01)
+        assert writer.written == 1
+        assert writer._thread.is_alive()